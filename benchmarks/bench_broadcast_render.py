@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Benchmark - broadcast rendering
+
+Compares rendering a newsletter in full for every recipient with the two phase
+broadcast rendering ('render_template_many') used by 'send_email_bulk'.
+
+Usage:
+    python benchmarks/bench_broadcast_render.py --recipients 300000 --chunk 500
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "django_dans_notifications.test.settings"
+)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from django_dans_notifications import signals  # noqa: E402, F401
+from django_dans_notifications.rendering import (  # noqa: E402
+    render_template,
+    render_template_many,
+)
+
+NEWSLETTER = """{% extends "django-dans-emails/base.html" %}
+{% block content %}
+<tr><td>Hi {{ name }},</td></tr>
+<tr><td>Here's what happened at {{ team_name }} this month.</td></tr>
+{% for item in items %}<tr><td><h2>{{ item.title }}</h2><p>{{ item.body }}</p></td></tr>{% endfor %}
+<tr><td><a href="{{ unsubscribe_url }}">Unsubscribe</a></td></tr>
+{% endblock %}
+"""
+
+
+def main(args: Any) -> None:
+    items = [
+        {"title": f"Story {i}", "body": "Lorem ipsum dolor sit amet. " * 20}
+        for i in range(10)
+    ]
+    contexts: List[Dict[str, Any]] = [
+        {
+            "team_name": "Dan's Team",
+            "items": items,
+            "name": f"User {i}",
+            "unsubscribe_url": f"https://example.com/unsubscribe/{i}",
+        }
+        for i in range(args.recipients)
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, "newsletter.html"), "w") as file:
+            file.write(NEWSLETTER)
+        templates = [{**settings.TEMPLATES[0], "DIRS": [directory]}]
+        with override_settings(TEMPLATES=templates):
+            # full renders - only a sample, it is slow
+            sample = contexts[: args.sample]
+            start = time.perf_counter()
+            for context in sample:
+                render_template("newsletter.html", context)
+            full = len(sample) / (time.perf_counter() - start)
+            print(f"full render  {full:10.0f} emails/s ({len(sample)} emails)")
+
+            start = time.perf_counter()
+            for offset in range(0, len(contexts), args.chunk):
+                render_template_many(
+                    "newsletter.html", contexts[offset : offset + args.chunk]
+                )
+            elapsed = time.perf_counter() - start
+            broadcast = len(contexts) / elapsed
+            print(
+                f"two phase    {broadcast:10.0f} emails/s ({len(contexts)} emails "
+                f"in {elapsed:.2f}s, {broadcast / full:.0f}x)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=300000)
+    parser.add_argument("--chunk", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=5000)
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Benchmark - bulk notifications
+
+Compares creating NotificationBasic objects one at a time with 'bulk_notify'.
+
+Usage:
+    python benchmarks/bench_bulk_notify.py --recipients 100000
+
+NOTE: uses the test settings (in-memory SQLite) - absolute numbers will differ
+on Postgres, the relative difference is what matters.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "django_dans_notifications.test.settings"
+)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection, transaction  # noqa: E402
+
+from django_dans_notifications.models.notifications import (  # noqa: E402
+    NotificationBasic,
+)
+
+
+def main(args: Any) -> None:
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        recipients = [f"user{i}@example.com" for i in range(args.recipients)]
+
+        # one at a time - only a sample, it is slow
+        sample = recipients[: args.sample]
+        start = time.perf_counter()
+        with transaction.atomic():
+            for recipient in sample:
+                NotificationBasic.objects.create(
+                    message="hello", sender="system@example.com", recipients=recipient
+                )
+        elapsed = time.perf_counter() - start
+        print(
+            f"create       {len(sample) / elapsed:10.0f} notifications/s "
+            f"({len(sample)} in {elapsed:.2f}s)"
+        )
+
+        start = time.perf_counter()
+        NotificationBasic.objects.bulk_notify(
+            "hello", recipients, sender="system@example.com"
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"bulk_notify  {len(recipients) / elapsed:10.0f} notifications/s "
+            f"({len(recipients)} in {elapsed:.2f}s)"
+        )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=100000)
+    parser.add_argument("--sample", type=int, default=5000)
+    main(parser.parse_args())
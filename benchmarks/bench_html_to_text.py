@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Benchmark - plain text alternative
+
+Compares 'strip_tags' with 'html_to_text' on the shipped 'django-dans-emails/*.html'
+templates, and on a large marketing style email (the templates repeated).
+
+Usage:
+    python benchmarks/bench_html_to_text.py --conversions 2000
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "django_dans_notifications.test.settings"
+)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils.html import strip_tags  # noqa: E402
+
+from django_dans_notifications.rendering import (  # noqa: E402
+    html_to_text,
+    render_template,
+)
+
+TEMPLATES = [
+    "base.html",
+    "contact.html",
+    "default.html",
+    "empty.html",
+    "password_reset_request.html",
+    "template.html",
+]
+CONTEXT = {
+    "team_name": "Dan's Team",
+    "name": "Someone",
+    "email": "someone@example.com",
+    "phone": "555-0100",
+    "message": "First line\nSecond line",
+    "url_password_reset": "https://example.com/reset/abc123",
+}
+
+
+def measure(convert: Callable[[str], str], html: str, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        convert(html)
+    return n / (time.perf_counter() - start)
+
+
+def compare(name: str, html: str, n: int) -> None:
+    baseline = measure(strip_tags, html, n)
+    converted = measure(html_to_text, html, n)
+    print(
+        f"{name:32} {len(html):8} {baseline:10.0f} /s {converted:10.0f} /s "
+        f"({converted / baseline:.1f}x)"
+    )
+
+
+def main(args: Any) -> None:
+    print(f"{'template':32} {'bytes':>8} {'strip_tags':>13} {'html_to_text':>13}")
+    rendered = [
+        render_template(f"django-dans-emails/{name}", CONTEXT) for name in TEMPLATES
+    ]
+    for name, html in zip(TEMPLATES, rendered):
+        compare(name, html, args.conversions)
+    # marketing emails - long, many blocks
+    compare("(all templates x 20)", "".join(rendered) * 20, args.conversions // 100)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--conversions", type=int, default=2000)
+    main(parser.parse_args())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+"""
+Benchmark - parallel rendering
+
+Renders email batches ('render_email_chunks', as 'send_email_bulk' does) in-process
+and with 'EMAIL_RENDER_PROCESSES' worker processes. Every recipient gets a
+different list of items, so each email is rendered in full - the CPU bound case.
+
+Usage:
+    python benchmarks/bench_parallel_render.py --recipients 20000 --processes 1 2 4 8
+
+Scaling is bounded by the cores of the machine ('os.cpu_count()').
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "django_dans_notifications.test.settings"
+)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import override_settings  # noqa: E402
+
+from django_dans_notifications import signals  # noqa: E402, F401
+from django_dans_notifications.rendering import render_email_chunks  # noqa: E402
+
+# workers only see the settings module - use a shipped template
+TEMPLATE = "django-dans-emails/contact.html"
+
+
+def chunks(recipients: int, chunk_size: int) -> List[List[Tuple[str, Dict[str, Any]]]]:
+    messages = [
+        (
+            f"user{i}@example.com",
+            {
+                "team_name": "Dan's Team",
+                "name": f"User {i}",
+                "email": f"user{i}@example.com",
+                "phone": f"555-{i:04}",
+                "message": "\n".join(f"Line {j} for {i}" for j in range(i % 20)),
+            },
+        )
+        for i in range(recipients)
+    ]
+    return [
+        messages[offset : offset + chunk_size]
+        for offset in range(0, recipients, chunk_size)
+    ]
+
+
+def measure(batches: List[List[Tuple[str, Dict[str, Any]]]]) -> float:
+    start = time.perf_counter()
+    for _ in render_email_chunks(TEMPLATE, iter(batches)):
+        pass
+    return sum(len(batch) for batch in batches) / (time.perf_counter() - start)
+
+
+def main(args: Any) -> None:
+    batches = chunks(args.recipients, args.chunk)
+    print(f"cores: {os.cpu_count()}")
+    baseline = measure(batches)
+    print(f"in-process     {baseline:10.0f} emails/s")
+    for processes in args.processes:
+        with override_settings(EMAIL_RENDER_PROCESSES=processes):
+            # start the workers (and warm their templates) outside the timing
+            measure(batches[: processes * 2])
+            rendered = measure(batches)
+        print(
+            f"{processes:2} processes  {rendered:10.0f} emails/s "
+            f"({rendered / baseline:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--recipients", type=int, default=20000)
+    parser.add_argument("--chunk", type=int, default=500)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    main(parser.parse_args())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmark - recipient lookups
+
+Compares the old substring ownership filter ('recipients__contains') with the
+exact-match recipient index ('query_recipients') on a NotificationBasic table.
+
+Usage:
+    python benchmarks/bench_recipient_lookup.py --rows 5000000 --users 50000
+
+NOTE: uses the test settings (in-memory SQLite) - absolute numbers will differ
+on Postgres, the relative difference is what matters.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "django_dans_notifications.test.settings"
+)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.db.models import Q  # noqa: E402
+
+from django_dans_notifications.models.notifications import (  # noqa: E402
+    NotificationBasic,
+)
+
+BATCH_SIZE = 10000
+
+
+def populate(rows: int, users: int) -> None:
+    batch: List[NotificationBasic] = []
+    for i in range(rows):
+        user = i % users
+        batch.append(
+            NotificationBasic(
+                recipients=f"user{user}@example.com,{user}",
+                sender="system@example.com",
+                message=f"message {i}",
+            )
+        )
+        if len(batch) >= BATCH_SIZE:
+            NotificationBasic.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+            batch = []
+    if batch:
+        NotificationBasic.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+
+def query_substring(user: int) -> Q:
+    return Q(recipients__contains=f"user{user}@example.com") | Q(
+        recipients__contains=str(user)
+    )
+
+
+def query_index(user: int) -> Q:
+    return NotificationBasic.query_recipients(f"user{user}@example.com", user)
+
+
+def run(name: str, query: Callable[[int], Q], sample: List[int]) -> None:
+    hits = 0
+    start = time.perf_counter()
+    for user in sample:
+        hits += len(
+            list(NotificationBasic.objects.filter(query(user)).values_list("id"))
+        )
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<12} {elapsed / len(sample) * 1000:10.2f} ms/query "
+        f"{hits / len(sample):10.1f} rows/query"
+    )
+
+
+def main(args: Any) -> None:
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        start = time.perf_counter()
+        populate(args.rows, args.users)
+        print(f"populated {args.rows} rows in {time.perf_counter() - start:.1f}s")
+
+        sample = random.Random(0).sample(range(args.users), args.queries)
+        run("substring", query_substring, sample)
+        run("index", query_index, sample)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=50)
+    main(parser.parse_args())
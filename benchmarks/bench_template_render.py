@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Benchmark - email template rendering
+
+Compares 'render_to_string' with the compiled template cache ('render_template')
+for the shipped 'django-dans-emails/*.html' templates.
+
+Usage:
+    python benchmarks/bench_template_render.py --renders 20000
+    python benchmarks/bench_template_render.py --no-cached-loader
+
+'--no-cached-loader' configures the template loaders explicitly without Django's
+cached loader - like many projects do - which is where 'render_to_string' is slowest.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault(
+    "DJANGO_SETTINGS_MODULE", "django_dans_notifications.test.settings"
+)
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.template.loader import render_to_string  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from django_dans_notifications import signals  # noqa: E402, F401
+from django_dans_notifications.rendering import render_template  # noqa: E402
+
+TEMPLATES = [
+    "base.html",
+    "contact.html",
+    "default.html",
+    "empty.html",
+    "password_reset_request.html",
+    "template.html",
+]
+CONTEXT: Dict[str, Any] = {
+    "team_name": "Dan's Team",
+    "subject": "Hello",
+    "name": "Someone",
+    "email": "someone@example.com",
+    "phone": "555-0100",
+    "message": "First line\nSecond line",
+    "url_password_reset": "https://example.com/reset/abc123",
+}
+
+
+def measure(render: Callable[[str, Dict[str, Any]], str], path: str, n: int) -> float:
+    render(path, CONTEXT)  # warm up
+    start = time.perf_counter()
+    for _ in range(n):
+        render(path, CONTEXT)
+    return n / (time.perf_counter() - start)
+
+
+def run(renders: int) -> None:
+    print(f"{'template':32} {'render_to_string':>18} {'render_template':>18}")
+    for name in TEMPLATES:
+        path = f"django-dans-emails/{name}"
+        baseline = measure(render_to_string, path, renders)
+        compiled = measure(render_template, path, renders)
+        print(
+            f"{name:32} {baseline:14.0f} r/s {compiled:14.0f} r/s "
+            f"({compiled / baseline:.1f}x)"
+        )
+
+
+def main(args: Any) -> None:
+    if not args.no_cached_loader:
+        run(args.renders)
+        return
+    templates = [
+        {
+            **settings.TEMPLATES[0],
+            "APP_DIRS": False,
+            "OPTIONS": {
+                **settings.TEMPLATES[0].get("OPTIONS", {}),
+                "loaders": [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ],
+            },
+        }
+    ]
+    with override_settings(TEMPLATES=templates):
+        run(args.renders)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--renders", type=int, default=20000)
+    parser.add_argument("--no-cached-loader", action="store_true")
+    main(parser.parse_args())
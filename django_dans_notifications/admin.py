@@ -6,6 +6,7 @@ from .models.notifications import (
     NotificationEmailTemplate,
     NotificationPush,
 )
+from .models.outbox import EmailOutbox
 
 """
 # ==================================================================================== #
@@ -130,6 +131,32 @@ class NotificationPushAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
     list_per_page = 100
 
 
+# ====================================================== #
+# EMAIL OUTBOX ========================================= #
+# ====================================================== #
+
+
+class EmailOutboxAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    list_display = (
+        "notification_email",
+        "status",
+        "attempts",
+        "available_at",
+        "datetime_created",
+        "datetime_sent",
+    )
+    list_display_links = ("notification_email",)
+    search_fields = ("last_error",)
+    list_filter = (
+        "status",
+        "datetime_created",
+        "datetime_sent",
+    )
+    ordering = ("-datetime_created",)
+    date_hierarchy = "datetime_created"
+    list_per_page = 100
+
+
 """
 # ==================================================================================== #
 # REGISTER =========================================================================== #
@@ -140,3 +167,4 @@ admin.site.register(NotificationBasic, NotificationBasicAdmin)
 admin.site.register(NotificationEmailTemplate, NotificationEmailTemplateAdmin)
 admin.site.register(NotificationEmail, NotificationEmailAdmin)
 admin.site.register(NotificationPush, NotificationPushAdmin)
+admin.site.register(EmailOutbox, EmailOutboxAdmin)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class DjangoDansNotificationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "django_dans_notifications"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
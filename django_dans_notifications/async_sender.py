@@ -0,0 +1,266 @@
+import asyncio
+import random
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMessage
+
+from .delivery import CHANNEL_EMAIL, EmailDeliveryBackend, get_delivery_backend
+from .email_sender import send_message
+from .logging import LOGGER
+from .rate_limit import get_rate_limiter
+from .status import (
+    AttemptCounter,
+    DeliveryStatus,
+    get_delivery_status,
+    get_status_recorder,
+)
+
+try:
+    import aiosmtplib
+except ImportError:  # optional - pip install django-dans-notifications[async]
+    aiosmtplib = None
+
+"""
+# ==================================================================================== #
+# ASYNC EMAIL SENDER ================================================================= #
+# ==================================================================================== #
+"""
+
+#
+# Sends email from the running event loop (i.e., under ASGI) - no thread per message
+# in flight. With 'aiosmtplib' installed and the SMTP email backend, messages are sent
+# over a pool of async SMTP connections; otherwise each send runs the configured
+# email backend in a worker thread ('sync_to_async').
+#
+# Set in settings.py:
+#   - 'EMAIL_ASYNC_MAX_CONCURRENCY': max sends in flight per event loop (default: 100)
+#   - 'EMAIL_ASYNC_POOL_SIZE': max open SMTP connections per event loop (default: 10)
+#
+# Retries and connection reuse follow 'EMAIL_MAX_RETRIES', 'EMAIL_RETRY_DELAY',
+# 'EMAIL_RETRY_MAX_DELAY', 'EMAIL_CONNECTION_MAX_MESSAGES' and
+# 'EMAIL_CONNECTION_IDLE_TIMEOUT' like the EmailSender.
+#
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
+
+def use_aiosmtplib() -> bool:
+    # a custom 'email' delivery backend decides how messages are sent
+    return (
+        aiosmtplib is not None
+        and settings.EMAIL_BACKEND == SMTP_BACKEND
+        and type(get_delivery_backend(CHANNEL_EMAIL)) is EmailDeliveryBackend
+    )
+
+
+class AsyncConnectionPool:
+    """
+    Up to 'size' async SMTP connections shared by the sends of one event loop -
+    idle connections are reused, most recently used first.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._slots = asyncio.Semaphore(size)
+        # (client, messages sent, last used)
+        self._idle: List[Tuple[Any, int, float]] = []
+        # messages sent by the connections in use, by id
+        self._messages: Dict[int, int] = {}
+
+    async def acquire(self) -> Any:
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                client, messages, last_used = self._idle.pop()
+                idle_timeout = getattr(settings, "EMAIL_CONNECTION_IDLE_TIMEOUT", 30.0)
+                if client.is_connected and time.monotonic() - last_used <= idle_timeout:
+                    self._messages[id(client)] = messages
+                    return client
+                await self._close(client)
+            client = self._connect()
+            await client.connect()
+            self._messages[id(client)] = 0
+            return client
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, client: Any) -> None:
+        """
+        Done sending one message over 'client'.
+        """
+        messages = self._messages.pop(id(client), 0) + 1
+        if messages >= getattr(settings, "EMAIL_CONNECTION_MAX_MESSAGES", 100):
+            await self._close(client)
+        else:
+            self._idle.append((client, messages, time.monotonic()))
+        self._slots.release()
+
+    async def discard(self, client: Any) -> None:
+        """
+        Close 'client', i.e., after a failure.
+        """
+        self._messages.pop(id(client), None)
+        await self._close(client)
+        self._slots.release()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for client, _, _ in idle:
+            await self._close(client)
+
+    @staticmethod
+    def _connect() -> Any:
+        return aiosmtplib.SMTP(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            username=settings.EMAIL_HOST_USER or None,
+            password=settings.EMAIL_HOST_PASSWORD or None,
+            use_tls=settings.EMAIL_USE_SSL,
+            start_tls=settings.EMAIL_USE_TLS,
+            timeout=settings.EMAIL_TIMEOUT,
+        )
+
+    @staticmethod
+    async def _close(client: Any) -> None:
+        try:
+            await client.quit()
+        except Exception:
+            client.close()
+
+
+class AsyncEmailSender:
+    """
+    Sends email from one event loop - see 'get_async_sender'.
+    """
+
+    def __init__(self) -> None:
+        self.max_concurrency = getattr(settings, "EMAIL_ASYNC_MAX_CONCURRENCY", 100)
+        self.pool_size = getattr(settings, "EMAIL_ASYNC_POOL_SIZE", 10)
+        self.max_retries = getattr(settings, "EMAIL_MAX_RETRIES", 3)
+        self.retry_delay = getattr(settings, "EMAIL_RETRY_DELAY", 1.0)
+        self.retry_max_delay = getattr(settings, "EMAIL_RETRY_MAX_DELAY", 60.0)
+
+        # Validate settings
+        if self.max_concurrency < 1:
+            raise ValueError("EMAIL_ASYNC_MAX_CONCURRENCY must be >= 1")
+        if self.pool_size < 1:
+            raise ValueError("EMAIL_ASYNC_POOL_SIZE must be >= 1")
+        if self.max_retries < 1:
+            raise ValueError("EMAIL_MAX_RETRIES must be >= 1")
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.pool: Optional[AsyncConnectionPool] = (
+            AsyncConnectionPool(self.pool_size) if use_aiosmtplib() else None
+        )
+
+    async def send_message(self, message: EmailMessage) -> int:
+        """
+        Send 'message', retrying failures with backoff.
+
+        Returns:
+            - Number of messages sent (0 or 1)
+        """
+        return await self._send_with_retry(self._send, message)
+
+    async def send_tracked(
+        self, notification_email_id: Any, message: EmailMessage
+    ) -> DeliveryStatus:
+        """
+        Send 'message' and record the outcome for 'notification_email_id' - written
+        by the background DeliveryStatusRecorder, so the event loop never waits on
+        the database.
+        """
+        attempts = AttemptCounter(self._send)
+        try:
+            result = await self._send_with_retry(attempts, message)
+        except Exception as e:
+            status = get_delivery_status(
+                notification_email_id, attempts.attempts, error=e
+            )
+        else:
+            status = get_delivery_status(
+                notification_email_id, attempts.attempts, result=result
+            )
+        get_status_recorder().record(status)
+        return status
+
+    async def close(self) -> None:
+        """
+        Close pooled SMTP connections.
+        """
+        if self.pool is not None:
+            await self.pool.close()
+
+    async def _send_with_retry(
+        self, func: Callable[..., Any], message: EmailMessage
+    ) -> int:
+        for attempt in range(self.max_retries):
+            try:
+                async with self._semaphore:
+                    sent: int = await func(message)
+                return sent
+            except Exception as e:
+                LOGGER.warning(
+                    f"Email send attempt {attempt + 1}/{self.max_retries} failed: {e}"
+                )
+                if attempt + 1 >= self.max_retries:
+                    LOGGER.error(
+                        f"Email send failed after {self.max_retries} attempts: {e}"
+                    )
+                    raise
+                # equal jitter like the EmailSender - backs off without holding a slot
+                delay = min(self.retry_delay * (2**attempt), self.retry_max_delay)
+                await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+        raise Exception("Email send failed with unknown error")
+
+    async def _send(self, message: EmailMessage) -> int:
+        if self.pool is None:
+            # no async client - run the email backend in a worker thread
+            return await sync_to_async(send_message, thread_sensitive=False)(message)
+
+        # paced like 'send_messages_pooled' - without blocking the event loop
+        wait = get_rate_limiter().reserve(message.recipients())
+        if wait:
+            await asyncio.sleep(wait)
+        client = await self.pool.acquire()
+        try:
+            await client.send_message(
+                message.message(),
+                sender=message.from_email,
+                recipients=message.recipients(),
+            )
+        except Exception:
+            # connection may be broken - a retry gets a fresh one
+            await self.pool.discard(client)
+            raise
+        await self.pool.release(client)
+        return 1
+
+
+# one sender per event loop - asyncio primitives and connections are tied to their loop
+_senders: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncEmailSender]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_sender() -> AsyncEmailSender:
+    """
+    The AsyncEmailSender of the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    sender = _senders.get(loop)
+    if sender is None:
+        sender = _senders[loop] = AsyncEmailSender()
+    return sender
+
+
+async def asend_message(message: EmailMessage) -> int:
+    """
+    Send 'message' from the running event loop - the async counterpart of
+    'send_email_async(send_message, message)'.
+    """
+    return await get_async_sender().send_message(message)
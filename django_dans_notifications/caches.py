@@ -0,0 +1,157 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+"""
+# ==================================================================================== #
+# CACHES ============================================================================= #
+# ==================================================================================== #
+"""
+
+
+#
+# LRU CACHE ================== #
+#
+class LRUCache:
+    """
+    Small thread-safe, size bounded, least recently used cache - entries expire
+    after 'timeout' seconds when set.
+    """
+
+    def __init__(self, max_size: int, timeout: Optional[float] = None) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        # key -> (value, expires at or None)
+        self._data: "OrderedDict[Any, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[1] is not None and entry[1] <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Any, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        expires = None if self.timeout is None else time.monotonic() + self.timeout
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "timeout": self.timeout,
+        }
+
+
+"""
+# ==================================================================================== #
+# TEMPLATE RESOLUTION CACHE ========================================================== #
+# ==================================================================================== #
+"""
+
+#
+# Caches the result of NotificationEmailTemplateManager.find_email_template
+# (template name/nickname -> NotificationEmailTemplate) so repeated sends of
+# the same template don't hit the database.
+#
+# - 'EMAIL_TEMPLATE_CACHE_SIZE': max entries kept in-process (default: 128, 0 disables)
+# - 'EMAIL_TEMPLATE_CACHE': optional Django cache alias to share entries (and
+#   invalidations) between processes (default: None, in-process only)
+#
+_TEMPLATE_CACHE_PREFIX = "django_dans_notifications:email_template"
+_TEMPLATE_CACHE_GENERATION_KEY = f"{_TEMPLATE_CACHE_PREFIX}:generation"
+
+_template_cache = LRUCache(getattr(settings, "EMAIL_TEMPLATE_CACHE_SIZE", 128))
+
+
+def _get_shared_template_cache() -> Optional[BaseCache]:
+    alias = getattr(settings, "EMAIL_TEMPLATE_CACHE", None)
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def _get_template_cache_generation(shared: Optional[BaseCache]) -> int:
+    if shared is None:
+        return 0
+    generation = shared.get(_TEMPLATE_CACHE_GENERATION_KEY)
+    if generation is None:
+        shared.add(_TEMPLATE_CACHE_GENERATION_KEY, 0, timeout=None)
+        return 0
+    return int(generation)
+
+
+def get_cached_template(name: str) -> Optional[Any]:
+    """
+    Get a cached NotificationEmailTemplate for the template 'name' - returns a
+    copy so callers can't mutate the cached object.
+    """
+    shared = _get_shared_template_cache()
+    generation = _get_template_cache_generation(shared)
+    hit = _template_cache.get(name)
+    if hit is not None and hit[0] == generation:
+        return copy.copy(hit[1])
+    if shared is not None:
+        template = shared.get(f"{_TEMPLATE_CACHE_PREFIX}:{generation}:{name}")
+        if template is not None:
+            _template_cache.set(name, (generation, template))
+            return copy.copy(template)
+    return None
+
+
+def cache_template(name: str, template: Any) -> None:
+    """
+    Cache the NotificationEmailTemplate found for the template 'name'.
+    """
+    _template_cache.max_size = getattr(settings, "EMAIL_TEMPLATE_CACHE_SIZE", 128)
+    shared = _get_shared_template_cache()
+    generation = _get_template_cache_generation(shared)
+    _template_cache.set(name, (generation, template))
+    if shared is not None:
+        shared.set(
+            f"{_TEMPLATE_CACHE_PREFIX}:{generation}:{name}", template, timeout=None
+        )
+
+
+def invalidate_template_cache() -> None:
+    """
+    Drop all cached templates - bumps the shared generation so other
+    processes drop theirs too.
+    """
+    _template_cache.clear()
+    shared = _get_shared_template_cache()
+    if shared is not None:
+        try:
+            shared.incr(_TEMPLATE_CACHE_GENERATION_KEY)
+        except ValueError:
+            shared.set(_TEMPLATE_CACHE_GENERATION_KEY, 1, timeout=None)
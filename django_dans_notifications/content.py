@@ -0,0 +1,80 @@
+import zlib
+from typing import Any, Optional
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+"""
+# ==================================================================================== #
+# EMAIL CONTENT ====================================================================== #
+# ==================================================================================== #
+"""
+
+#
+# Rendered email content (HTML and plain text) can be kept so reading emails back
+# (i.e., the API / serializers) doesn't have to render the template again.
+#
+# Set via 'EMAIL_CONTENT_MODE' in settings.py:
+#   - 'stored': persist content on the NotificationEmail row (default)
+#   - 'cache': keep content in Django's cache ('EMAIL_CONTENT_CACHE' alias)
+#   - 'lazy': don't keep content, re-render every time
+#
+# Also set in settings.py:
+#   - 'EMAIL_CONTENT_COMPRESS': zlib compress kept content (default: False)
+#   - 'EMAIL_CONTENT_CACHE': cache alias for 'cache' mode (default: "default")
+#   - 'EMAIL_CONTENT_CACHE_TIMEOUT': seconds content stays cached, it's rendered again
+#     once expired - None keeps it forever (default: 1 day)
+#
+CONTENT_MODE_STORED = "stored"
+CONTENT_MODE_CACHE = "cache"
+CONTENT_MODE_LAZY = "lazy"
+CONTENT_MODES = (CONTENT_MODE_STORED, CONTENT_MODE_CACHE, CONTENT_MODE_LAZY)
+
+DEFAULT_CONTENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# first byte of encoded content - tells us how to decode it
+_PREFIX_RAW = b"r"
+_PREFIX_ZLIB = b"z"
+
+
+def get_content_mode() -> str:
+    mode = getattr(settings, "EMAIL_CONTENT_MODE", CONTENT_MODE_STORED)
+    if mode not in CONTENT_MODES:
+        raise ValueError(f"EMAIL_CONTENT_MODE must be one of {CONTENT_MODES}")
+    return str(mode)
+
+
+def get_content_cache() -> BaseCache:
+    return caches[getattr(settings, "EMAIL_CONTENT_CACHE", "default")]
+
+
+def get_content_cache_timeout() -> Optional[int]:
+    timeout: Optional[int] = getattr(
+        settings, "EMAIL_CONTENT_CACHE_TIMEOUT", DEFAULT_CONTENT_CACHE_TIMEOUT
+    )
+    return timeout
+
+
+def get_content_cache_key(pk: Any, kind: str) -> str:
+    return f"django_dans_notifications:email_content:{kind}:{pk}"
+
+
+def encode_content(content: str) -> bytes:
+    """
+    Encode content for storage - compressed if 'EMAIL_CONTENT_COMPRESS' is set.
+    """
+    data = content.encode("utf-8")
+    if getattr(settings, "EMAIL_CONTENT_COMPRESS", False):
+        return _PREFIX_ZLIB + zlib.compress(data)
+    return _PREFIX_RAW + data
+
+
+def decode_content(data: Any) -> str:
+    """
+    Decode content stored by 'encode_content' - accepts bytes or memoryview.
+    """
+    raw = bytes(data)
+    prefix, body = raw[:1], raw[1:]
+    if prefix == _PREFIX_ZLIB:
+        body = zlib.decompress(body)
+    return body.decode("utf-8")
@@ -0,0 +1,461 @@
+import atexit
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .email_sender import CircuitBreaker, RetryScheduler, send_messages_pooled
+from .logging import LOGGER
+
+"""
+# ==================================================================================== #
+# DELIVERY BACKENDS ================================================================== #
+# ==================================================================================== #
+"""
+
+#
+# Every channel ('email', 'push', 'basic') is delivered through a backend - email
+# messages for 'email', new NotificationPush / NotificationBasic objects for the others.
+# Backends get items in batches of 'BATCH_SIZE', with at most 'MAX_CONCURRENCY' batches
+# in flight at once (0 is unlimited).
+#
+# Set in settings.py:
+#   NOTIFICATIONS_DELIVERY_BACKENDS = {
+#       "push": {
+#           "BACKEND": "myapp.delivery.PushGatewayBackend",
+#           "OPTIONS": {"BATCH_SIZE": 500, "MAX_CONCURRENCY": 4},
+#       },
+#   }
+#
+# Defaults: 'email' sends over the pooled email backend connections, 'push' and
+# 'basic' use the NullDeliveryBackend - they're stored, not delivered anywhere.
+#
+CHANNEL_EMAIL = "email"
+CHANNEL_PUSH = "push"
+CHANNEL_BASIC = "basic"
+CHANNELS = (CHANNEL_EMAIL, CHANNEL_PUSH, CHANNEL_BASIC)
+
+DEFAULT_DELIVERY_BACKENDS: Dict[str, str] = {
+    CHANNEL_EMAIL: "django_dans_notifications.delivery.EmailDeliveryBackend",
+    CHANNEL_PUSH: "django_dans_notifications.delivery.NullDeliveryBackend",
+    CHANNEL_BASIC: "django_dans_notifications.delivery.NullDeliveryBackend",
+}
+
+# per item - delivered, not delivered, or the error raised
+Outcome = Union[bool, Exception]
+
+
+class BaseDeliveryBackend:
+    """
+    Delivers the items of one channel - subclasses implement 'send_batch'.
+    """
+
+    def __init__(self, channel: str, **options: Any) -> None:
+        self.channel = channel
+        self.options = options
+        self.batch_size = int(options.get("BATCH_SIZE", 100))
+        self.max_concurrency = int(options.get("MAX_CONCURRENCY", 0))
+        if self.batch_size < 1:
+            raise ValueError(f"{channel} delivery BATCH_SIZE must be >= 1")
+        if self.max_concurrency < 0:
+            raise ValueError(f"{channel} delivery MAX_CONCURRENCY must be >= 0")
+        self._slots: Optional[threading.BoundedSemaphore] = (
+            threading.BoundedSemaphore(self.max_concurrency)
+            if self.max_concurrency
+            else None
+        )
+
+    def deliver(self, items: Sequence[Any]) -> List[Outcome]:
+        """
+        Deliver 'items' in batches of 'BATCH_SIZE', waiting for a free slot when
+        'MAX_CONCURRENCY' batches are already in flight.
+        """
+        outcomes: List[Outcome] = []
+        for start in range(0, len(items), self.batch_size):
+            batch = items[start : start + self.batch_size]
+            if self._slots is None:
+                outcomes.extend(self.send_batch(batch))
+                continue
+            with self._slots:
+                outcomes.extend(self.send_batch(batch))
+        return outcomes
+
+    def send_batch(self, items: Sequence[Any]) -> List[Outcome]:
+        """
+        Deliver one batch - an outcome per item, in order. Raise if the whole
+        batch failed (i.e., the gateway can't be reached) so it can be retried.
+        """
+        raise NotImplementedError
+
+
+#
+# BACKENDS ================== #
+#
+class EmailDeliveryBackend(BaseDeliveryBackend):
+    """
+    Sends email messages over the thread's pooled email backend connection.
+    """
+
+    def send_batch(self, items: Sequence[Any]) -> List[Outcome]:
+        return [
+            outcome if isinstance(outcome, Exception) else bool(outcome)
+            for outcome in send_messages_pooled(items)
+        ]
+
+
+class NullDeliveryBackend(BaseDeliveryBackend):
+    """
+    Delivers nothing - every item counts as delivered.
+    """
+
+    def send_batch(self, items: Sequence[Any]) -> List[Outcome]:
+        return [True] * len(items)
+
+
+# items delivered by InMemoryDeliveryBackend, by channel - like 'django.core.mail.outbox'
+outbox: Dict[str, List[Any]] = defaultdict(list)
+
+
+class InMemoryDeliveryBackend(BaseDeliveryBackend):
+    """
+    Keeps delivered items in 'outbox[channel]' - for tests and local development.
+    """
+
+    def send_batch(self, items: Sequence[Any]) -> List[Outcome]:
+        outbox[self.channel].extend(items)
+        return [True] * len(items)
+
+
+class FileDeliveryBackend(BaseDeliveryBackend):
+    """
+    Appends delivered items as JSON lines to the 'FILE_PATH' option - for local
+    development.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, channel: str, **options: Any) -> None:
+        super().__init__(channel, **options)
+        if not options.get("FILE_PATH"):
+            raise ValueError(f"{channel} FileDeliveryBackend requires FILE_PATH")
+        self.file_path = str(options["FILE_PATH"])
+
+    def send_batch(self, items: Sequence[Any]) -> List[Outcome]:
+        lines = [
+            json.dumps({"channel": self.channel, **self.describe(item)}, default=str)
+            for item in items
+        ]
+        with self._lock, open(self.file_path, "a", encoding="utf-8") as file:
+            file.writelines(f"{line}\n" for line in lines)
+        return [True] * len(items)
+
+    @staticmethod
+    def describe(item: Any) -> Dict[str, Any]:
+        if isinstance(item, EmailMessage):
+            return {
+                "subject": item.subject,
+                "from_email": item.from_email,
+                "to": list(item.to),
+                "body": item.body,
+            }
+        return {
+            "id": item.pk,
+            "sender": item.sender,
+            "recipients": item.recipients_list,
+            "message": getattr(item, "message", None),
+        }
+
+
+#
+# LOOKUP ================== #
+#
+_backends: Dict[str, BaseDeliveryBackend] = {}
+_backends_lock = threading.Lock()
+_dispatchers: Dict[str, "ChannelDispatcher"] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def get_delivery_backend(channel: str) -> BaseDeliveryBackend:
+    """
+    The configured backend for 'channel' - created once per process.
+    """
+    backend = _backends.get(channel)
+    if backend is not None:
+        return backend
+    if channel not in CHANNELS:
+        raise ValueError(f"Delivery channel must be one of {CHANNELS}")
+    config = getattr(settings, "NOTIFICATIONS_DELIVERY_BACKENDS", {}).get(channel, {})
+    path = config.get("BACKEND", DEFAULT_DELIVERY_BACKENDS[channel])
+    with _backends_lock:
+        if channel not in _backends:
+            _backends[channel] = import_string(path)(
+                channel, **config.get("OPTIONS", {})
+            )
+        return _backends[channel]
+
+
+def reset_delivery_backends() -> None:
+    """
+    Forget created backends and stop their dispatchers - they're created again from
+    the settings on next use.
+    """
+    with _backends_lock:
+        _backends.clear()
+    with _dispatchers_lock:
+        dispatchers = list(_dispatchers.values())
+        _dispatchers.clear()
+    for dispatcher in dispatchers:
+        dispatcher.shutdown(wait=False)
+
+
+def delivery_enabled(channel: str) -> bool:
+    return not isinstance(get_delivery_backend(channel), NullDeliveryBackend)
+
+
+"""
+# ==================================================================================== #
+# DISPATCH =========================================================================== #
+# ==================================================================================== #
+"""
+
+
+#
+# New 'push' / 'basic' notifications are delivered on a dispatcher per channel - its
+# own workers, retries and circuit breaker - so a push gateway outage doesn't open the
+# email circuit or take the EmailSender's workers. Each batch is its own task: a batch
+# that raises, or items whose outcome is an exception, are retried on their own after
+# a backoff. Delivered items are recorded straight away and never sent again.
+# Synchronous (retries wait inline) with 'IN_TEST' or 'EMAIL_SYNC_MODE'.
+#
+# Set in the channel's "OPTIONS" (see above):
+#   - 'WORKERS': threads delivering batches (default: 2)
+#   - 'MAX_RETRIES': attempts per item (default: 3)
+#   - 'RETRY_DELAY' / 'RETRY_MAX_DELAY': exponential backoff in seconds (default: 1 / 60)
+#   - 'CIRCUIT_FAILURE_THRESHOLD': failed batches in a row that open the channel's
+#     circuit, 0 disables it (default: 5)
+#   - 'CIRCUIT_RESET_TIMEOUT': seconds open before a trial batch (default: 30)
+#   - 'CIRCUIT_HALF_OPEN_MAX': trial batches at once when half-open (default: 1)
+#   - 'CIRCUIT_DEFERRED_SIZE': max batches deferred while open, more are dropped
+#     (default: 1000)
+#
+class ChannelDispatcher:
+    """
+    Delivers new notifications of one channel and records which were delivered.
+    """
+
+    def __init__(self, channel: str, async_enabled: Optional[bool] = None) -> None:
+        self.channel = channel
+        options = get_delivery_backend(channel).options
+        self.workers = int(options.get("WORKERS", 2))
+        self.max_retries = int(options.get("MAX_RETRIES", 3))
+        self.retry_delay = float(options.get("RETRY_DELAY", 1.0))
+        self.retry_max_delay = float(options.get("RETRY_MAX_DELAY", 60.0))
+        circuit_threshold = int(options.get("CIRCUIT_FAILURE_THRESHOLD", 5))
+        circuit_timeout = float(options.get("CIRCUIT_RESET_TIMEOUT", 30.0))
+        circuit_trials = int(options.get("CIRCUIT_HALF_OPEN_MAX", 1))
+        circuit_deferred = int(options.get("CIRCUIT_DEFERRED_SIZE", 1000))
+        if self.workers < 1:
+            raise ValueError(f"{channel} delivery WORKERS must be >= 1")
+        if self.max_retries < 1:
+            raise ValueError(f"{channel} delivery MAX_RETRIES must be >= 1")
+        if self.retry_delay < 0 or self.retry_max_delay < 0:
+            raise ValueError(
+                f"{channel} delivery RETRY_DELAY / _MAX_DELAY must be >= 0"
+            )
+        if circuit_threshold < 0 or circuit_timeout < 0 or circuit_deferred < 0:
+            raise ValueError(f"{channel} delivery CIRCUIT_* options must be >= 0")
+        if circuit_trials < 1:
+            raise ValueError(f"{channel} delivery CIRCUIT_HALF_OPEN_MAX must be >= 1")
+
+        if async_enabled is None:
+            async_enabled = not (
+                getattr(settings, "EMAIL_SYNC_MODE", False)
+                or getattr(settings, "IN_TEST", False)
+            )
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix=f"{channel}_delivery"
+            )
+            if async_enabled
+            else None
+        )
+        self._retries = RetryScheduler(f"{channel}_retry_scheduler")
+        self._circuit = CircuitBreaker(
+            circuit_threshold, circuit_timeout, circuit_trials, circuit_deferred
+        )
+        self._shutting_down = False
+
+    def dispatch(self, notifications: Sequence[Any]) -> None:
+        """
+        Deliver 'notifications' in batches of the backend's 'BATCH_SIZE'.
+        """
+        batch_size = get_delivery_backend(self.channel).batch_size
+        for start in range(0, len(notifications), batch_size):
+            batch = list(notifications[start : start + batch_size])
+            if self._executor is None:
+                self._deliver_sync(batch)
+            else:
+                self._submit(batch, 0)
+
+    def _deliver_sync(self, batch: List[Any]) -> None:
+        for attempt in range(self.max_retries):
+            batch, _ = self._deliver(batch, attempt)
+            if not batch:
+                return
+            if attempt + 1 < self.max_retries:
+                time.sleep(self._backoff(attempt, jitter=False))
+
+    def _submit(self, batch: List[Any], attempt: int) -> None:
+        if not self._circuit.allow():
+            # gateway is down - park the batch until a trial batch gets through
+            if self._shutting_down or not self._circuit.defer(
+                lambda: self._submit(batch, attempt)
+            ):
+                LOGGER.error(
+                    f"{self.channel} delivery circuit is open, "
+                    f"{len(batch)} notifications not delivered"
+                )
+            return
+        executor = self._executor
+        try:
+            if executor is None:
+                raise RuntimeError(f"{self.channel} dispatcher is shut down")
+            executor.submit(self._attempt, batch, attempt)
+        except RuntimeError as e:
+            LOGGER.error(f"Error delivering {self.channel} notifications: {e}")
+
+    def _attempt(self, batch: List[Any], attempt: int) -> None:
+        retry, error = self._deliver(batch, attempt)
+        if error is None:
+            deferred = self._circuit.record_success()
+            if deferred:
+                LOGGER.info(
+                    f"{self.channel} delivery circuit closed, "
+                    f"delivering {len(deferred)} deferred batches"
+                )
+            for callback in deferred:
+                callback()
+        elif self._circuit.record_failure():
+            LOGGER.error(
+                f"{self.channel} delivery circuit opened, deferring batches for "
+                f"{self._circuit.reset_timeout}s: {error}"
+            )
+            self._retries.schedule(self._circuit.reset_timeout, self._probe)
+        if not retry:
+            return
+        if attempt + 1 >= self.max_retries or self._shutting_down:
+            LOGGER.error(
+                f"{len(retry)} {self.channel} notifications not delivered "
+                f"after {attempt + 1} attempts"
+            )
+            return
+        self._retries.schedule(
+            self._backoff(attempt), lambda: self._submit(retry, attempt + 1)
+        )
+
+    def _deliver(
+        self, batch: List[Any], attempt: int
+    ) -> Tuple[List[Any], Optional[Exception]]:
+        """
+        Deliver one batch through the channel's backend and record which were
+        delivered.
+
+        :returns: the notifications to retry, and the error if the whole batch failed
+        """
+        error: Optional[Exception] = None
+        try:
+            outcomes = get_delivery_backend(self.channel).deliver(batch)
+        except Exception as e:
+            error = e
+            outcomes = [e] * len(batch)
+        delivered = []
+        retry = []
+        for notification, outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                LOGGER.warning(
+                    f"Error delivering {self.channel} notification {notification.pk} "
+                    f"(attempt {attempt + 1}/{self.max_retries}): "
+                    f"{type(outcome).__name__}: {outcome}"
+                )
+                retry.append(notification)
+            elif outcome:
+                delivered.append(notification.pk)
+        if delivered:
+            type(batch[0]).objects.using(batch[0]._state.db).filter(
+                pk__in=delivered
+            ).update(sent_successfully=True, datetime_sent=timezone.now())
+        return retry, error
+
+    def _probe(self) -> None:
+        """
+        Reset timeout is over - release deferred batches as half-open trials.
+        """
+        for callback in self._circuit.pop_deferred(self._circuit.half_open_max):
+            callback()
+
+    def _backoff(self, attempt: int, jitter: bool = True) -> float:
+        delay = float(min(self.retry_delay * (2**attempt), self.retry_max_delay))
+        if not jitter:
+            return delay
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Retry backed off batches now and stop the workers - deferred batches go
+        out if the circuit is closed, otherwise they're dropped.
+        """
+        self._shutting_down = True
+        self._retries.run_pending()
+        for callback in self._circuit.pop_deferred():
+            callback()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "async_enabled": self._executor is not None,
+            "workers": self.workers,
+            "scheduled_retries": len(self._retries),
+            "circuit": self._circuit.stats(),
+        }
+
+
+def get_dispatcher(channel: str) -> ChannelDispatcher:
+    """
+    The dispatcher for 'channel' - created once per process, stopped at exit.
+    """
+    dispatcher = _dispatchers.get(channel)
+    if dispatcher is not None:
+        return dispatcher
+    with _dispatchers_lock:
+        if channel not in _dispatchers:
+            _dispatchers[channel] = ChannelDispatcher(channel)
+            atexit.register(_dispatchers[channel].shutdown)
+        return _dispatchers[channel]
+
+
+def schedule_delivery(
+    channel: str, notifications: Sequence[Any], using: Optional[str] = None
+) -> None:
+    """
+    Deliver new 'push' / 'basic' notifications once the transaction creating them
+    (in the 'using' database) commits - on the channel's dispatcher, the outcome is
+    written to 'sent_successfully' / 'datetime_sent'. Nothing to do with the default
+    backends.
+    """
+    if not notifications or not delivery_enabled(channel):
+        return
+    notifications = list(notifications)
+    transaction.on_commit(
+        lambda: get_dispatcher(channel).dispatch(notifications), using=using
+    )
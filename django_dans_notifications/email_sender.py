@@ -1,13 +1,57 @@
+import heapq
+import itertools
 import logging
+import queue
+import random
+import smtplib
 import time
 import threading
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, Future
-from typing import Callable, Any, Optional, Dict, Union
+from functools import partial
+from typing import (
+    Callable,
+    Any,
+    Deque,
+    Optional,
+    Dict,
+    List,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 import atexit
 from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from .rate_limit import RateLimitDeferred, get_rate_limiter
 
 LOGGER = logging.getLogger(__name__)
 
+# per thread - 'defer_pacing' is set while an executor worker runs a send
+_worker = threading.local()
+
+#
+# Bounded queue - with 'EMAIL_QUEUE_SIZE' set, at most that many sends are queued or
+# running at once so an SMTP outage can't grow the queue until the process runs out
+# of memory. What happens when it's full is set by 'EMAIL_QUEUE_FULL_POLICY':
+#   - 'block': wait up to 'EMAIL_QUEUE_TIMEOUT' seconds for a free slot, then raise
+#   - 'reject': raise 'EmailQueueFullError' right away
+#   - 'outbox': 'send_email' / 'send_email_bulk' queue the email in the outbox instead
+#
+QUEUE_FULL_BLOCK = "block"
+QUEUE_FULL_REJECT = "reject"
+QUEUE_FULL_OUTBOX = "outbox"
+QUEUE_FULL_POLICIES = (QUEUE_FULL_BLOCK, QUEUE_FULL_REJECT, QUEUE_FULL_OUTBOX)
+
+
+class EmailQueueFullError(Exception):
+    """
+    Raised when an email can't be queued because 'EMAIL_QUEUE_SIZE' sends are
+    already queued or running.
+    """
+
 
 class EmailSender:
     """
@@ -19,6 +63,10 @@ class EmailSender:
     - Graceful shutdown
     - Better error tracking
     - Optional synchronous mode for testing
+    - Optional micro-batching of single messages ('submit_message')
+    - Optional bounded queue with backpressure ('EMAIL_QUEUE_SIZE')
+    - Retries wait on a timer, not in a worker, with jittered backoff and a budget
+    - Circuit breaker - sends wait in a deferred queue while the email server is down
     """
 
     _instance: Optional["EmailSender"] = None
@@ -44,6 +92,20 @@ class EmailSender:
         self.max_workers = getattr(settings, "EMAIL_MAX_WORKERS", 3)
         self.max_retries = getattr(settings, "EMAIL_MAX_RETRIES", 3)
         self.retry_delay = getattr(settings, "EMAIL_RETRY_DELAY", 1.0)
+        self.retry_max_delay = getattr(settings, "EMAIL_RETRY_MAX_DELAY", 60.0)
+        retry_budget_ratio = getattr(settings, "EMAIL_RETRY_BUDGET_RATIO", 0.2)
+        retry_budget_burst = getattr(settings, "EMAIL_RETRY_BUDGET_BURST", 20)
+        self.batch_size = getattr(settings, "EMAIL_BATCH_SIZE", 1)
+        self.batch_linger = getattr(settings, "EMAIL_BATCH_LINGER", 0.01)
+        self.queue_size = getattr(settings, "EMAIL_QUEUE_SIZE", 0)
+        self.queue_full_policy = getattr(
+            settings, "EMAIL_QUEUE_FULL_POLICY", QUEUE_FULL_BLOCK
+        )
+        self.queue_timeout = getattr(settings, "EMAIL_QUEUE_TIMEOUT", 10.0)
+        circuit_threshold = getattr(settings, "EMAIL_CIRCUIT_FAILURE_THRESHOLD", 5)
+        circuit_timeout = getattr(settings, "EMAIL_CIRCUIT_RESET_TIMEOUT", 30.0)
+        circuit_trials = getattr(settings, "EMAIL_CIRCUIT_HALF_OPEN_MAX", 1)
+        circuit_deferred = getattr(settings, "EMAIL_CIRCUIT_DEFERRED_SIZE", 1000)
 
         # Validate settings
         if self.max_workers < 1:
@@ -52,6 +114,37 @@ class EmailSender:
             raise ValueError("EMAIL_MAX_RETRIES must be >= 1")
         if self.retry_delay < 0:
             raise ValueError("EMAIL_RETRY_DELAY must be >= 0")
+        if self.retry_max_delay < 0:
+            raise ValueError("EMAIL_RETRY_MAX_DELAY must be >= 0")
+        if retry_budget_ratio < 0 or retry_budget_burst < 0:
+            raise ValueError("EMAIL_RETRY_BUDGET_RATIO / _BURST must be >= 0")
+        if self.batch_size < 1:
+            raise ValueError("EMAIL_BATCH_SIZE must be >= 1")
+        if self.batch_linger < 0:
+            raise ValueError("EMAIL_BATCH_LINGER must be >= 0")
+        if self.queue_size < 0:
+            raise ValueError("EMAIL_QUEUE_SIZE must be >= 0")
+        if self.queue_full_policy not in QUEUE_FULL_POLICIES:
+            raise ValueError(
+                f"EMAIL_QUEUE_FULL_POLICY must be one of {QUEUE_FULL_POLICIES}"
+            )
+        if self.queue_timeout < 0:
+            raise ValueError("EMAIL_QUEUE_TIMEOUT must be >= 0")
+        if circuit_threshold < 0:
+            raise ValueError("EMAIL_CIRCUIT_FAILURE_THRESHOLD must be >= 0")
+        if circuit_timeout < 0:
+            raise ValueError("EMAIL_CIRCUIT_RESET_TIMEOUT must be >= 0")
+        if circuit_trials < 1:
+            raise ValueError("EMAIL_CIRCUIT_HALF_OPEN_MAX must be >= 1")
+        if circuit_deferred < 0:
+            raise ValueError("EMAIL_CIRCUIT_DEFERRED_SIZE must be >= 0")
+
+        # sends queued or running - bounded by '_slots' when 'EMAIL_QUEUE_SIZE' is set
+        self._queued = 0
+        self._queued_lock = threading.Lock()
+        self._slots: Optional[threading.BoundedSemaphore] = (
+            threading.BoundedSemaphore(self.queue_size) if self.queue_size else None
+        )
 
         # Use synchronous mode in tests or when explicitly configured
         self.async_enabled = not getattr(settings, "EMAIL_SYNC_MODE", False)
@@ -64,6 +157,13 @@ class EmailSender:
             )
             # Register cleanup on exit
             atexit.register(self.shutdown)
+        self._batcher = MessageBatcher(self)
+        self._retries = RetryScheduler()
+        self._retry_budget = RetryBudget(retry_budget_ratio, retry_budget_burst)
+        self._circuit = CircuitBreaker(
+            circuit_threshold, circuit_timeout, circuit_trials, circuit_deferred
+        )
+        self._shutting_down = False
 
         LOGGER.info(
             f"EmailSender initialized: async={self.async_enabled}, "
@@ -89,17 +189,209 @@ class EmailSender:
             LOGGER.error("Executor not initialized but async mode is enabled")
             return None
 
-        future = self._executor.submit(self._execute_with_retry, func, *args, **kwargs)
+        self._acquire_slot()
+        future = self._submit_with_retry(func, *args, **kwargs)
+        future.add_done_callback(self._release_slot)
 
         # Add callback for logging
         future.add_done_callback(self._log_completion)
 
         return future
 
+    @property
+    def batching_enabled(self) -> bool:
+        return bool(self.async_enabled and self.batch_size > 1)
+
+    def submit_message(self, message: EmailMessage) -> "MessageFuture":
+        """
+        Queue 'message' to be sent together with other messages submitted within
+        'EMAIL_BATCH_LINGER' seconds (up to 'EMAIL_BATCH_SIZE') over one connection.
+
+        Returns:
+            - Future with the number of messages sent (0 or 1), or the send error
+        """
+        if self._executor is None:
+            future = MessageFuture()
+            self._batcher.send_batch([(message, future)])
+            return future
+
+        self._acquire_slot()
+        try:
+            if self.batching_enabled:
+                future = self._batcher.submit(message)
+            else:
+                # nothing to coalesce - a batch of one
+                future = MessageFuture()
+                self._batcher.send_batch([(message, future)])
+        except Exception:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _acquire_slot(self) -> None:
+        """
+        Reserve a place in the queue - per 'EMAIL_QUEUE_FULL_POLICY' when it's full.
+        """
+        if self._slots is not None:
+            if self.queue_full_policy == QUEUE_FULL_BLOCK:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            else:
+                acquired = self._slots.acquire(blocking=False)
+            if not acquired:
+                raise EmailQueueFullError(
+                    f"Email queue is full ({self.queue_size} sends queued)"
+                )
+        with self._queued_lock:
+            self._queued += 1
+
+    def _release_slot(self, future: Optional[Future[Any]] = None) -> None:
+        with self._queued_lock:
+            self._queued -= 1
+        if self._slots is not None:
+            self._slots.release()
+
+    def _submit_with_retry(
+        self, func: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future[Any]:
+        """
+        Run 'func' on the executor - failed attempts are rescheduled on the retry
+        timer so the worker is free for other sends while they back off.
+
+        Returns:
+            - Future with the result, or the last error once retries are exhausted
+        """
+        future: Future[Any] = Future()
+        future.set_running_or_notify_cancel()
+        if self._executor is None:
+            try:
+                future.set_result(self._execute_with_retry(func, *args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._retry_budget.deposit()
+        self._submit_attempt(future, 0, func, args, kwargs)
+        return future
+
+    def _submit_attempt(
+        self,
+        future: Future[Any],
+        attempt: int,
+        func: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        if not self._circuit.allow():
+            # email server is down - park the send until a trial send gets through
+            if self._shutting_down or not self._circuit.defer(
+                lambda: self._submit_attempt(future, attempt, func, args, kwargs)
+            ):
+                future.set_exception(
+                    CircuitOpenError("Email circuit is open, send not deferred")
+                )
+            return
+        executor = self._executor
+        try:
+            if executor is None:
+                raise RuntimeError("Email sender is shut down")
+            executor.submit(self._attempt, future, attempt, func, args, kwargs)
+        except RuntimeError as e:
+            future.set_exception(e)
+
+    def _attempt(
+        self,
+        future: Future[Any],
+        attempt: int,
+        func: Callable[..., Any],
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        # once shutting down there's no timer to wait on - sleep instead
+        _worker.defer_pacing = not self._shutting_down
+        try:
+            result = func(*args, **kwargs)
+        except RateLimitDeferred as e:
+            # not a failure - back on the timer until its reserved turn, same attempt,
+            # continuing with what's left to send if some of it went out
+            self._settle_trial()
+            if e.resume is not None:
+                func, args, kwargs = e.resume, (), {}
+            self._retries.schedule(
+                e.delay,
+                lambda: self._submit_attempt(future, attempt, func, args, kwargs),
+            )
+            return
+        except Exception as e:
+            LOGGER.warning(
+                f"Email send attempt {attempt + 1}/{self.max_retries} failed: {e}"
+            )
+            # a refused recipient says nothing about the server being up
+            if isinstance(e, smtplib.SMTPRecipientsRefused):
+                self._settle_trial()
+            elif self._circuit.record_failure():
+                LOGGER.error(
+                    f"Email circuit opened, deferring sends for "
+                    f"{self._circuit.reset_timeout}s: {e}"
+                )
+                self._retries.schedule(self._circuit.reset_timeout, self._probe)
+            if attempt + 1 >= self.max_retries or self._shutting_down:
+                LOGGER.error(f"Email send failed after {attempt + 1} attempts: {e}")
+                future.set_exception(e)
+            elif not self._retry_budget.withdraw():
+                LOGGER.error(f"Email send failed, retry budget exhausted: {e}")
+                future.set_exception(e)
+            else:
+                self._retries.schedule(
+                    self._backoff(attempt),
+                    lambda: self._submit_attempt(
+                        future, attempt + 1, func, args, kwargs
+                    ),
+                )
+            return
+        finally:
+            _worker.defer_pacing = False
+
+        if attempt > 0:
+            LOGGER.info(f"Email sent successfully after {attempt + 1} attempts")
+        future.set_result(result)
+        deferred = self._circuit.record_success()
+        if deferred:
+            LOGGER.info(f"Email circuit closed, sending {len(deferred)} deferred")
+        for callback in deferred:
+            callback()
+
+    def _probe(self) -> None:
+        """
+        Reset timeout is over - release deferred sends as half-open trials.
+        """
+        for callback in self._circuit.pop_deferred(self._circuit.half_open_max):
+            callback()
+
+    def _settle_trial(self) -> None:
+        """
+        A send ended without saying whether the server is up - if it was a half-open
+        trial, hand its place to the next deferred send so the circuit can't stick.
+        """
+        if self._circuit.release_trial():
+            for callback in self._circuit.pop_deferred(1):
+                callback()
+
+    def _backoff(self, attempt: int, jitter: bool = True) -> float:
+        """
+        Seconds to wait before retrying after 'attempt' - exponential, capped at
+        'EMAIL_RETRY_MAX_DELAY'. With 'jitter' (equal jitter) it's randomly between
+        half and all of that, so failed sends don't all retry at the same moment.
+        """
+        delay = float(min(self.retry_delay * (2**attempt), self.retry_max_delay))
+        if not jitter:
+            return delay
+        return delay / 2 + random.uniform(0, delay / 2)
+
     def _execute_with_retry(
         self, func: Callable[..., Any], *args: Any, **kwargs: Any
     ) -> Any:
-        """Execute function with retry logic."""
+        """Execute function with retry logic - blocking, for synchronous mode."""
         last_exception = None
 
         for attempt in range(self.max_retries):
@@ -117,8 +409,7 @@ class EmailSender:
 
                 if attempt < self.max_retries - 1:
                     # Exponential backoff
-                    sleep_time = self.retry_delay * (2**attempt)
-                    time.sleep(sleep_time)
+                    time.sleep(self._backoff(attempt, jitter=False))
 
         # All retries failed
         LOGGER.error(
@@ -137,11 +428,19 @@ class EmailSender:
 
     def shutdown(self, wait: bool = True) -> None:
         """
-        Gracefully shutdown the thread pool.
+        Gracefully shutdown the thread pool and close pooled connections.
 
         Args:
             wait: If True, wait for all pending tasks to complete
         """
+        # hand queued messages to the executor before it stops accepting work
+        self._batcher.stop()
+        # retry backed off sends now - no further retries once shutting down
+        self._shutting_down = True
+        self._retries.run_pending()
+        # deferred sends go out if the circuit is closed, otherwise they fail
+        for callback in self._circuit.pop_deferred():
+            callback()
         if self._executor is not None:
             try:
                 LOGGER.info("Shutting down email sender thread pool")
@@ -150,6 +449,7 @@ class EmailSender:
                 LOGGER.error(f"Error during email sender shutdown: {e}")
             finally:
                 self._executor = None
+        _connection_pool.close_all()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get current stats about the email sender."""
@@ -158,17 +458,564 @@ class EmailSender:
                 "async_enabled": self.async_enabled,
                 "pending_tasks": 0,
                 "max_workers": self.max_workers,
+                "open_connections": len(_connection_pool),
+                "batched_messages": 0,
+                "rate_limit_waited": get_rate_limiter().waited,
+                "queue_size": self.queue_size,
             }
 
-        # ThreadPoolExecutor doesn't expose queue size directly,
-        # but we can track this if needed by wrapping submit()
         return {
             "async_enabled": self.async_enabled,
             "max_workers": self.max_workers,
             "max_retries": self.max_retries,
+            "open_connections": len(_connection_pool),
+            "batched_messages": self._batcher.pending,
+            "scheduled_retries": len(self._retries),
+            "retry_budget": self._retry_budget.balance,
+            # 'closed', 'open' or 'half_open', with the sends it deferred
+            "circuit": self._circuit.stats(),
+            # total seconds sends waited for EMAIL_RATE_LIMIT*
+            "rate_limit_waited": get_rate_limiter().waited,
+            # queued or running, 'queue_size' 0 is unbounded
+            "pending_tasks": self._queued,
+            "queue_size": self.queue_size,
         }
 
 
+"""
+# ==================================================================================== #
+# RETRIES ============================================================================ #
+# ==================================================================================== #
+"""
+
+#
+# Failed sends wait out their backoff on a timer thread instead of sleeping in an
+# executor worker, so a few failing emails don't stall delivery of the rest.
+#
+# Set in settings.py:
+#   - 'EMAIL_RETRY_MAX_DELAY': cap on the exponential backoff, in seconds (default: 60)
+#   - 'EMAIL_RETRY_BUDGET_RATIO': retries earned per new send (default: 0.2)
+#   - 'EMAIL_RETRY_BUDGET_BURST': max retries available at once (default: 20)
+#
+
+
+class RetryScheduler:
+    """
+    Runs callbacks after a delay from one timer thread (a heap ordered by due time).
+    """
+
+    def __init__(self, name: str = "email_retry_scheduler") -> None:
+        self.name = name
+        self._heap: List[Tuple[float, int, Callable[[], Any]]] = []
+        self._order = itertools.count()  # ties run in scheduling order
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def schedule(self, delay: float, callback: Callable[[], Any]) -> None:
+        with self._condition:
+            heapq.heappush(
+                self._heap, (time.monotonic() + delay, next(self._order), callback)
+            )
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name=self.name, daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+
+    def run_pending(self) -> None:
+        """
+        Run every scheduled callback now, without waiting for its delay.
+        """
+        with self._condition:
+            pending, self._heap = self._heap, []
+        for _, _, callback in sorted(pending):
+            self._call(callback)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                due = self._heap[0][0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                _, _, callback = heapq.heappop(self._heap)
+            self._call(callback)
+
+    @staticmethod
+    def _call(callback: Callable[[], Any]) -> None:
+        try:
+            callback()
+        except Exception as e:
+            LOGGER.error(f"Error scheduling email retry: {type(e)} - {e}")
+
+
+class RetryBudget:
+    """
+    Caps retries to a share of sends - every send earns 'ratio' of a retry, up to
+    'burst' saved. Once it's spent failures aren't retried, so an outage doesn't
+    multiply the load on the email server.
+    """
+
+    def __init__(self, ratio: float, burst: float) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self.balance = float(burst)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self.balance = min(self.burst, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+"""
+# ==================================================================================== #
+# CIRCUIT BREAKER ==================================================================== #
+# ==================================================================================== #
+"""
+
+#
+# After 'EMAIL_CIRCUIT_FAILURE_THRESHOLD' failed sends in a row the circuit opens -
+# sends and retries are parked in a deferred queue instead of hitting a server that's
+# down and tying up workers. After 'EMAIL_CIRCUIT_RESET_TIMEOUT' it's half-open: a few
+# deferred sends go out as trials, if one succeeds the circuit closes and the rest are
+# sent, if one fails it opens again. A trial that says nothing about the server (a
+# refused recipient, a paced send) hands its place to the next deferred send. Only
+# applies to async mode.
+#
+# Set in settings.py:
+#   - 'EMAIL_CIRCUIT_FAILURE_THRESHOLD': failed sends in a row that open the circuit,
+#     0 disables it (default: 5)
+#   - 'EMAIL_CIRCUIT_RESET_TIMEOUT': seconds open before trial sends (default: 30)
+#   - 'EMAIL_CIRCUIT_HALF_OPEN_MAX': trial sends at once when half-open (default: 1)
+#   - 'EMAIL_CIRCUIT_DEFERRED_SIZE': max deferred sends, more fail with
+#     'CircuitOpenError' (default: 1000)
+#
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised (on the send's future) when the circuit is open and the send can't be
+    deferred - the deferred queue is full or the sender is shutting down.
+    """
+
+
+class CircuitBreaker:
+    """
+    Tracks failed sends in a row and holds the sends deferred while open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        half_open_max: int,
+        deferred_size: int,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max = half_open_max
+        self.deferred_size = deferred_size
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._deferred: Deque[Callable[[], Any]] = deque()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Whether a send can go out now - closed, or one of the half-open trials.
+        """
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if (
+                self.state == CIRCUIT_OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self.state = CIRCUIT_HALF_OPEN
+                self._trials = 0
+            if self.state == CIRCUIT_HALF_OPEN and self._trials < self.half_open_max:
+                self._trials += 1
+                return True
+            return False
+
+    def defer(self, callback: Callable[[], Any]) -> bool:
+        """
+        Park a send to be resubmitted by 'callback' - False if the queue is full.
+        """
+        with self._lock:
+            if len(self._deferred) >= self.deferred_size:
+                return False
+            self._deferred.append(callback)
+            return True
+
+    def pop_deferred(self, count: Optional[int] = None) -> List[Callable[[], Any]]:
+        with self._lock:
+            count = len(self._deferred) if count is None else count
+            return [
+                self._deferred.popleft() for _ in range(min(count, len(self._deferred)))
+            ]
+
+    def record_success(self) -> List[Callable[[], Any]]:
+        """
+        A send went out - closes the circuit.
+
+        Returns:
+            - Deferred sends to resubmit, if the circuit was open
+        """
+        with self._lock:
+            self.failures = 0
+            if self.state == CIRCUIT_CLOSED:
+                return []
+            self.state = CIRCUIT_CLOSED
+            deferred = list(self._deferred)
+            self._deferred.clear()
+            return deferred
+
+    def release_trial(self) -> bool:
+        """
+        A half-open trial ended with neither success nor failure - frees its place.
+
+        Returns:
+            - True if a trial place was freed
+        """
+        with self._lock:
+            if self.state != CIRCUIT_HALF_OPEN or self._trials == 0:
+                return False
+            self._trials -= 1
+            return True
+
+    def record_failure(self) -> bool:
+        """
+        A send failed - opens the circuit at the threshold, or if it was a trial.
+
+        Returns:
+            - True if the circuit just opened
+        """
+        with self._lock:
+            self.failures += 1
+            if self.failure_threshold == 0 or self.state == CIRCUIT_OPEN:
+                return False
+            if (
+                self.state == CIRCUIT_HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                self.state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "deferred": len(self._deferred),
+            }
+
+
+"""
+# ==================================================================================== #
+# MESSAGE BATCHER ==================================================================== #
+# ==================================================================================== #
+"""
+
+#
+# Coalesces single messages (i.e., from 'send_email') submitted within a short window
+# into one executor task that sends them all over one connection - trading a few ms
+# of latency for fewer tasks and connection round trips during campaigns.
+#
+# Set in settings.py:
+#   - 'EMAIL_BATCH_SIZE': max messages per batch, 1 disables batching (default: 1)
+#   - 'EMAIL_BATCH_LINGER': max seconds to wait for a batch to fill (default: 0.01)
+#
+
+
+class MessageFuture(Future):  # type: ignore[type-arg]
+    """
+    Outcome of one message - 'attempts' counts the sends of its batch (retries).
+    """
+
+    attempts = 0
+
+
+_STOP = None
+
+
+class MessageBatcher:
+    """
+    Collects submitted messages on a dispatcher thread and hands them to the
+    executor in batches of up to 'EMAIL_BATCH_SIZE'.
+    """
+
+    def __init__(self, sender: EmailSender) -> None:
+        self._sender = sender
+        self._queue: "queue.Queue[Optional[Tuple[EmailMessage, MessageFuture]]]" = (
+            queue.Queue()
+        )
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, message: EmailMessage) -> MessageFuture:
+        future = MessageFuture()
+        self._queue.put((message, future))
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="email_batcher", daemon=True
+                )
+                self._thread.start()
+        return future
+
+    def stop(self) -> None:
+        """
+        Dispatch everything queued and stop the dispatcher thread.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self._sender.batch_linger
+            while len(batch) < self._sender.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._dispatch(batch)
+                    return
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Any]) -> None:
+        try:
+            self.send_batch(batch)
+        except Exception as e:
+            LOGGER.error(f"Error dispatching email batch: {type(e)} - {e}")
+
+    def send_batch(self, batch: List[Tuple[EmailMessage, MessageFuture]]) -> None:
+        """
+        Send 'batch' over one connection (on the executor, if there is one) and
+        resolve each message's future.
+        """
+        batch = [
+            (message, future)
+            for message, future in batch
+            if future.set_running_or_notify_cancel()
+        ]
+        if not batch:
+            return
+        # messages that failed are retried (with backoff) without the ones sent
+        remaining = batch
+        errors: Dict[int, Exception] = {}
+
+        def send() -> None:
+            nonlocal remaining
+            try:
+                outcomes = _send_messages([message for message, _ in remaining])
+            except Exception:
+                for _, future in remaining:
+                    future.attempts += 1
+                raise
+            failed = []
+            paced = []
+            for (message, future), outcome in zip(remaining, outcomes):
+                if isinstance(outcome, RateLimitDeferred):
+                    paced.append((message, future))  # not sent yet, not an attempt
+                    continue
+                future.attempts += 1
+                if not isinstance(outcome, Exception):
+                    future.set_result(outcome)
+                elif future.attempts >= self._sender.max_retries:
+                    future.set_exception(outcome)
+                else:
+                    errors[id(future)] = outcome
+                    failed.append((message, future))
+            remaining = failed + paced
+            if paced:
+                # the rest goes out when the first of it is due - failed messages
+                # are tried again with it
+                raise RateLimitDeferred(
+                    min(
+                        outcome.delay
+                        for outcome in outcomes
+                        if isinstance(outcome, RateLimitDeferred)
+                    )
+                )
+            if failed:
+                raise errors[id(failed[0][1])]
+
+        def finish(outcome: Future[Any]) -> None:
+            error = outcome.exception()
+            if error is None:
+                return
+            for _, future in remaining:
+                future.set_exception(errors.get(id(future), error))
+
+        self._sender._submit_with_retry(send).add_done_callback(finish)
+
+
+"""
+# ==================================================================================== #
+# CONNECTION POOL ==================================================================== #
+# ==================================================================================== #
+"""
+
+#
+# Every thread (i.e., each executor worker) keeps one open email backend connection
+# and reuses it across messages instead of connecting (TLS handshake, AUTH) per message.
+#
+# Set in settings.py:
+#   - 'EMAIL_CONNECTION_REUSE': keep connections open between messages (default: True)
+#   - 'EMAIL_CONNECTION_MAX_MESSAGES': reconnect after this many messages (default: 100)
+#   - 'EMAIL_CONNECTION_IDLE_TIMEOUT': reconnect when idle for longer, in seconds (default: 30)
+#
+# connections idle for longer than this are health checked (SMTP NOOP) before reuse
+_HEALTH_CHECK_AFTER = 1.0
+
+
+class _PooledConnection:
+    def __init__(self, connection: Any) -> None:
+        self.connection = connection
+        self.messages = 0
+        self.last_used = time.monotonic()
+        self.closed = False
+
+
+class ConnectionPool:
+    """
+    Thread-local, long-lived email backend connections - reconnected when they
+    fail a health check, go idle, or have sent 'EMAIL_CONNECTION_MAX_MESSAGES'.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pooled: Set[_PooledConnection] = set()
+
+    def __len__(self) -> int:
+        return len(self._pooled)
+
+    def acquire(self) -> Any:
+        """
+        Get the current thread's open connection - connecting if needed.
+        Raises if the backend can't be reached.
+        """
+        pooled: Optional[_PooledConnection] = getattr(self._local, "pooled", None)
+        if pooled is not None and not self._usable(pooled):
+            self.discard()
+            pooled = None
+        if pooled is None:
+            connection = get_connection()
+            connection.open()
+            pooled = _PooledConnection(connection)
+            self._local.pooled = pooled
+            with self._lock:
+                self._pooled.add(pooled)
+        return pooled.connection
+
+    def release(self, messages: int = 1) -> None:
+        """
+        Done sending 'messages' over the current thread's connection.
+        """
+        pooled: Optional[_PooledConnection] = getattr(self._local, "pooled", None)
+        if pooled is None:
+            return
+        pooled.messages += messages
+        pooled.last_used = time.monotonic()
+        if not getattr(settings, "EMAIL_CONNECTION_REUSE", True) or (
+            pooled.messages >= getattr(settings, "EMAIL_CONNECTION_MAX_MESSAGES", 100)
+        ):
+            self.discard()
+
+    def discard(self) -> None:
+        """
+        Close the current thread's connection, i.e., after a failure.
+        """
+        pooled: Optional[_PooledConnection] = getattr(self._local, "pooled", None)
+        self._local.pooled = None
+        if pooled is not None:
+            with self._lock:
+                self._pooled.discard(pooled)
+            self._close(pooled)
+
+    def close_all(self) -> None:
+        """
+        Close every thread's connection - threads reconnect on their next send.
+        """
+        with self._lock:
+            pooled_connections = list(self._pooled)
+            self._pooled.clear()
+        for pooled in pooled_connections:
+            self._close(pooled)
+
+    @staticmethod
+    def _close(pooled: _PooledConnection) -> None:
+        pooled.closed = True
+        try:
+            pooled.connection.close()
+        except Exception as e:
+            LOGGER.warning(f"Error closing email connection: {e}")
+
+    @staticmethod
+    def _usable(pooled: _PooledConnection) -> bool:
+        if pooled.closed:
+            return False
+        idle = time.monotonic() - pooled.last_used
+        if idle > getattr(settings, "EMAIL_CONNECTION_IDLE_TIMEOUT", 30.0):
+            return False
+        if idle <= _HEALTH_CHECK_AFTER:
+            return True
+        # SMTP backend - the server may have dropped us while idle
+        smtp = getattr(pooled.connection, "connection", None)
+        if smtp is None or not hasattr(smtp, "noop"):
+            return True
+        try:
+            return bool(smtp.noop()[0] == 250)
+        except Exception:
+            return False
+
+
+_connection_pool = ConnectionPool()
+
+
+def get_connection_pool() -> ConnectionPool:
+    return _connection_pool
+
+
 # Convenience function for backward compatibility
 def send_email_async(
     func: Callable[..., Any], *args: Any, **kwargs: Any
@@ -181,3 +1028,149 @@ def send_email_async(
     """
     sender = EmailSender()
     return sender.send_with_retry(func, *args, **kwargs)
+
+
+def send_message(message: EmailMessage) -> int:
+    """
+    Send 'message' through the 'email' delivery backend (by default over the
+    current thread's pooled connection) - meant to be passed to 'send_email_async'
+    instead of 'message.send'.
+
+    Returns:
+        - Number of messages sent (0 or 1)
+    """
+    outcome = _send_messages([message])[0]
+    if isinstance(outcome, Exception):
+        raise outcome
+    return outcome
+
+
+def send_messages_batch(messages: Sequence[EmailMessage]) -> List[bool]:
+    """
+    Send messages through the 'email' delivery backend (by default over the
+    current thread's pooled connection).
+
+    Meant to be passed to 'send_email_async' - a failure to connect raises (and
+    is retried), failures of individual messages are reported per message.
+
+    Returns:
+        - List of booleans, whether each message was sent
+    """
+    return _send_paced(  # type: ignore[no-any-return]
+        messages, lambda outcomes: [error is None for error in _errors(outcomes)]
+    )
+
+
+def send_messages_batch_errors(messages: Sequence[EmailMessage]) -> List[Optional[str]]:
+    """
+    Same as 'send_messages_batch' but reports why each message failed.
+
+    Returns:
+        - List of error messages, None for each message that was sent
+    """
+    return _send_paced(messages, _errors)  # type: ignore[no-any-return]
+
+
+def _errors(outcomes: Sequence[Union[int, Exception]]) -> List[Optional[str]]:
+    errors: List[Optional[str]] = []
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            errors.append(f"{type(outcome).__name__}: {outcome}")
+        else:
+            errors.append(None if outcome else "Message was not sent")
+    return errors
+
+
+def _send_paced(
+    messages: Sequence[EmailMessage],
+    convert: Callable[[List[Union[int, Exception]]], Any],
+    outcomes: Optional[List[Union[int, Exception]]] = None,
+) -> Any:
+    """
+    Send the 'messages' without an outcome yet (all of them at first) and return
+    'convert(outcomes)' - or, if some have to wait for their rate limit turn, raise
+    'RateLimitDeferred' to resume with the rest once the first of them is due.
+    """
+    outcomes = (
+        list(outcomes)
+        if outcomes is not None
+        else [RateLimitDeferred(0.0)] * len(messages)
+    )
+    pending = [
+        index
+        for index, outcome in enumerate(outcomes)
+        if isinstance(outcome, RateLimitDeferred)
+    ]
+    sent = _send_messages([messages[index] for index in pending])
+    for index, outcome in zip(pending, sent):
+        outcomes[index] = outcome
+    paced = [outcome for outcome in sent if isinstance(outcome, RateLimitDeferred)]
+    if paced:
+        raise RateLimitDeferred(
+            min(outcome.delay for outcome in paced),
+            resume=partial(_send_paced, messages, convert, outcomes),
+        )
+    return convert(outcomes)
+
+
+def _send_messages(messages: Sequence[EmailMessage]) -> List[Union[int, Exception]]:
+    """
+    Send 'messages' through the 'email' delivery backend (see 'delivery.py').
+
+    Returns:
+        - Number sent (0 or 1) or the exception raised, for each message
+    """
+    from .delivery import CHANNEL_EMAIL, get_delivery_backend
+
+    return [
+        outcome if isinstance(outcome, Exception) else int(outcome)
+        for outcome in get_delivery_backend(CHANNEL_EMAIL).deliver(messages)
+    ]
+
+
+def send_messages_pooled(
+    messages: Sequence[EmailMessage],
+) -> List[Union[int, Exception]]:
+    """
+    Send 'messages' over the current thread's pooled connection - what the default
+    'email' delivery backend does.
+
+    Returns:
+        - Number sent (0 or 1) or the exception raised, for each message -
+          'RateLimitDeferred' for those not sent yet (on the workers, see above)
+    """
+    rate_limiter = get_rate_limiter()
+    defer_pacing = getattr(_worker, "defer_pacing", False)
+    outcomes: List[Union[int, Exception]] = []
+    tried = 0
+    for message in messages:
+        # paced, not rejected - waits out its turn under the global and recipient
+        # domain limits. On the workers a message whose turn hasn't come keeps its
+        # reservation and gets a 'RateLimitDeferred' outcome, the caller re-queues it
+        wait = rate_limiter.reserve_message(message)
+        if wait and defer_pacing:
+            outcomes.append(RateLimitDeferred(wait))
+            continue
+        rate_limiter.release_message(message)
+        if wait:
+            time.sleep(wait)
+        tried += 1
+        try:
+            message.connection = _connection_pool.acquire()
+        except Exception as e:
+            if tried == 1:
+                raise  # can't connect at all - let the caller retry the batch
+            LOGGER.error(f"Error reconnecting email backend: {e}")
+            outcomes.append(e)
+            continue
+        try:
+            sent = message.send()
+        except Exception as e:
+            LOGGER.error(f"Error sending email in batch: {type(e)} - {e}")
+            outcomes.append(e)
+            # connection may be broken - start a fresh one for the rest
+            _connection_pool.discard()
+            continue
+        _connection_pool.release()
+        outcomes.append(sent)
+    return outcomes
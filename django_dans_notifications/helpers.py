@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Iterable, List
 
 """
 # ===============================================================================
@@ -15,3 +15,26 @@ def str_to_bool(v: Any) -> bool:
         "1",
         "on",
     )
+
+
+def normalize_recipient(recipient: Any) -> str:
+    """
+    Normalize a single recipient (email, user id, uuid) to the key used
+    by the recipient index.
+    """
+    return str(recipient).strip().strip("'\"[]").strip().lower()
+
+
+def normalize_recipients(recipients: Iterable[Any]) -> List[str]:
+    """
+    Normalize an iterable of recipients - drops empties and duplicates while
+    preserving order.
+    """
+    res: List[str] = []
+    seen = set()
+    for recipient in recipients:
+        key = normalize_recipient(recipient)
+        if key and key not in seen:
+            seen.add(key)
+            res.append(key)
+    return res
@@ -0,0 +1,66 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from django_dans_notifications.models.outbox import EmailOutbox
+
+"""
+# ==================================================================================== #
+# PROCESS EMAIL OUTBOX =============================================================== #
+# ==================================================================================== #
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued emails from the outbox (EMAIL_DELIVERY_MODE = 'outbox'). "
+        "Run as many workers as needed - batches are claimed with SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Emails claimed per batch (default: EMAIL_OUTBOX_BATCH_SIZE or 100).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait when no emails are due (default: 5).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no emails are due instead of polling.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        total_sent, total_retrying, total_failed = 0, 0, 0
+        try:
+            while True:
+                sent, retrying, failed = EmailOutbox.objects.process_batch(
+                    batch_size=options["batch_size"]
+                )
+                total_sent += sent
+                total_retrying += retrying
+                total_failed += failed
+                if sent or retrying or failed:
+                    if options["verbosity"] > 1:
+                        self.stdout.write(
+                            f"Batch: {sent} sent, {retrying} retrying, {failed} failed"
+                        )
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed email outbox: {total_sent} sent, {total_retrying} "
+                f"retrying, {total_failed} failed."
+            )
+        )
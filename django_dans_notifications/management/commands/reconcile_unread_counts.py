@@ -0,0 +1,112 @@
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count
+
+from django_dans_notifications.models.counters import (
+    COUNTER_BATCH_SIZE,
+    NotificationUnreadCount,
+)
+from django_dans_notifications.models.notifications import NotificationBasic
+from django_dans_notifications.models.recipients import NotificationRecipient
+
+"""
+# ==================================================================================== #
+# RECONCILE UNREAD COUNTS ============================================================ #
+# ==================================================================================== #
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the NotificationBasic unread counters from the notifications "
+        "and repair any that drifted."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted counters without changing them.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            # lock counters first so concurrent updates wait for us and
+            # the unread counts read below include everything committed
+            locked: List[Tuple[str, int, int]] = list(
+                NotificationUnreadCount.objects.select_for_update().values_list(
+                    "recipient", "unread", "shared"
+                )
+            )
+            counters = {key: (unread, shared) for key, unread, shared in locked}
+            rows = NotificationRecipient.objects.filter(
+                notification_type=NotificationBasic._meta.model_name,
+                notification_id__in=NotificationBasic.objects.filter(read=False).values(
+                    "id"
+                ),
+            )
+            # unread notifications addressed to more than one recipient
+            shared_ids = (
+                rows.values("notification_id")
+                .annotate(recipients=Count("id"))
+                .filter(recipients__gt=1)
+                .values("notification_id")
+            )
+            unread_counts, shared_counts = (
+                dict(
+                    queryset.values("recipient")
+                    .annotate(unread=Count("id"))
+                    .values_list("recipient", "unread")
+                )
+                for queryset in (rows, rows.filter(notification_id__in=shared_ids))
+            )
+            expected: Dict[str, Tuple[int, int]] = {
+                key: (unread, shared_counts.get(key, 0))
+                for key, unread in unread_counts.items()
+            }
+
+            drifted = {
+                key: expected.get(key, (0, 0))
+                for key in set(counters) | set(expected)
+                if counters.get(key) != expected.get(key, (0, 0))
+            }
+            for key, (unread, shared) in sorted(drifted.items()):
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        f"{key}: {counters.get(key)} -> ({unread}, {shared})"
+                    )
+
+            if not options["dry_run"]:
+                self.repair(drifted, counters)
+
+        verb = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {len(drifted)} drifted unread counter(s).")
+        )
+
+    @staticmethod
+    def repair(
+        drifted: Dict[str, Tuple[int, int]], counters: Dict[str, Tuple[int, int]]
+    ) -> None:
+        NotificationUnreadCount.objects.bulk_create(
+            [
+                NotificationUnreadCount(recipient=key, unread=unread, shared=shared)
+                for key, (unread, shared) in drifted.items()
+                if key not in counters
+            ],
+            batch_size=COUNTER_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+        # one UPDATE per distinct value - most drifted counters end up at 0
+        by_count: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        for key, count in drifted.items():
+            by_count[count].append(key)
+        for (unread, shared), keys in by_count.items():
+            for start in range(0, len(keys), COUNTER_BATCH_SIZE):
+                NotificationUnreadCount.objects.filter(
+                    recipient__in=keys[start : start + COUNTER_BATCH_SIZE]
+                ).update(unread=unread, shared=shared)
@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-18 10:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_dans_notifications", "0002_alter_notificationemailtemplate_options"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationRecipient",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("notification_id", models.UUIDField()),
+                ("notification_type", models.CharField(max_length=100)),
+                ("recipient", models.CharField(max_length=300)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["recipient", "notification_type", "notification_id"],
+                        name="ddn_recipient_lookup_idx",
+                    ),
+                    models.Index(
+                        fields=["notification_id"], name="ddn_recipient_notif_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,91 @@
+from typing import Any, Iterable, List
+
+from django.db import migrations, transaction
+
+BATCH_SIZE = 2000
+
+NOTIFICATION_MODELS = (
+    "NotificationBasic",
+    "NotificationEmail",
+    "NotificationPush",
+)
+
+
+# frozen copy of 'helpers.normalize_recipients' - later changes to the helper
+# must not change what this migration writes
+def normalize_recipients(recipients: Iterable[Any]) -> List[str]:
+    res: List[str] = []
+    seen = set()
+    for recipient in recipients:
+        key = str(recipient).strip().strip("'\"[]").strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            res.append(key)
+    return res
+
+
+def backfill_recipients(apps: Any, schema_editor: Any) -> None:
+    """
+    Populate NotificationRecipient from the existing 'recipients' strings,
+    reading notifications in primary key order, a batch at a time, so large
+    tables aren't loaded into memory. Each batch is written in its own
+    transaction - the migration isn't atomic, so a large backfill doesn't hold
+    one long transaction (and its locks) open. A batch replaces any rows it
+    already wrote, so a backfill that was interrupted can just be run again.
+    """
+    NotificationRecipient = apps.get_model(
+        "django_dans_notifications", "NotificationRecipient"
+    )
+    db_alias = schema_editor.connection.alias
+    recipient_rows = NotificationRecipient.objects.using(db_alias)
+
+    for model_name in NOTIFICATION_MODELS:
+        model = apps.get_model("django_dans_notifications", model_name)
+        notification_type = model._meta.model_name
+        notifications = model.objects.using(db_alias).order_by("id")
+        last_id = None
+        while True:
+            batch = notifications
+            if last_id is not None:
+                batch = batch.filter(id__gt=last_id)
+            rows = list(batch.values_list("id", "recipients")[:BATCH_SIZE])
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            ids = [notification_id for notification_id, _ in rows]
+            with transaction.atomic(using=db_alias):
+                recipient_rows.filter(notification_id__in=ids).delete()
+                recipient_rows.bulk_create(
+                    [
+                        NotificationRecipient(
+                            notification_id=notification_id,
+                            notification_type=notification_type,
+                            recipient=recipient,
+                        )
+                        for notification_id, recipients in rows
+                        for recipient in normalize_recipients(
+                            str(recipients).split(",")
+                        )
+                    ],
+                    batch_size=BATCH_SIZE,
+                )
+
+
+def clear_recipients(apps: Any, schema_editor: Any) -> None:
+    NotificationRecipient = apps.get_model(
+        "django_dans_notifications", "NotificationRecipient"
+    )
+    NotificationRecipient.objects.using(schema_editor.connection.alias).all().delete()
+
+
+class Migration(migrations.Migration):
+    # batches commit on their own - see 'backfill_recipients'
+    atomic = False
+
+    dependencies = [
+        ("django_dans_notifications", "0003_notificationrecipient"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_recipients, clear_recipients),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0 on 2026-10-18 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_dans_notifications", "0004_backfill_notificationrecipient"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notificationbasic",
+            name="sender",
+            field=models.CharField(
+                db_index=True,
+                help_text="This should be the sending users email.",
+                max_length=300,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notificationemail",
+            name="sender",
+            field=models.CharField(
+                db_index=True,
+                help_text="This should be the sending users email.",
+                max_length=300,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notificationpush",
+            name="sender",
+            field=models.CharField(
+                db_index=True,
+                help_text="This should be the sending users email.",
+                max_length=300,
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-18 10:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_dans_notifications", "0005_notification_sender_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notificationbasic",
+            index=models.Index(
+                fields=["datetime_created", "id"], name="ddn_basic_cursor_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationemail",
+            index=models.Index(
+                fields=["datetime_created", "id"], name="ddn_email_cursor_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationpush",
+            index=models.Index(
+                fields=["datetime_created", "id"], name="ddn_push_cursor_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-18 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_dans_notifications", "0006_notification_cursor_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationemail",
+            name="html_content",
+            field=models.BinaryField(
+                blank=True,
+                help_text="Rendered HTML content - only set when EMAIL_CONTENT_MODE is 'stored'.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationemail",
+            name="text_content",
+            field=models.BinaryField(
+                blank=True,
+                help_text="Plain text content - only set when EMAIL_CONTENT_MODE is 'stored'.",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0 on 2026-10-18 10:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_dans_notifications", "0007_notificationemail_content"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationUnreadCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("recipient", models.CharField(max_length=300, unique=True)),
+                ("unread", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
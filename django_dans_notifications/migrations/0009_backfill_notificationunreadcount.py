@@ -0,0 +1,59 @@
+from typing import Any
+
+from django.db import migrations
+from django.db.models import Count
+
+BATCH_SIZE = 2000
+
+
+def backfill_unread_counts(apps: Any, schema_editor: Any) -> None:
+    """
+    Populate NotificationUnreadCount from the existing unread NotificationBasic,
+    grouped in the database via the recipient index.
+    """
+    NotificationBasic = apps.get_model("django_dans_notifications", "NotificationBasic")
+    NotificationRecipient = apps.get_model(
+        "django_dans_notifications", "NotificationRecipient"
+    )
+    NotificationUnreadCount = apps.get_model(
+        "django_dans_notifications", "NotificationUnreadCount"
+    )
+    db_alias = schema_editor.connection.alias
+
+    counts = (
+        NotificationRecipient.objects.using(db_alias)
+        .filter(
+            notification_type="notificationbasic",
+            notification_id__in=NotificationBasic.objects.using(db_alias)
+            .filter(read=False)
+            .values("id"),
+        )
+        .values_list("recipient")
+        .annotate(unread=Count("id"))
+        .order_by()
+    )
+    rows = []
+    for recipient, unread in counts.iterator(chunk_size=BATCH_SIZE):
+        rows.append(NotificationUnreadCount(recipient=recipient, unread=unread))
+        if len(rows) >= BATCH_SIZE:
+            NotificationUnreadCount.objects.using(db_alias).bulk_create(rows)
+            rows = []
+    if rows:
+        NotificationUnreadCount.objects.using(db_alias).bulk_create(rows)
+
+
+def clear_unread_counts(apps: Any, schema_editor: Any) -> None:
+    NotificationUnreadCount = apps.get_model(
+        "django_dans_notifications", "NotificationUnreadCount"
+    )
+    NotificationUnreadCount.objects.using(schema_editor.connection.alias).all().delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_dans_notifications", "0008_notificationunreadcount"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_unread_counts, clear_unread_counts),
+    ]
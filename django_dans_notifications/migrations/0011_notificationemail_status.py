@@ -0,0 +1,53 @@
+# Generated by Django 5.0 on 2026-10-18 11:04
+
+from typing import Any
+
+from django.db import migrations, models
+
+
+def backfill_status(apps: Any, schema_editor: Any) -> None:
+    """
+    Existing emails were marked 'sent_successfully' when handed to the sender -
+    treat those as sent and the rest that were handled as failed.
+    """
+    NotificationEmail = apps.get_model("django_dans_notifications", "NotificationEmail")
+    emails = NotificationEmail.objects.using(schema_editor.connection.alias)
+    emails.filter(sent_successfully=True).update(status="sent", attempts=1)
+    emails.filter(sent_successfully=False, datetime_sent__isnull=False).update(
+        status="failed", attempts=1
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_dans_notifications", "0010_emailoutbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationemail",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="notificationemail",
+            name="last_error",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="notificationemail",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                help_text="Delivery status - set once the send completes.",
+                max_length=20,
+            ),
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.0 on 2026-10-18 11:56
+
+from typing import Any
+
+from django.db import migrations, models, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower, Trim
+
+BATCH_SIZE = 2000
+
+NOTIFICATION_MODELS = (
+    "NotificationBasic",
+    "NotificationEmail",
+    "NotificationPush",
+)
+
+
+# frozen copy of 'helpers.normalize_recipient' - later changes to the helper
+# must not change what this migration writes
+def normalize_sender(sender: Any) -> str:
+    return str(sender).strip().strip("'\"[]").strip().lower()
+
+
+# senders 'Lower(Trim(...))' doesn't normalize like 'normalize_sender' - quoted,
+# bracketed or padded with whitespace other than spaces
+UNUSUAL_SENDERS = Q()
+for char in ("'", '"', "[", "]", "\t", "\n", "\r"):
+    UNUSUAL_SENDERS |= Q(sender__contains=char)
+
+
+def backfill_sender_key(apps: Any, schema_editor: Any) -> None:
+    """
+    Populate 'sender_key' - one UPDATE per batch of rows, in primary key order,
+    normalized in the database. The rare senders it can't normalize the same way
+    are fixed up one by one. Each batch commits on its own (the migration isn't
+    atomic), so it can be run again if interrupted.
+    """
+    db_alias = schema_editor.connection.alias
+    for model_name in NOTIFICATION_MODELS:
+        model = apps.get_model("django_dans_notifications", model_name)
+        notifications = model.objects.using(db_alias).order_by("id")
+        last_id = None
+        while True:
+            batch = notifications
+            if last_id is not None:
+                batch = batch.filter(id__gt=last_id)
+            ids = list(batch.values_list("id", flat=True)[:BATCH_SIZE])
+            if not ids:
+                break
+            rows = notifications.filter(id__gte=ids[0], id__lte=ids[-1])
+            last_id = ids[-1]
+            with transaction.atomic(using=db_alias):
+                rows.update(sender_key=Lower(Trim("sender")))
+                for pk, sender in rows.filter(UNUSUAL_SENDERS).values_list(
+                    "id", "sender"
+                ):
+                    rows.filter(id=pk).update(sender_key=normalize_sender(sender))
+
+
+class Migration(migrations.Migration):
+    # batches commit on their own - see 'backfill_sender_key'
+    atomic = False
+
+    dependencies = [
+        ("django_dans_notifications", "0011_notificationemail_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationbasic",
+            name="sender_key",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                help_text="Normalized 'sender' - used for ownership queries.",
+                max_length=300,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationemail",
+            name="sender_key",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                help_text="Normalized 'sender' - used for ownership queries.",
+                max_length=300,
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationpush",
+            name="sender_key",
+            field=models.CharField(
+                db_index=True,
+                default="",
+                editable=False,
+                help_text="Normalized 'sender' - used for ownership queries.",
+                max_length=300,
+            ),
+        ),
+        migrations.RunPython(backfill_sender_key, migrations.RunPython.noop),
+    ]
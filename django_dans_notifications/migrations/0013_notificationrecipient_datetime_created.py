@@ -0,0 +1,99 @@
+# Generated by Django 5.0 on 2026-10-18 12:32
+
+from typing import Any
+
+from django.db import migrations, models, transaction
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 2000
+
+NOTIFICATION_MODELS = (
+    "NotificationBasic",
+    "NotificationEmail",
+    "NotificationPush",
+)
+
+
+def backfill_datetime_created(apps: Any, schema_editor: Any) -> None:
+    """
+    Copy each notification's 'datetime_created' onto its recipient index rows -
+    one UPDATE per batch of notifications, read in primary key order. Each batch
+    commits on its own (the migration isn't atomic), so it can be run again if
+    interrupted.
+    """
+    NotificationRecipient = apps.get_model(
+        "django_dans_notifications", "NotificationRecipient"
+    )
+    db_alias = schema_editor.connection.alias
+
+    for model_name in NOTIFICATION_MODELS:
+        model = apps.get_model("django_dans_notifications", model_name)
+        notifications = model.objects.using(db_alias).order_by("id")
+        last_id = None
+        while True:
+            batch = notifications
+            if last_id is not None:
+                batch = batch.filter(id__gt=last_id)
+            ids = list(batch.values_list("id", flat=True)[:BATCH_SIZE])
+            if not ids:
+                break
+            last_id = ids[-1]
+            with transaction.atomic(using=db_alias):
+                NotificationRecipient.objects.using(db_alias).filter(
+                    notification_type=model._meta.model_name,
+                    notification_id__in=ids,
+                ).update(
+                    datetime_created=Subquery(
+                        model.objects.using(db_alias)
+                        .filter(id=OuterRef("notification_id"))
+                        .values("datetime_created")[:1]
+                    )
+                )
+
+
+class Migration(migrations.Migration):
+    # batches commit on their own - see 'backfill_datetime_created'
+    atomic = False
+
+    dependencies = [
+        ("django_dans_notifications", "0012_notification_sender_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationrecipient",
+            name="datetime_created",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(backfill_datetime_created, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="notificationrecipient",
+            index=models.Index(
+                fields=[
+                    "recipient",
+                    "notification_type",
+                    "datetime_created",
+                    "notification_id",
+                ],
+                name="ddn_recipient_cursor_idx",
+            ),
+        ),
+        # user notifications are paged off 'ddn_recipient_cursor_idx' now - it
+        # also serves the recipient lookups
+        migrations.RemoveIndex(
+            model_name="notificationrecipient",
+            name="ddn_recipient_lookup_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="notificationbasic",
+            name="ddn_basic_cursor_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="notificationemail",
+            name="ddn_email_cursor_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="notificationpush",
+            name="ddn_push_cursor_idx",
+        ),
+    ]
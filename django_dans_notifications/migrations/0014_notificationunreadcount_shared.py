@@ -0,0 +1,68 @@
+# Generated by Django 5.0 on 2026-10-18 12:36
+
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from django.db import migrations, models
+from django.db.models import Count
+
+BATCH_SIZE = 2000
+
+
+def backfill_shared_counts(apps: Any, schema_editor: Any) -> None:
+    """
+    Populate 'shared' from the unread NotificationBasic addressed to more than one
+    recipient, grouped in the database via the recipient index - one UPDATE per
+    distinct count.
+    """
+    NotificationBasic = apps.get_model("django_dans_notifications", "NotificationBasic")
+    NotificationRecipient = apps.get_model(
+        "django_dans_notifications", "NotificationRecipient"
+    )
+    NotificationUnreadCount = apps.get_model(
+        "django_dans_notifications", "NotificationUnreadCount"
+    )
+    db_alias = schema_editor.connection.alias
+
+    rows = NotificationRecipient.objects.using(db_alias).filter(
+        notification_type="notificationbasic",
+        notification_id__in=NotificationBasic.objects.using(db_alias)
+        .filter(read=False)
+        .values("id"),
+    )
+    shared_ids = (
+        rows.values("notification_id")
+        .annotate(recipients=Count("id"))
+        .filter(recipients__gt=1)
+        .values("notification_id")
+    )
+    counts = (
+        rows.filter(notification_id__in=shared_ids)
+        .values_list("recipient")
+        .annotate(shared=Count("id"))
+        .order_by()
+    )
+    by_shared: Dict[int, List[str]] = defaultdict(list)
+    for recipient, shared in counts.iterator(chunk_size=BATCH_SIZE):
+        by_shared[shared].append(recipient)
+    for shared, keys in by_shared.items():
+        for start in range(0, len(keys), BATCH_SIZE):
+            NotificationUnreadCount.objects.using(db_alias).filter(
+                recipient__in=keys[start : start + BATCH_SIZE]
+            ).update(shared=shared)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("django_dans_notifications", "0013_notificationrecipient_datetime_created"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationunreadcount",
+            name="shared",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_shared_counts, migrations.RunPython.noop),
+    ]
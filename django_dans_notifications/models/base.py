@@ -1,7 +1,13 @@
-from typing import Any, List
+from typing import Any, Dict, Iterable, List, Optional
 import uuid
 
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from django_dans_notifications.delivery import delivery_enabled
+from django_dans_notifications.helpers import normalize_recipient, normalize_recipients
+from .recipients import NotificationRecipient
 
 """
 # ==================================================================================== #
@@ -31,18 +37,146 @@ class AbstractBaseModel(models.Model):
 """
 
 
+#
+# NOTIFICATION BASE MANAGER =================== #
+#
+class NotificationBaseManager(models.Manager):  # type: ignore[type-arg]
+    """
+    NotificationBaseManager
+
+    Default manager for all notification models.
+
+    Makes sure 'bulk_create' cleans up recipients and populates the
+    recipient index the same way 'save' does.
+    """
+
+    # delivery channel of the model's notifications - None if they aren't delivered
+    delivery_channel: Optional[str] = None
+
+    @property
+    def _db_for_write(self) -> str:
+        # the database 'bulk_create' writes to - 'self.db' is the one read from
+        return self._db or router.db_for_write(self.model)
+
+    def bulk_create(self, objs: Iterable[Any], *args: Any, **kwargs: Any) -> List[Any]:
+        objs = list(objs)
+        for obj in objs:
+            obj.recipients = obj.recipients_cleanup()
+            obj.sender_key = normalize_recipient(obj.sender)
+        using = self._db_for_write
+        with transaction.atomic(using=using):
+            created = super(NotificationBaseManager, self).bulk_create(
+                objs, *args, **kwargs
+            )
+            NotificationRecipient.objects.db_manager(using).index_notifications(
+                created, batch_size=kwargs.get("batch_size")
+            )
+            self.notifications_created(created, using)
+        return created
+
+    def notifications_created(
+        self, notifications: List[Any], using: Optional[str] = None
+    ) -> None:
+        """
+        Called (inside the transaction) after notifications are bulk created in the
+        'using' database - subclasses can extend this to keep derived data in sync.
+        """
+
+    def bulk_notify(
+        self,
+        message: str,
+        recipients: Iterable[Any],
+        sender: str,
+        chunk_size: int = 2000,
+    ) -> int:
+        """
+        Create one notification per recipient - for fanning a message out to
+        many users. Only for models with a 'message' field (NotificationBasic,
+        NotificationPush).
+
+        Recipients are de-duplicated by their normalized key up front (stored as
+        given, indexed normalized - like 'save'), then notifications and their
+        recipient index rows are written in chunks inside one transaction. With a
+        delivery backend for the channel they're sent once it commits, otherwise
+        they're sent once stored.
+
+        :param str message: notification message
+        :param recipients: recipients (emails, ids) - one notification each
+        :param str sender: sender email
+        :param int chunk_size: rows per INSERT batch
+
+        :returns: number of notifications created
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        # {normalized key: recipient as given} - the first one of each key is kept
+        keys: Dict[str, str] = {}
+        for recipient in recipients:
+            key = normalize_recipient(recipient)
+            if key and key not in keys:
+                keys[key] = str(recipient).strip()
+        items = list(keys.items())
+        sender_key = normalize_recipient(sender)
+        channel = self.delivery_channel
+        delivered = channel is None or not delivery_enabled(channel)
+        datetime_sent = timezone.now() if delivered else None
+        notification_type = self.model._meta.model_name
+        using = self._db_for_write
+        with transaction.atomic(using=using):
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start : start + chunk_size]
+                notifications = [
+                    self.model(
+                        message=message,
+                        sender=sender,
+                        sender_key=sender_key,
+                        recipients=recipient,
+                        datetime_sent=datetime_sent,
+                        sent_successfully=delivered,
+                    )
+                    for _, recipient in chunk
+                ]
+                for notification in notifications:
+                    notification.recipients = notification.recipients_cleanup()
+                # index rows are already known - skip our 'bulk_create'
+                super(NotificationBaseManager, self).bulk_create(notifications)
+                NotificationRecipient.objects.db_manager(using).bulk_create(
+                    [
+                        NotificationRecipient(
+                            notification_id=notification.pk,
+                            notification_type=notification_type,
+                            recipient=key,
+                            datetime_created=notification.datetime_created,
+                        )
+                        for notification, (key, _) in zip(notifications, chunk)
+                    ]
+                )
+                self.notifications_created(notifications, using)
+        return len(items)
+
+
 #
 # NOTIFICATION BASE =================== #
 #
 class NotificationBase(AbstractBaseModel):
+    objects = NotificationBaseManager()
+
     datetime_sent = models.DateTimeField(null=True, blank=True)  # type: ignore[var-annotated]
     sent_successfully = models.BooleanField(default=False, null=False, blank=False)  # type: ignore[var-annotated]
     sender = models.CharField(  # type: ignore[var-annotated]
         max_length=300,
         null=False,
         blank=False,
+        db_index=True,
         help_text="This should be the sending users email.",
     )
+    sender_key = models.CharField(  # type: ignore[var-annotated]
+        max_length=300,
+        default="",
+        editable=False,
+        db_index=True,
+        help_text="Normalized 'sender' - used for ownership queries.",
+    )
     recipients = models.CharField(  # type: ignore[var-annotated]
         max_length=900,
         null=False,
@@ -59,7 +193,34 @@ class NotificationBase(AbstractBaseModel):
     def save(self, **kwargs):  # type: ignore
         # cleanup 'recipients'
         self.recipients = self.recipients_cleanup()
-        return super(NotificationBase, self).save(**kwargs)
+        self.sender_key = normalize_recipient(self.sender)
+        adding = self._state.adding
+        update_fields: Optional[Iterable[str]] = kwargs.get("update_fields")
+        if update_fields is not None and "sender" in update_fields:
+            kwargs["update_fields"] = update_fields = [*update_fields, "sender_key"]
+        # the database being written to - not necessarily the default one
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            res = super(NotificationBase, self).save(**kwargs)
+            # keep recipient index in sync (in the same database)
+            recipient_index = NotificationRecipient.objects.db_manager(using)
+            if adding:
+                recipient_index.index_notifications([self])
+            elif update_fields is None or "recipients" in update_fields:
+                recipient_index.reindex_notification(self)
+        return res
+
+    @classmethod
+    def query_recipients(cls, *recipients: Any) -> Q:
+        """
+        Q object matching notifications of this type where any of 'recipients'
+        (emails, ids) is a recipient - served by the recipient index.
+        """
+        return Q(
+            id__in=NotificationRecipient.objects.notification_ids(
+                recipients, notification_type=cls._meta.model_name
+            )
+        )
 
     @property
     def recipients_list(self) -> List[Any]:
@@ -94,13 +255,15 @@ class NotificationBase(AbstractBaseModel):
     def recipients_contains(self, user: Any) -> bool:
         """
         Detect if 'user' is involved with this notification or not
+
+        Matches whole recipients only (normalized the same way as the recipient
+        index), i.e., user id '1' does NOT match a recipient '12'.
         """
+        keys = set(normalize_recipients(self.recipients_list))
         if isinstance(user, str):
-            if user in self.recipients:
-                return True
-        else:
-            if hasattr(user, "email") and str(user.email) in self.recipients:
-                return True
-            if hasattr(user, "id") and str(user.id) in self.recipients:
-                return True
+            return normalize_recipient(user) in keys
+        if hasattr(user, "email") and normalize_recipient(user.email) in keys:
+            return True
+        if hasattr(user, "id") and normalize_recipient(user.id) in keys:
+            return True
         return False
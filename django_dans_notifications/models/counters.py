@@ -0,0 +1,182 @@
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from django.db import models
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from django_dans_notifications.helpers import normalize_recipients
+from .recipients import NotificationRecipient
+
+"""
+# ==================================================================================== #
+# NOTIFICATION UNREAD COUNT ========================================================== #
+# ==================================================================================== #
+"""
+
+# rows per INSERT / UPDATE ... WHERE recipient IN (...)
+COUNTER_BATCH_SIZE = 2000
+
+
+#
+# NOTIFICATION UNREAD COUNT MANAGER ================== #
+#
+class NotificationUnreadCountManager(models.Manager):  # type: ignore[type-arg]
+    """
+    NotificationUnreadCountManager
+
+    Manager for NotificationUnreadCount.
+
+    Counters are adjusted with 'UPDATE ... SET unread = unread + n' so concurrent
+    writers don't lose updates - call these inside the transaction that changes
+    the notifications so both commit (or roll back) together.
+    """
+
+    def unread_count(self, recipients: Iterable[Any]) -> int:
+        """
+        Unread NotificationBasic count for the passed recipients (emails, ids) of
+        one user - each notification is counted once, even if it is addressed to
+        several of them.
+
+        Read from the counters (one indexed lookup) unless two of the recipients
+        have unread notifications that are also addressed to other recipients -
+        only then can one be addressed to both, so they're counted through the
+        recipient index.
+        """
+        keys = normalize_recipients(recipients)
+        if not keys:
+            return 0
+        counts: List[Tuple[str, int, int]] = list(
+            self.filter(recipient__in=keys, unread__gt=0).values_list(
+                "recipient", "unread", "shared"
+            )
+        )
+        if sum(1 for _, _, shared in counts if shared) <= 1:
+            return sum(unread for _, unread, _ in counts)
+        # imported here - 'notifications' imports this module
+        from .notifications import NotificationBasic
+
+        return (
+            NotificationRecipient.objects.filter(
+                notification_type="notificationbasic",
+                recipient__in=[key for key, _, _ in counts],
+                notification_id__in=NotificationBasic.objects.filter(read=False).values(
+                    "id"
+                ),
+            )
+            .values("notification_id")
+            .distinct()
+            .count()
+        )
+
+    def adjust(
+        self, deltas: Mapping[str, int], shared: Optional[Mapping[str, int]] = None
+    ) -> None:
+        """
+        Add 'deltas' ({recipient: n}) to the counters, and 'shared' to their counts
+        of notifications also addressed to other recipients - missing counters are
+        created. Counters never go below 0.
+        """
+        shared = shared or {}
+        changes = {
+            key: (deltas.get(key, 0), shared.get(key, 0))
+            for key in set(deltas) | set(shared)
+        }
+        changes = {key: change for key, change in changes.items() if any(change)}
+        if not changes:
+            return
+
+        # only increments need a row - there's nothing to decrement otherwise
+        new_keys = [key for key, change in changes.items() if max(change) > 0]
+        if new_keys:
+            self.bulk_create(
+                [NotificationUnreadCount(recipient=key) for key in new_keys],
+                batch_size=COUNTER_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+
+        # one UPDATE per distinct change - usually just (+1, 0) or (-1, 0)
+        by_change: Dict[Tuple[int, int], List[str]] = defaultdict(list)
+        for key, change in changes.items():
+            by_change[change].append(key)
+        for (delta, shared_delta), change_keys in by_change.items():
+            for start in range(0, len(change_keys), COUNTER_BATCH_SIZE):
+                self.filter(
+                    recipient__in=change_keys[start : start + COUNTER_BATCH_SIZE]
+                ).update(
+                    unread=Greatest(F("unread") + delta, 0),
+                    shared=Greatest(F("shared") + shared_delta, 0),
+                )
+
+    def adjust_notifications(self, notifications: Iterable[Any], sign: int) -> None:
+        """
+        Add 'sign' (+1 / -1) to the counters of every recipient of the passed
+        unread notification objects - read notifications are skipped.
+        """
+        deltas: Counter[str] = Counter()
+        shared: Counter[str] = Counter()
+        for notification in notifications:
+            if not notification.read:
+                keys = normalize_recipients(notification.recipients_list)
+                for key in keys:
+                    deltas[key] += sign
+                    if len(keys) > 1:
+                        shared[key] += sign
+        self.adjust(deltas, shared)
+
+    def adjust_notification_ids(self, notification_ids: List[Any], sign: int) -> None:
+        """
+        Add 'sign' (+1 / -1) to the counters of every recipient of the passed
+        NotificationBasic ids - recipients come from the recipient index, so no
+        notifications are loaded.
+        """
+        deltas: Counter[str] = Counter()
+        shared: Counter[str] = Counter()
+        for start in range(0, len(notification_ids), COUNTER_BATCH_SIZE):
+            rows = NotificationRecipient.objects.filter(
+                notification_type="notificationbasic",
+                notification_id__in=notification_ids[
+                    start : start + COUNTER_BATCH_SIZE
+                ],
+            )
+            # the ones addressed to more than one recipient
+            shared_ids = (
+                rows.values("notification_id")
+                .annotate(recipients=Count("id"))
+                .filter(recipients__gt=1)
+                .values("notification_id")
+            )
+            for counts, queryset in (
+                (deltas, rows),
+                (shared, rows.filter(notification_id__in=shared_ids)),
+            ):
+                grouped: Iterable[Dict[str, Any]] = queryset.values(
+                    "recipient"
+                ).annotate(notifications=Count("id"))
+                for row in grouped:
+                    counts[row["recipient"]] += sign * row["notifications"]
+        self.adjust(deltas, shared)
+
+
+#
+# NOTIFICATION UNREAD COUNT ================== #
+#
+class NotificationUnreadCount(models.Model):
+    """
+    Number of unread NotificationBasic per recipient (email, id) - kept up to
+    date as notifications are created, marked read and deleted so unread badges
+    don't have to count notifications.
+
+    Use the 'reconcile_unread_counts' management command to repair drift, i.e.,
+    after updating 'read' with a raw 'QuerySet.update'.
+    """
+
+    objects = NotificationUnreadCountManager()
+
+    recipient = models.CharField(max_length=300, unique=True)  # type: ignore[var-annotated]
+    unread = models.PositiveIntegerField(default=0)  # type: ignore[var-annotated]
+    # of those, how many are addressed to other recipients too
+    shared = models.PositiveIntegerField(default=0)  # type: ignore[var-annotated]
+
+    def __str__(self) -> str:
+        return f"Notification Unread Count: {self.recipient} ({self.unread})"
@@ -1,15 +1,67 @@
-from typing import Any, Dict, List, Optional, Union
+from collections import Counter
+from concurrent.futures import Future
+from functools import partial
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
-from django.db import models
+from django.db import models, router, transaction
 from django.template import TemplateDoesNotExist
-from django.template.loader import render_to_string, get_template
+from django.template.loader import get_template
 from django.utils import timezone
-from django.utils.html import strip_tags
-from smtplib import SMTPAuthenticationError, SMTPException
 
-from .base import NotificationBase, AbstractBaseModel
-from django_dans_notifications.email_sender import send_email_async
+from django_dans_notifications.caches import cache_template, get_cached_template
+from django_dans_notifications.content import (
+    CONTENT_MODE_CACHE,
+    CONTENT_MODE_STORED,
+    decode_content,
+    encode_content,
+    get_content_cache,
+    get_content_cache_key,
+    get_content_cache_timeout,
+    get_content_mode,
+)
+from django_dans_notifications.delivery import (
+    CHANNEL_BASIC,
+    CHANNEL_PUSH,
+    schedule_delivery,
+)
+from django_dans_notifications.helpers import normalize_recipients
+from django_dans_notifications.rendering import (
+    html_to_text,
+    render_email_chunks,
+    render_memoized,
+    render_template,
+    render_template_many,
+)
+from .base import NotificationBase, NotificationBaseManager, AbstractBaseModel
+from .counters import NotificationUnreadCount
+from .outbox import (
+    DELIVERY_MODE_OUTBOX,
+    EmailOutbox,
+    get_delivery_mode,
+    serialize_message,
+)
+from django_dans_notifications.async_sender import get_async_sender
+from django_dans_notifications.email_sender import (
+    QUEUE_FULL_OUTBOX,
+    EmailQueueFullError,
+    EmailSender,
+    send_email_async,
+    send_messages_batch_errors,
+)
+from django_dans_notifications.status import (
+    STATUS_CHOICES,
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_SENT,
+    AttemptCounter,
+    DeliveryStatus,
+    get_delivery_status,
+    send_tracked_message,
+    write_delivery_statuses,
+)
 from django_dans_notifications.logging import LOGGER
 from django.core.files import File
 
@@ -21,16 +73,90 @@ from django.core.files import File
 """
 
 
+#
+# NOTIFICATION BASIC MANAGER ==================== #
+#
+class NotificationBasicManager(NotificationBaseManager):
+    """
+    NotificationBasicManager
+
+    Manager for NotificationBasic - keeps unread counters in sync for bulk creates
+    and hands them to the 'basic' delivery backend.
+    """
+
+    delivery_channel = CHANNEL_BASIC
+
+    def notifications_created(
+        self, notifications: List[Any], using: Optional[str] = None
+    ) -> None:
+        super(NotificationBasicManager, self).notifications_created(
+            notifications, using
+        )
+        NotificationUnreadCount.objects.db_manager(using).adjust_notifications(
+            notifications, 1
+        )
+        schedule_delivery(CHANNEL_BASIC, notifications, using)
+
+
 #
 # NOTIFICATION BASIC ==================== #
 #
 class NotificationBasic(NotificationBase):
+    objects = NotificationBasicManager()
+
     read = models.BooleanField(default=False, null=False, blank=False)  # type: ignore[var-annotated]
     message = models.CharField(max_length=600, null=False, blank=False)  # type: ignore[var-annotated]
 
     def __str__(self) -> str:
         return f"Basic Notification: {self.recipients}"
 
+    def save(self, **kwargs):  # type: ignore
+        adding = self._state.adding
+        update_fields: Optional[Iterable[str]] = kwargs.get("update_fields")
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            old_read, old_recipients = True, ""
+            if not adding:
+                old_read, old_recipients = self._get_stored_state(using)
+            res = super(NotificationBasic, self).save(**kwargs)  # type: ignore[no-untyped-call]
+
+            # state actually written - unsaved fields keep their stored value
+            new_read, new_recipients = self.read, self.recipients
+            if update_fields is not None:
+                if "read" not in update_fields:
+                    new_read = old_read
+                if "recipients" not in update_fields:
+                    new_recipients = old_recipients
+
+            deltas: Counter[str] = Counter()
+            shared: Counter[str] = Counter()
+            for read, recipients, sign in (
+                (old_read, old_recipients, -1),
+                (new_read, new_recipients, 1),
+            ):
+                if not read:
+                    keys = normalize_recipients(recipients.split(","))
+                    for key in keys:
+                        deltas[key] += sign
+                        if len(keys) > 1:
+                            shared[key] += sign
+            NotificationUnreadCount.objects.db_manager(using).adjust(deltas, shared)
+        return res
+
+    def _get_stored_state(self, using: Optional[str]) -> Tuple[bool, str]:
+        # locked - a concurrent save / 'mark_notifications_basic_read' waits, so
+        # the counters move from the state actually stored, exactly once
+        stored = (
+            NotificationBasic.objects.db_manager(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list("read", "recipients")
+            .first()
+        )
+        if stored is None:
+            return True, ""
+        return bool(stored[0]), str(stored[1])
+
 
 """
 # ==================================================================================== #
@@ -56,8 +182,27 @@ class NotificationEmailTemplateManager(models.Manager):  # type: ignore[type-arg
         """
         get or create NotificationEmailTemplate object for the passed 'template'
 
+        Results are cached (see 'caches.py') so repeated lookups of the same
+        template don't hit the database - only committed templates are cached.
+
         :param str template: Path of email template to use should be of this form 'django-dans-emails/<NAME>.html'. Can also be the templates 'nickname'.
         """
+        email_template: Optional[NotificationEmailTemplate] = get_cached_template(
+            template
+        )
+        if email_template is not None:
+            return email_template
+
+        email_template = NotificationEmailTemplateManager._find_email_template(template)
+        if email_template is not None:
+            transaction.on_commit(partial(cache_template, template, email_template))
+        return email_template
+
+    @staticmethod
+    def _find_email_template(template: str) -> Optional["NotificationEmailTemplate"]:
+        """
+        Uncached lookup for 'find_email_template'.
+        """
         try:
             return NotificationEmailTemplate.objects.get(path=template)  # type: ignore[no-any-return]
         except NotificationEmailTemplate.DoesNotExist:
@@ -126,7 +271,7 @@ class NotificationEmailTemplateManager(models.Manager):  # type: ignore[type-arg
 #
 # NOTIFICATION EMAIL MANAGER ================== #
 #
-class NotificationEmailManager(models.Manager):  # type: ignore[type-arg]
+class NotificationEmailManager(NotificationBaseManager):
     """
     NotificationEmailManager
 
@@ -137,6 +282,39 @@ class NotificationEmailManager(models.Manager):  # type: ignore[type-arg]
 
     use_in_migrations = True
 
+    @staticmethod
+    def _get_defaults(
+        subject: Optional[str], sender: Optional[str], template: Optional[str]
+    ) -> Tuple[str, str, str]:
+        """
+        Default subject, sender and template for sending emails.
+        """
+        if subject is None:
+            if hasattr(settings, "TEAM_NAME"):
+                subject = f"Email from {settings.TEAM_NAME}"
+            else:
+                subject = "Hi there!"
+        if sender is None:
+            sender = settings.DEFAULT_FROM_EMAIL
+        if template is None:
+            template = "django-dans-emails/default.html"
+        return subject, str(sender), template
+
+    @staticmethod
+    def _get_email_template(template: str) -> "NotificationEmailTemplate":
+        email_template = NotificationEmailTemplate.objects.find_email_template(
+            template=template
+        )
+        if not email_template:
+            raise ValueError("EmailTemplate with path/nickname does not exist.")
+        return email_template
+
+    @staticmethod
+    def _add_team_name(context: Dict[Any, Any]) -> None:
+        if hasattr(settings, "TEAM_NAME") and context:
+            if "team_name" not in context:
+                context["team_name"] = settings.TEAM_NAME
+
     @staticmethod
     def send_email(
         subject: Optional[str] = None,
@@ -149,17 +327,70 @@ class NotificationEmailManager(models.Manager):  # type: ignore[type-arg]
         """
         Send email function - sends email, handles notification system and object creation and everything
         WILL NOT send in test mode - set via 'IN_TEST' in settings.py file.
+
+        When 'EMAIL_DELIVERY_MODE' is 'outbox' the email is only queued (see 'models/outbox.py')
+        and 'sent_successfully' / 'datetime_sent' are set by the outbox worker once it's sent.
+        """
+        notification_email, message = NotificationEmailManager._prepare_email(
+            subject, template, sender, recipients, context, file_attachment
+        )
+        if message is None:
+            return notification_email
+        return NotificationEmailManager._deliver_email(notification_email, message)
+
+    @staticmethod
+    async def asend_email(
+        subject: Optional[str] = None,
+        template: Optional[str] = None,
+        sender: Optional[str] = None,
+        recipients: Optional[Union[str, List[str]]] = None,
+        context: Optional[Dict[Any, Any]] = None,
+        file_attachment: Optional[File] = None,  # type: ignore[type-arg]
+    ) -> "NotificationEmail":
+        """
+        Async version of 'send_email' for ASGI code - the email is sent on the running
+        event loop by the AsyncEmailSender (see 'async_sender.py') instead of a thread,
+        and returns once it's sent (or failed) with its delivery status set.
+        """
+        notification_email, message = await sync_to_async(
+            NotificationEmailManager._prepare_email
+        )(subject, template, sender, recipients, context, file_attachment)
+        if message is None:
+            return notification_email
+
+        if get_delivery_mode() == DELIVERY_MODE_OUTBOX or (
+            hasattr(settings, "IN_TEST") and settings.IN_TEST
+        ):
+            # nothing to send from here
+            return await sync_to_async(NotificationEmailManager._deliver_email)(
+                notification_email, message
+            )
+
+        status = await get_async_sender().send_tracked(notification_email.pk, message)
+        if status.status == STATUS_FAILED:
+            LOGGER.error(f"Error creating and sending email: {status.last_error}")
+        notification_email.apply_delivery_status(status)
+        return notification_email
+
+    @staticmethod
+    def _prepare_email(
+        subject: Optional[str],
+        template: Optional[str],
+        sender: Optional[str],
+        recipients: Optional[Union[str, List[str]]],
+        context: Optional[Dict[Any, Any]],
+        file_attachment: Optional[File],  # type: ignore[type-arg]
+    ) -> Tuple["NotificationEmail", Optional[EmailMultiAlternatives]]:
+        """
+        Render the email and create its NotificationEmail.
+
+        :returns: the NotificationEmail and its message - None if the message
+            couldn't be created
         """
         # default params
-        if subject is None:
-            if hasattr(settings, "TEAM_NAME"):
-                subject = f"Email from {settings.TEAM_NAME}"
-            else:
-                subject = "Hi there!"
-        if sender is None:
-            sender = settings.DEFAULT_FROM_EMAIL
-        if template is None:
-            template = "django-dans-emails/default.html"
+        subject, sender, template = NotificationEmailManager._get_defaults(
+            subject, sender, template
+        )
         if recipients is None:
             recipients = settings.DEFAULT_FROM_EMAIL
         if context is None:
@@ -168,32 +399,29 @@ class NotificationEmailManager(models.Manager):  # type: ignore[type-arg]
         # check if model exists for the .html file at the given path
         # if so, ensure that an EmailTemplate objects exists for it
         # if not, error
-        email_template = NotificationEmailTemplate.objects.find_email_template(
-            template=template
-        )
-        if not email_template:
-            raise ValueError("EmailTemplate with path/nickname does not exist.")
+        email_template = NotificationEmailManager._get_email_template(template)
 
         # add TEAM_NAME var to context if appropriate
-        if hasattr(settings, "TEAM_NAME") and context:
-            if "team_name" not in context:
-                context["team_name"] = settings.TEAM_NAME
+        NotificationEmailManager._add_team_name(context)
 
         # render html with context object
         html_string = email_template.html_to_str(context)
+        text_content = html_to_text(html_string)
 
-        # create EmailNotification object
-        notification_email = NotificationEmail.objects.create(
+        # create EmailNotification object - keep rendered content so it
+        # doesn't have to be rendered again when read back
+        notification_email = NotificationEmail(
             template=email_template,
             subject=subject,
             context=context,
             sender=sender,
             recipients=recipients,
         )
+        notification_email.set_content(html_string, text_content)
+        notification_email.save()  # type: ignore[no-untyped-call]
 
         # create message object
         try:
-            text_content = strip_tags(html_string)
             message = EmailMultiAlternatives(
                 subject=subject,
                 body=text_content,
@@ -202,10 +430,17 @@ class NotificationEmailManager(models.Manager):  # type: ignore[type-arg]
             )
             message.attach_alternative(html_string, "text/html")
         except ValueError as e:
+            # nothing will send it - record it as failed, not pending
             LOGGER.error(f"Error creating email message: {type(e)} - {e}")
-            notification_email.sent_successfully = False
-            notification_email.save()
-            return notification_email  # type: ignore[no-any-return]
+            status = DeliveryStatus(
+                notification_email.pk,
+                STATUS_FAILED,
+                notification_email.attempts,
+                f"Error creating email message: {type(e).__name__}: {e}",
+            )
+            write_delivery_statuses([status])
+            notification_email.apply_delivery_status(status)
+            return notification_email, None
 
         # attach file if applicable
         try:
@@ -217,26 +452,290 @@ class NotificationEmailManager(models.Manager):  # type: ignore[type-arg]
                 LOGGER.debug(f"File attached to email: {name}")
         except AttributeError as e:
             LOGGER.error(f"Issue attaching to email: {type(e)} - {e}")
+        return notification_email, message
+
+    @staticmethod
+    def _deliver_email(
+        notification_email: "NotificationEmail", message: EmailMultiAlternatives
+    ) -> "NotificationEmail":
+        # outbox - record a pending row, the 'process_email_outbox' worker sends it
+        if get_delivery_mode() == DELIVERY_MODE_OUTBOX:
+            NotificationEmailManager._enqueue_outbox(message, notification_email)
+            return notification_email
 
         # send email via django
+        if hasattr(settings, "IN_TEST") and settings.IN_TEST:
+            # don't send mail in tests
+            notification_email.datetime_sent = timezone.now()
+            notification_email.save()  # type: ignore[no-untyped-call]
+            return notification_email
+
+        # the outcome is written to the row from another thread - inside a transaction
+        # (i.e., 'ATOMIC_REQUESTS') only send once the row is committed and visible
+        using = notification_email._state.db
+        if transaction.get_connection(using).in_atomic_block:
+            transaction.on_commit(
+                partial(
+                    NotificationEmailManager._send_tracked,
+                    notification_email,
+                    message,
+                    committed=True,
+                ),
+                using=using,
+            )
+            return notification_email
+        NotificationEmailManager._send_tracked(notification_email, message)
+        return notification_email
+
+    @staticmethod
+    def _send_tracked(
+        notification_email: "NotificationEmail",
+        message: EmailMultiAlternatives,
+        committed: bool = False,
+    ) -> None:
+        # Use the email sender with retry logic and thread pooling - the outcome
+        # (status, attempts, error, 'datetime_sent') is recorded once the send completes
         try:
+            status = send_tracked_message(notification_email.pk, message)
+        except EmailQueueFullError as e:
+            if EmailSender().queue_full_policy == QUEUE_FULL_OUTBOX:
+                # backpressure - spill to the outbox instead of growing the queue
+                LOGGER.warning("Email queue is full, queueing email in the outbox")
+                NotificationEmailManager._enqueue_outbox(message, notification_email)
+                return
+            if not committed:
+                raise
+            # the caller already returned - record it, there's nobody to raise to
+            status = get_delivery_status(
+                notification_email.pk, notification_email.attempts, error=e
+            )
+            write_delivery_statuses([status])
+        if status is not None:
+            if status.status == STATUS_FAILED:
+                LOGGER.error(f"Error creating and sending email: {status.last_error}")
+            notification_email.apply_delivery_status(status)
+
+    @staticmethod
+    def send_email_bulk(
+        messages: Iterable[Tuple[Union[str, List[str]], Optional[Dict[Any, Any]]]],
+        subject: Optional[str] = None,
+        template: Optional[str] = None,
+        sender: Optional[str] = None,
+        chunk_size: int = 500,
+    ) -> Iterator[Tuple["NotificationEmail", bool]]:
+        """
+        Send one template to many recipients - meant for large sends (digests,
+        newsletters, etc.) where calling 'send_email' per email is too slow.
+
+        The template is resolved once, NotificationEmail objects are created with
+        'bulk_create' and every chunk is sent over a single backend connection.
+        'messages' is consumed lazily so it can be a generator - only about two
+        chunks are held in memory at a time (plus up to 'EMAIL_RENDER_WINDOW' being
+        rendered when 'EMAIL_RENDER_PROCESSES' is set).
+        WILL NOT send in test mode - set via 'IN_TEST' in settings.py file.
+        When 'EMAIL_DELIVERY_MODE' is 'outbox' emails are only queued - 'sent' is
+        always False, the outbox worker records delivery.
+
+        :param messages: iterable of (recipients, context) - one email each
+        :param int chunk_size: emails created/sent per batch
+
+        :returns: iterator of (NotificationEmail, sent successfully) in the order of 'messages'
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        subject, sender, template = NotificationEmailManager._get_defaults(
+            subject, sender, template
+        )
+        email_template = NotificationEmailManager._get_email_template(template)
+        return NotificationEmailManager._send_email_bulk(
+            messages, subject, email_template, sender, chunk_size
+        )
+
+    @staticmethod
+    def _send_email_bulk(
+        messages: Iterable[Tuple[Union[str, List[str]], Optional[Dict[Any, Any]]]],
+        subject: str,
+        email_template: "NotificationEmailTemplate",
+        sender: str,
+        chunk_size: int,
+    ) -> Iterator[Tuple["NotificationEmail", bool]]:
+        # keep one chunk sending while the next one is being built
+        pending: Optional[Tuple[List[NotificationEmail], Any, AttemptCounter]] = None
+        outbox = get_delivery_mode() == DELIVERY_MODE_OUTBOX
+        # rendered in worker processes with 'EMAIL_RENDER_PROCESSES'
+        chunks = render_email_chunks(
+            email_template.path,
+            NotificationEmailManager._chunk_email_bulk(messages, chunk_size),
+        )
+        for chunk, rendered in chunks:
+            notification_emails, email_messages = (
+                NotificationEmailManager._build_email_bulk(
+                    chunk, rendered, subject, email_template, sender
+                )
+            )
+            if outbox:
+                # queued - not sent yet, the outbox worker records delivery
+                NotificationEmailManager._enqueue_outbox_bulk(
+                    notification_emails, email_messages
+                )
+                yield from ((email, False) for email in notification_emails)
+                continue
+            attempts = AttemptCounter(send_messages_batch_errors)
+            spill = False
             if hasattr(settings, "IN_TEST") and settings.IN_TEST:
-                pass  # don't send mail in tests
+                result: Any = None  # don't send mail in tests
             else:
-                # Use the new email sender with retry logic and thread pooling
-                send_email_async(message.send)
-                notification_email.sent_successfully = True
-        except (
-            SMTPException,
-            SMTPAuthenticationError,
-        ) as e:
-            LOGGER.error(f"Error creating and sending email: {type(e)} - {e}")
-            notification_email.sent_successfully = False
-
-        # save regardless of status
-        notification_email.datetime_sent = timezone.now()
-        notification_email.save()
-        return notification_email  # type: ignore[no-any-return]
+                try:
+                    result = send_email_async(attempts, email_messages)
+                except EmailQueueFullError as e:
+                    result = e
+                    spill = EmailSender().queue_full_policy == QUEUE_FULL_OUTBOX
+                except Exception as e:
+                    result = e
+            if pending is not None:
+                yield from NotificationEmailManager._finish_email_bulk(*pending)
+                pending = None
+            if spill:
+                # backpressure - spill to the outbox instead of growing the queue
+                LOGGER.warning("Email queue is full, queueing emails in the outbox")
+                NotificationEmailManager._enqueue_outbox_bulk(
+                    notification_emails, email_messages
+                )
+                yield from ((email, False) for email in notification_emails)
+                continue
+            pending = (notification_emails, result, attempts)
+        if pending is not None:
+            yield from NotificationEmailManager._finish_email_bulk(*pending)
+
+    @staticmethod
+    def _enqueue_outbox(
+        message: EmailMultiAlternatives, notification_email: "NotificationEmail"
+    ) -> None:
+        try:
+            EmailOutbox.objects.enqueue(message, notification_email)
+        except ValueError as e:
+            # i.e., an attachment that can't be serialized - nothing will send it
+            LOGGER.error(f"Error queueing email: {type(e)} - {e}")
+            status = DeliveryStatus(
+                notification_email.pk,
+                STATUS_FAILED,
+                notification_email.attempts,
+                f"Error queueing email: {type(e).__name__}: {e}",
+            )
+            write_delivery_statuses([status])
+            notification_email.apply_delivery_status(status)
+
+    @staticmethod
+    def _enqueue_outbox_bulk(
+        notification_emails: List["NotificationEmail"],
+        email_messages: List[EmailMultiAlternatives],
+    ) -> None:
+        EmailOutbox.objects.bulk_create(
+            [
+                EmailOutbox(
+                    notification_email=notification_email,
+                    payload=serialize_message(message),
+                )
+                for notification_email, message in zip(
+                    notification_emails, email_messages
+                )
+            ]
+        )
+
+    @staticmethod
+    def _chunk_email_bulk(
+        messages: Iterable[Tuple[Union[str, List[str]], Optional[Dict[Any, Any]]]],
+        chunk_size: int,
+    ) -> Iterator[List[Tuple[Union[str, List[str]], Dict[Any, Any]]]]:
+        iterator = iter(messages)
+        while True:
+            chunk = [
+                (recipients, context if context is not None else {})
+                for recipients, context in islice(iterator, chunk_size)
+            ]
+            if not chunk:
+                return
+            for _, context in chunk:
+                NotificationEmailManager._add_team_name(context)
+            yield chunk
+
+    @staticmethod
+    def _build_email_bulk(
+        chunk: List[Tuple[Union[str, List[str]], Dict[Any, Any]]],
+        rendered: List[Tuple[str, str]],
+        subject: str,
+        email_template: "NotificationEmailTemplate",
+        sender: str,
+    ) -> Tuple[List["NotificationEmail"], List[EmailMultiAlternatives]]:
+        notification_emails: List[NotificationEmail] = []
+        email_messages: List[EmailMultiAlternatives] = []
+        for (recipients, context), (html_string, text_content) in zip(chunk, rendered):
+            notification_email = NotificationEmail(
+                template=email_template,
+                subject=subject,
+                context=context,
+                sender=sender,
+                recipients=recipients,
+            )
+            notification_email.recipients = notification_email.recipients_cleanup()
+            notification_email.set_content(html_string, text_content)
+            message = EmailMultiAlternatives(
+                subject=subject,
+                body=text_content,
+                from_email=sender,
+                to=notification_email.recipients_list,
+            )
+            message.attach_alternative(html_string, "text/html")
+            notification_emails.append(notification_email)
+            email_messages.append(message)
+        NotificationEmail.objects.bulk_create(notification_emails)
+        return notification_emails, email_messages
+
+    @staticmethod
+    def _finish_email_bulk(
+        notification_emails: List["NotificationEmail"],
+        result: Any,
+        attempts: AttemptCounter,
+    ) -> Iterator[Tuple["NotificationEmail", bool]]:
+        # wait for the chunk if it was sent asynchronously
+        if isinstance(result, Future):
+            try:
+                result = result.result()
+            except Exception as e:
+                result = e
+        if isinstance(result, Exception):
+            LOGGER.error(f"Error sending email batch: {type(result)} - {result}")
+
+        if result is None:
+            # nothing was sent (test mode) - only record when it was handled
+            datetime_sent = timezone.now()
+            NotificationEmail.objects.filter(
+                pk__in=[
+                    notification_email.pk for notification_email in notification_emails
+                ]
+            ).update(datetime_sent=datetime_sent)
+            for notification_email in notification_emails:
+                notification_email.datetime_sent = datetime_sent
+                yield notification_email, False
+            return
+
+        # record status - one UPDATE for the whole chunk
+        if isinstance(result, Exception):
+            statuses = [
+                get_delivery_status(email.pk, attempts.attempts, error=result)
+                for email in notification_emails
+            ]
+        else:
+            statuses = [
+                get_delivery_status(
+                    email.pk, attempts.attempts, result=True, error=error
+                )
+                for email, error in zip(notification_emails, result)
+            ]
+        write_delivery_statuses(statuses)
+        for notification_email, status in zip(notification_emails, statuses):
+            notification_email.apply_delivery_status(status)
+            yield notification_email, status.status == STATUS_SENT
 
 
 #
@@ -252,11 +751,25 @@ class NotificationEmailTemplate(AbstractBaseModel):
         return "Email Template: " + str(self.nickname)
 
     def html_to_str(self, context: Dict[Any, Any]) -> str:
+        return render_memoized(self.path, context, partial(self._render, context))
+
+    def html_to_str_many(self, contexts: List[Dict[Any, Any]]) -> List[str]:
+        """
+        Render for each of 'contexts' - the parts that don't differ between them
+        only once, see 'render_template_many'.
+        """
+        try:
+            return render_template_many(self.path, contexts)
+        except TemplateDoesNotExist as e:
+            LOGGER.error(f"Error rendering email template: ({type(e)}) {e}")
+            return render_template_many("django-dans-emails/default.html", contexts)
+
+    def _render(self, context: Dict[Any, Any]) -> str:
         try:
-            return render_to_string(self.path, context)
+            return render_template(self.path, context)
         except TemplateDoesNotExist as e:
             LOGGER.error(f"Error rendering email template: ({type(e)}) {e}")
-            return render_to_string("django-dans-emails/default.html", context)
+            return render_template("django-dans-emails/default.html", context)
 
 
 def get_default_template() -> NotificationEmailTemplate:
@@ -281,10 +794,95 @@ class NotificationEmail(NotificationBase):
     )
     subject = models.CharField(max_length=300, null=False, blank=False)  # type: ignore[var-annotated]
     context = models.JSONField(null=True, blank=True)
+    status = models.CharField(  # type: ignore[var-annotated]
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        help_text="Delivery status - set once the send completes.",
+    )
+    attempts = models.PositiveIntegerField(default=0)  # type: ignore[var-annotated]
+    last_error = models.TextField(blank=True, default="")  # type: ignore[var-annotated]
+    html_content = models.BinaryField(  # type: ignore[var-annotated]
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Rendered HTML content - only set when EMAIL_CONTENT_MODE is 'stored'.",
+    )
+    text_content = models.BinaryField(  # type: ignore[var-annotated]
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Plain text content - only set when EMAIL_CONTENT_MODE is 'stored'.",
+    )
 
     def __str__(self) -> str:
         return f"Notification Email: {self.sender} -> {self.recipients}"
 
+    def apply_delivery_status(self, status: DeliveryStatus) -> None:
+        """
+        Update this object with a delivery outcome already written to the database.
+        """
+        self.status = status.status
+        self.attempts = status.attempts
+        self.last_error = status.last_error
+        self.sent_successfully = status.status == STATUS_SENT
+        if status.datetime_sent is not None:
+            self.datetime_sent = status.datetime_sent
+
+    def set_content(self, html: str, text: str) -> None:
+        """
+        Keep the rendered content according to EMAIL_CONTENT_MODE.
+        When 'stored', the content is saved with this object on the next 'save'.
+        """
+        mode = get_content_mode()
+        if mode == CONTENT_MODE_STORED:
+            self.html_content = encode_content(html)
+            self.text_content = encode_content(text)
+        elif mode == CONTENT_MODE_CACHE:
+            get_content_cache().set_many(
+                {
+                    get_content_cache_key(self.pk, "html"): encode_content(html),
+                    get_content_cache_key(self.pk, "text"): encode_content(text),
+                },
+                timeout=get_content_cache_timeout(),
+            )
+
+    def _load_content(self, kind: str) -> Optional[str]:
+        mode = get_content_mode()
+        data = None
+        if mode == CONTENT_MODE_STORED:
+            data = self.html_content if kind == "html" else self.text_content
+        elif mode == CONTENT_MODE_CACHE:
+            data = get_content_cache().get(get_content_cache_key(self.pk, kind))
+        if data is None:
+            return None
+        return decode_content(data)
+
+    def get_content(self) -> str:
+        """
+        Rendered HTML content - only renders the template if the content
+        wasn't kept at send time (or EMAIL_CONTENT_MODE is 'lazy').
+        """
+        content = self._load_content("html")
+        if content is None:
+            content = self.template.html_to_str(self.context or {})
+            if get_content_mode() == CONTENT_MODE_CACHE:
+                get_content_cache().set(
+                    get_content_cache_key(self.pk, "html"),
+                    encode_content(content),
+                    timeout=get_content_cache_timeout(),
+                )
+        return str(content)
+
+    def get_text_content(self) -> str:
+        """
+        Plain text alternative of 'get_content'.
+        """
+        content = self._load_content("text")
+        if content is None:
+            content = html_to_text(self.get_content())
+        return content
+
 
 """
 # ==================================================================================== #
@@ -293,10 +891,32 @@ class NotificationEmail(NotificationBase):
 """
 
 
+#
+# NOTIFICATION PUSH MANAGER ================== #
+#
+class NotificationPushManager(NotificationBaseManager):
+    """
+    NotificationPushManager
+
+    Manager for NotificationPush - hands bulk created notifications to the
+    'push' delivery backend.
+    """
+
+    delivery_channel = CHANNEL_PUSH
+
+    def notifications_created(
+        self, notifications: List[Any], using: Optional[str] = None
+    ) -> None:
+        super(NotificationPushManager, self).notifications_created(notifications, using)
+        schedule_delivery(CHANNEL_PUSH, notifications, using)
+
+
 #
 # NOTIFICATION PUSH ================== #
 #
 class NotificationPush(NotificationBase):
+    objects = NotificationPushManager()
+
     message = models.CharField(max_length=300, null=False, blank=False)  # type: ignore[var-annotated]
 
     def __str__(self) -> str:
@@ -0,0 +1,286 @@
+import base64
+from datetime import timedelta
+from email.mime.base import MIMEBase
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.db import models, transaction
+from django.utils import timezone
+
+from django_dans_notifications.email_sender import send_messages_batch_errors
+from django_dans_notifications.logging import LOGGER
+from django_dans_notifications.status import DeliveryStatus, write_delivery_statuses
+from .base import AbstractBaseModel
+
+"""
+# ==================================================================================== #
+# EMAIL OUTBOX ======================================================================= #
+# ==================================================================================== #
+"""
+
+#
+# Database backed email queue - used instead of the in-process thread pool when
+# 'EMAIL_DELIVERY_MODE' is 'outbox'. 'send_email' only records a pending row and
+# the 'process_email_outbox' worker command sends them, so queued emails survive
+# web worker restarts and delivery can be scaled out across processes/nodes.
+#
+# Set in settings.py:
+#   - 'EMAIL_DELIVERY_MODE': 'thread' (default, in-process thread pool) or 'outbox'
+#   - 'EMAIL_OUTBOX_BATCH_SIZE': emails claimed per batch (default: 100)
+#   - 'EMAIL_OUTBOX_MAX_ATTEMPTS': attempts before an email is marked failed (default: 5)
+#   - 'EMAIL_OUTBOX_RETRY_DELAY': seconds before the first retry, doubled after every
+#     failed attempt (default: 60)
+#
+DELIVERY_MODE_THREAD = "thread"
+DELIVERY_MODE_OUTBOX = "outbox"
+DELIVERY_MODES = (DELIVERY_MODE_THREAD, DELIVERY_MODE_OUTBOX)
+
+
+def get_delivery_mode() -> str:
+    mode = getattr(settings, "EMAIL_DELIVERY_MODE", DELIVERY_MODE_THREAD)
+    if mode not in DELIVERY_MODES:
+        raise ValueError(f"EMAIL_DELIVERY_MODE must be one of {DELIVERY_MODES}")
+    return str(mode)
+
+
+def serialize_message(message: EmailMessage) -> Dict[str, Any]:
+    """
+    Serialize 'message' to JSON-safe data - binary attachments are base64 encoded.
+    """
+    attachments: List[Dict[str, Any]] = []
+    for attachment in message.attachments:
+        if isinstance(attachment, MIMEBase):
+            raise ValueError("MIMEBase attachments can't be queued in the outbox")
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            attachments.append(
+                {"filename": filename, "content": content, "mimetype": mimetype}
+            )
+        else:
+            attachments.append(
+                {
+                    "filename": filename,
+                    "content": base64.b64encode(content).decode("ascii"),
+                    "mimetype": mimetype,
+                    "base64": True,
+                }
+            )
+    return {
+        "subject": message.subject,
+        "body": message.body,
+        "from_email": message.from_email,
+        "to": list(message.to),
+        "cc": list(message.cc),
+        "bcc": list(message.bcc),
+        "reply_to": list(message.reply_to),
+        "headers": dict(message.extra_headers),
+        "alternatives": [
+            [content, mimetype]
+            for content, mimetype in getattr(message, "alternatives", [])
+        ],
+        "attachments": attachments,
+    }
+
+
+def deserialize_message(payload: Dict[str, Any]) -> EmailMultiAlternatives:
+    """
+    Rebuild the message serialized by 'serialize_message'.
+    """
+    message = EmailMultiAlternatives(
+        subject=payload["subject"],
+        body=payload["body"],
+        from_email=payload["from_email"],
+        to=payload["to"],
+        cc=payload["cc"],
+        bcc=payload["bcc"],
+        reply_to=payload["reply_to"],
+        headers=payload["headers"],
+        alternatives=[
+            (content, mimetype) for content, mimetype in payload["alternatives"]
+        ],
+    )
+    for attachment in payload["attachments"]:
+        content = attachment["content"]
+        if attachment.get("base64"):
+            content = base64.b64decode(content)
+        message.attach(attachment["filename"], content, attachment["mimetype"])
+    return message
+
+
+class OutboxBatchResult(NamedTuple):
+    """
+    Outcome of 'process_batch' - emails sent, rescheduled for a retry and failed
+    for good (out of attempts).
+    """
+
+    sent: int = 0
+    retrying: int = 0
+    failed: int = 0
+
+
+#
+# EMAIL OUTBOX MANAGER ================== #
+#
+class EmailOutboxManager(models.Manager):  # type: ignore[type-arg]
+    """
+    EmailOutboxManager
+
+    Manager for EmailOutbox.
+    """
+
+    def enqueue(
+        self, message: EmailMessage, notification_email: Optional[Any] = None
+    ) -> "EmailOutbox":
+        """
+        Queue 'message' for the outbox worker.
+
+        :param EmailMessage message: message to send
+        :param NotificationEmail notification_email: notification to update once sent
+        """
+        return self.create(  # type: ignore[no-any-return]
+            notification_email=notification_email, payload=serialize_message(message)
+        )
+
+    def process_batch(self, batch_size: Optional[int] = None) -> OutboxBatchResult:
+        """
+        Claim a batch of due emails and send them over one backend connection.
+
+        Rows are claimed with 'SELECT ... FOR UPDATE SKIP LOCKED' and stay locked
+        until their outcome is recorded, so any number of workers can run at once
+        and a worker that dies mid-batch just releases its rows.
+
+        :param int batch_size: emails claimed per batch (default: 'EMAIL_OUTBOX_BATCH_SIZE')
+
+        :returns: (sent, retrying, failed) counts - all 0 when nothing is due
+        """
+        if batch_size is None:
+            batch_size = getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 100)
+        with transaction.atomic():
+            outbox: List[EmailOutbox] = list(
+                self.select_for_update(skip_locked=True)
+                .filter(
+                    status=EmailOutbox.STATUS_PENDING,
+                    available_at__lte=timezone.now(),
+                )
+                .order_by("available_at")[:batch_size]
+            )
+            if not outbox:
+                return OutboxBatchResult()
+
+            messages: List[EmailMessage] = []
+            sendable: List[EmailOutbox] = []
+            errors: Dict[Any, Optional[str]] = {}
+            for email in outbox:
+                try:
+                    messages.append(deserialize_message(email.payload))
+                    sendable.append(email)
+                except (KeyError, TypeError, ValueError) as e:
+                    errors[email.pk] = f"Invalid payload: {type(e).__name__}: {e}"
+            try:
+                errors.update(
+                    zip(
+                        [email.pk for email in sendable],
+                        send_messages_batch_errors(messages),
+                    )
+                )
+            except Exception as e:
+                LOGGER.error(f"Error sending email outbox batch: {type(e)} - {e}")
+                errors.update(
+                    (email.pk, f"{type(e).__name__}: {e}") for email in sendable
+                )
+            return self._record_outcomes(outbox, errors)
+
+    def _record_outcomes(
+        self, outbox: List["EmailOutbox"], errors: Dict[Any, Optional[str]]
+    ) -> OutboxBatchResult:
+        now = timezone.now()
+        max_attempts = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5)
+        retry_delay = getattr(settings, "EMAIL_OUTBOX_RETRY_DELAY", 60)
+        statuses: List[DeliveryStatus] = []
+        for email in outbox:
+            email.attempts += 1
+            error = errors.get(email.pk)
+            if error is None:
+                email.status = EmailOutbox.STATUS_SENT
+                email.datetime_sent = now
+                email.last_error = ""
+            else:
+                email.last_error = error
+                if email.attempts >= max_attempts:
+                    email.status = EmailOutbox.STATUS_FAILED
+                else:
+                    # exponential backoff
+                    email.available_at = now + timedelta(
+                        seconds=retry_delay * (2 ** (email.attempts - 1))
+                    )
+            notification_email_id = email.notification_email_id  # type: ignore[attr-defined]
+            if notification_email_id is not None:
+                # pending emails stay pending (with attempts / error) until retried
+                statuses.append(
+                    DeliveryStatus(
+                        notification_email_id,
+                        email.status,
+                        email.attempts,
+                        email.last_error,
+                        email.datetime_sent,
+                    )
+                )
+        self.bulk_update(
+            outbox,
+            ["status", "attempts", "available_at", "last_error", "datetime_sent"],
+        )
+        write_delivery_statuses(statuses)
+        sent = len(
+            [email for email in outbox if email.status == EmailOutbox.STATUS_SENT]
+        )
+        failed = len(
+            [email for email in outbox if email.status == EmailOutbox.STATUS_FAILED]
+        )
+        return OutboxBatchResult(sent, len(outbox) - sent - failed, failed)
+
+
+#
+# EMAIL OUTBOX ================== #
+#
+class EmailOutbox(AbstractBaseModel):
+    """
+    A queued email - the serialized message and its delivery state.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    )
+
+    objects = EmailOutboxManager()
+
+    notification_email = models.ForeignKey(  # type: ignore[var-annotated]
+        "django_dans_notifications.NotificationEmail",
+        related_name="outbox",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+    )
+    payload = models.JSONField(help_text="Serialized email message.")
+    status = models.CharField(  # type: ignore[var-annotated]
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)  # type: ignore[var-annotated]
+    available_at = models.DateTimeField(  # type: ignore[var-annotated]
+        default=timezone.now, help_text="Don't send before this time (retry backoff)."
+    )
+    last_error = models.TextField(blank=True, default="")  # type: ignore[var-annotated]
+    datetime_sent = models.DateTimeField(null=True, blank=True)  # type: ignore[var-annotated]
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="ddn_outbox_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Email Outbox: {self.status} ({self.attempts} attempts)"
@@ -0,0 +1,129 @@
+from typing import Any, Iterable, List, Optional
+
+from django.db import models
+from django.db.models.query import QuerySet
+
+from django_dans_notifications.helpers import normalize_recipient, normalize_recipients
+
+"""
+# ==================================================================================== #
+# NOTIFICATION RECIPIENT ============================================================= #
+# ==================================================================================== #
+"""
+
+
+#
+# NOTIFICATION RECIPIENT MANAGER ================== #
+#
+class NotificationRecipientManager(models.Manager):  # type: ignore[type-arg]
+    """
+    NotificationRecipientManager
+
+    Manager for NotificationRecipient.
+
+    Keeps the recipient index in sync with the 'recipients' strings of the
+    notification models and builds the lookups used for ownership queries.
+    """
+
+    def index_notifications(
+        self, notifications: Iterable[Any], batch_size: Optional[int] = None
+    ) -> List["NotificationRecipient"]:
+        """
+        Create index rows for the passed notifications.
+        Does NOT remove existing rows - use 'reindex_notification' for that.
+
+        :param notifications: saved notification objects (any NotificationBase subclass)
+        :param int batch_size: batch size passed to bulk_create
+        """
+        rows = [
+            NotificationRecipient(
+                notification_id=notification.pk,
+                notification_type=notification._meta.model_name,
+                recipient=recipient,
+                datetime_created=notification.datetime_created,
+            )
+            for notification in notifications
+            for recipient in normalize_recipients(notification.recipients_list)
+        ]
+        if not rows:
+            return rows
+        return self.bulk_create(rows, batch_size=batch_size)
+
+    def reindex_notification(self, notification: Any) -> None:
+        """
+        Replace the index rows for a single notification.
+        """
+        self.filter(notification_id=notification.pk).delete()
+        self.index_notifications([notification])
+
+    def notification_ids(
+        self, recipients: Iterable[Any], notification_type: Optional[str] = None
+    ) -> "QuerySet[NotificationRecipient]":
+        """
+        Get a 'notification_id' values queryset for the passed recipients -
+        meant to be used as a subquery, i.e., 'Q(id__in=...)'.
+
+        :param recipients: recipients (emails, ids) to search
+        :param str notification_type: model name to restrict the search to
+        """
+        keys = [normalize_recipient(recipient) for recipient in recipients]
+        queryset = self.filter(recipient__in=keys)
+        if notification_type is not None:
+            queryset = queryset.filter(notification_type=notification_type)
+        return queryset.values("notification_id")
+
+    def notification_rows(
+        self, recipients: Iterable[Any], notification_type: str
+    ) -> "QuerySet[NotificationRecipient]":
+        """
+        Get a ('datetime_created', 'notification_id') values queryset of the
+        'notification_type' notifications for the passed recipients - each once,
+        even if it is addressed to several of them. Meant for keyset pagination on
+        those fields, served by 'ddn_recipient_cursor_idx'.
+
+        :param recipients: recipients (emails, ids) to search
+        :param str notification_type: model name to search
+        """
+        keys = [normalize_recipient(recipient) for recipient in recipients]
+        return (
+            self.filter(recipient__in=keys, notification_type=notification_type)
+            .values("datetime_created", "notification_id")
+            .distinct()
+        )
+
+
+#
+# NOTIFICATION RECIPIENT ================== #
+#
+class NotificationRecipient(models.Model):
+    """
+    Normalized recipient membership for all notification types - one row per
+    (notification, recipient). Used to answer 'which notifications belong to
+    this user' with an index seek instead of scanning 'recipients'.
+    """
+
+    objects = NotificationRecipientManager()
+
+    notification_id = models.UUIDField()  # type: ignore[var-annotated]
+    notification_type = models.CharField(max_length=100)  # type: ignore[var-annotated]
+    recipient = models.CharField(max_length=300)  # type: ignore[var-annotated]
+    # copy of the notification's 'datetime_created' - lets a user's notifications
+    # be paged straight off the index
+    datetime_created = models.DateTimeField(null=True)  # type: ignore[var-annotated]
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=[
+                    "recipient",
+                    "notification_type",
+                    "datetime_created",
+                    "notification_id",
+                ],
+                name="ddn_recipient_cursor_idx",
+            ),
+            models.Index(fields=["notification_id"], name="ddn_recipient_notif_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Notification Recipient: {self.recipient} ({self.notification_type})"
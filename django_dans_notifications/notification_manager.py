@@ -1,8 +1,14 @@
-from typing import Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from django.db import transaction
 from django.db.models import Q
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
+from .helpers import normalize_recipient, normalize_recipients
 from .models.base import NotificationBase
+from .models.counters import COUNTER_BATCH_SIZE, NotificationUnreadCount
+from .models.recipients import NotificationRecipient
 
 from .models.notifications import NotificationEmail, NotificationBasic, NotificationPush
 
@@ -24,8 +30,19 @@ NOTIFICATION MANAGER ===========================================================
 #
 class NotificationManager:
     @staticmethod
-    def query_ownership(user_email: str) -> Q:
-        return Q(sender__contains=user_email) | Q(recipients__contains=user_email)
+    def query_ownership(user_email: str, notification_type: Optional[str] = None) -> Q:
+        """
+        Q object matching notifications sent by or to this user
+        :param str user_email: user email to search
+        :param str notification_type: model name to restrict the recipient lookup to
+
+        :returns: Q object - whole (normalized) matches only, recipients are matched via the recipient index
+        """
+        return Q(sender_key=normalize_recipient(user_email)) | Q(
+            id__in=NotificationRecipient.objects.notification_ids(
+                [user_email], notification_type=notification_type
+            )
+        )
 
     #
     # RETRIEVE
@@ -37,7 +54,9 @@ class NotificationManager:
 
         :returns: NotificationEmail queryset
         """
-        return NotificationEmail.objects.filter(self.query_ownership(user_email))
+        return NotificationEmail.objects.filter(
+            self.query_ownership(user_email, NotificationEmail._meta.model_name)
+        )
 
     def get_notifications_basic(self, user_email: str) -> QuerySet[NotificationBasic]:
         """
@@ -46,7 +65,9 @@ class NotificationManager:
 
         :returns: NotificationBasic queryset
         """
-        return NotificationBasic.objects.filter(self.query_ownership(user_email))
+        return NotificationBasic.objects.filter(
+            self.query_ownership(user_email, NotificationBasic._meta.model_name)
+        )
 
     def get_notifications_push(self, user_email: str) -> QuerySet[NotificationPush]:
         """
@@ -55,7 +76,9 @@ class NotificationManager:
 
         :returns: NotificationPush queryset
         """
-        return NotificationPush.objects.filter(self.query_ownership(user_email))
+        return NotificationPush.objects.filter(
+            self.query_ownership(user_email, NotificationPush._meta.model_name)
+        )
 
     def get_notifications_all(
         self, user_email: str
@@ -72,6 +95,20 @@ class NotificationManager:
         push = self.get_notifications_push(user_email=user_email)
         return {"emails": emails, "basic": basic, "push": push}
 
+    @staticmethod
+    def get_recipient_keys(user: Any) -> List[str]:
+        """
+        Recipient keys identifying 'user' - the same keys 'recipients_contains' checks
+        :param user: user object (email and id) or a single recipient str
+
+        :returns: list of normalized recipient keys
+        """
+        if isinstance(user, str):
+            return normalize_recipients([user])
+        return normalize_recipients(
+            getattr(user, attr) for attr in ("email", "id") if hasattr(user, attr)
+        )
+
     #
     # UPDATE
     #
@@ -86,3 +123,50 @@ class NotificationManager:
         """
         notification_basic.read = read
         notification_basic.save()  # type: ignore[no-untyped-call]
+
+    def mark_notifications_basic_read(
+        self,
+        user: Any,
+        ids: Optional[Iterable[Any]] = None,
+        before: Optional[datetime] = None,
+        read: bool = True,
+    ) -> int:
+        """
+        Mark many NotificationBasic as read with batched UPDATEs - no instances are loaded,
+        unread counters are adjusted in the same transaction
+        :param user: user object or recipient str, only their notifications are updated
+        :param ids: only update these notifications
+        :param datetime before: only update notifications created at or before this
+        :param bool read: mark read or not
+
+        :returns: number of notifications updated
+        """
+        keys = self.get_recipient_keys(user)
+        if not keys:
+            return 0
+        notifications = NotificationBasic.objects.filter(
+            NotificationBasic.query_recipients(*keys)
+        ).exclude(read=read)
+        if ids is not None:
+            notifications = notifications.filter(id__in=list(ids))
+        if before is not None:
+            notifications = notifications.filter(datetime_created__lte=before)
+
+        with transaction.atomic():
+            # lock the rows being changed so unread counters move exactly once
+            notification_ids = list(
+                notifications.select_for_update().values_list("id", flat=True)
+            )
+            if not notification_ids:
+                return 0
+            updated = 0
+            datetime_modified = timezone.now()
+            for start in range(0, len(notification_ids), COUNTER_BATCH_SIZE):
+                # 'update' skips 'auto_now', set it explicitly
+                updated += NotificationBasic.objects.filter(
+                    id__in=notification_ids[start : start + COUNTER_BATCH_SIZE]
+                ).update(read=read, datetime_modified=datetime_modified)
+            NotificationUnreadCount.objects.adjust_notification_ids(
+                notification_ids, -1 if read else 1
+            )
+        return updated
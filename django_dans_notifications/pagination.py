@@ -0,0 +1,103 @@
+from typing import Any, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models.query import QuerySet
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.request import Request
+
+from .models.recipients import NotificationRecipient
+
+"""
+# ==================================================================================== #
+# PAGINATION ========================================================================= #
+# ==================================================================================== #
+"""
+
+PAGINATION_PAGE = "page"
+PAGINATION_CURSOR = "cursor"
+
+
+def get_pagination_mode() -> str:
+    """
+    Pagination mode for the notification list APIs - set via
+    'NOTIFICATIONS_PAGINATION' in settings.py ('page' or 'cursor').
+    """
+    mode = getattr(settings, "NOTIFICATIONS_PAGINATION", PAGINATION_PAGE)
+    if mode not in (PAGINATION_PAGE, PAGINATION_CURSOR):
+        raise ValueError(
+            f"NOTIFICATIONS_PAGINATION must be '{PAGINATION_PAGE}' or '{PAGINATION_CURSOR}'"
+        )
+    return str(mode)
+
+
+#
+# NOTIFICATION CURSOR PAGINATION ================== #
+#
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination on ('datetime_created', 'id') - no COUNT(*) and no
+    OFFSET, so deep pages cost the same as the first one.
+
+    Recipient index rows are paged on ('datetime_created', 'notification_id').
+    """
+
+    ordering = ("datetime_created", "id")
+
+    def get_ordering(
+        self, request: Request, queryset: QuerySet[Any], view: Any
+    ) -> Tuple[str, ...]:
+        if queryset.model is NotificationRecipient:
+            return ("datetime_created", "notification_id")
+        return super(NotificationCursorPagination, self).get_ordering(
+            request, queryset, view
+        )
+
+
+#
+# NOTIFICATION PAGINATION MIXIN ================== #
+#
+class NotificationPaginationMixin:
+    """
+    Use NotificationCursorPagination when 'NOTIFICATIONS_PAGINATION' is set
+    to 'cursor', otherwise fall back to the view's 'pagination_class'.
+    """
+
+    @property
+    def paginator(self) -> Optional[BasePagination]:
+        if not hasattr(self, "_paginator"):
+            if get_pagination_mode() == PAGINATION_CURSOR:
+                self._paginator: Optional[BasePagination] = (
+                    NotificationCursorPagination()
+                )
+            else:
+                pagination_class: Any = getattr(self, "pagination_class", None)
+                self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+    def paginate_recipients(
+        self, queryset: QuerySet[Any], *recipients: Any
+    ) -> Optional[List[Any]]:
+        """
+        Paginate 'queryset' - the notifications addressed to 'recipients'.
+
+        In cursor mode the page is read off the recipient index - keyset on the
+        recipients' own rows, not the whole notification table - and then only
+        that page of notifications is loaded.
+        """
+        if get_pagination_mode() != PAGINATION_CURSOR:
+            page: Optional[List[Any]] = self.paginate_queryset(  # type: ignore[attr-defined]
+                queryset
+            )
+            return page
+        rows = NotificationRecipient.objects.notification_rows(
+            recipients, queryset.model._meta.model_name
+        )
+        page = self.paginate_queryset(rows)  # type: ignore[attr-defined]
+        if page is None:
+            return None
+        notifications = queryset.in_bulk([row["notification_id"] for row in page])
+        return [
+            notifications[row["notification_id"]]
+            for row in page
+            if row["notification_id"] in notifications
+        ]
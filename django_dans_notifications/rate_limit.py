@@ -0,0 +1,277 @@
+import math
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+from .caches import LRUCache
+from .logging import LOGGER
+
+"""
+# ==================================================================================== #
+# RATE LIMITING ====================================================================== #
+# ==================================================================================== #
+"""
+
+#
+# Paces email sends to stay under the relay's limits - a send waits for its turn
+# instead of failing and burning retries. Limits are token buckets, globally and per
+# recipient domain; with a shared cache the limits hold across processes.
+#
+# Set in settings.py:
+#   - 'EMAIL_RATE_LIMIT': max emails per second overall (default: None, unlimited)
+#   - 'EMAIL_RATE_LIMIT_PER_DOMAIN': max emails per second per recipient domain, i.e.,
+#     {"gmail.com": 20, "*": 5} - "*" applies to every other domain (default: {})
+#   - 'EMAIL_RATE_LIMIT_BURST': seconds of rate that can be sent at once (default: 1)
+#   - 'EMAIL_RATE_LIMIT_CACHE': Django cache alias to share the limits between
+#     processes (default: None, per process)
+#
+# On the EmailSender workers a send doesn't sleep for its turn - messages whose turn
+# has come go out, the rest keep their reservation and are re-queued on the retry
+# timer until the first of them is due ('RateLimitDeferred').
+#
+_RATE_LIMIT_CACHE_PREFIX = "django_dans_notifications:rate_limit"
+GLOBAL_SCOPE = "*global*"
+DEFAULT_DOMAIN = "*"
+# max domain buckets kept per process
+_MAX_DOMAINS = 10000
+# max shared windows looked at per send - the frontier (below) usually saves the walk
+_MAX_WINDOWS_AHEAD = 60
+
+
+class RateLimitDeferred(Exception):
+    """
+    Raised by a send that reserved its turn but has to wait 'delay' seconds for it -
+    'resume' (if set) sends what's left, in place of the whole send.
+    """
+
+    def __init__(
+        self, delay: float, resume: Optional[Callable[[], Any]] = None
+    ) -> None:
+        super().__init__(f"Email send paced for {delay:.3f}s")
+        self.delay = delay
+        self.resume = resume
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket - 'rate' tokens per second, holding up to 'burst'.
+
+    'reserve' always succeeds and returns how long to wait for the reserved
+    token, so callers queue up in order instead of polling.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take 'tokens' - going into debt if needed.
+
+        :returns: seconds to wait before using them
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class SharedWindowLimiter:
+    """
+    Rate limit shared between processes through a Django cache - counts sends per
+    fixed window ('rate' per second, or 1 per '1 / rate' seconds when slower) and
+    reserves a slot in the first window that isn't full. The first window that may
+    have room (the frontier) is shared too, so a backlog isn't walked every send.
+    """
+
+    def __init__(self, cache: BaseCache, scope: str, rate: float) -> None:
+        self.cache = cache
+        self.scope = scope
+        self.window = max(1.0, 1.0 / rate)
+        self.limit = max(1, int(rate * self.window))
+
+    def reserve(self) -> float:
+        now = time.time()
+        current = math.floor(now / self.window)
+        frontier_key = f"{_RATE_LIMIT_CACHE_PREFIX}:{self.scope}:frontier"
+        window = max(current, self.cache.get(frontier_key) or current)
+        for ahead in range(_MAX_WINDOWS_AHEAD):
+            # expires once the window is over
+            timeout = int((window - current + 2) * self.window) + 1
+            key = f"{_RATE_LIMIT_CACHE_PREFIX}:{self.scope}:{window}"
+            self.cache.add(key, 0, timeout=timeout)
+            try:
+                count = self.cache.incr(key)
+            except ValueError:  # expired between add and incr
+                self.cache.add(key, 1, timeout=timeout)
+                count = 1
+            if count >= self.limit:
+                self.cache.set(frontier_key, window + 1, timeout=timeout + 1)
+            if count <= self.limit or ahead + 1 == _MAX_WINDOWS_AHEAD:
+                break
+            window += 1
+        # a backlog past the walk still waits - in the last window looked at
+        return max(0.0, window * self.window - now)
+
+
+class RateLimiter:
+    """
+    Global and per recipient domain limits - see 'get_rate_limiter'.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        domain_rates: Optional[Dict[str, float]] = None,
+        burst: float = 1.0,
+        cache: Optional[BaseCache] = None,
+    ) -> None:
+        self.rate = rate
+        self.domain_rates = {
+            domain.lower(): domain_rate
+            for domain, domain_rate in (domain_rates or {}).items()
+        }
+        self.burst = burst
+        self.cache = cache
+        for limit in [rate, *self.domain_rates.values()]:
+            if limit is not None and limit <= 0:
+                raise ValueError("Email rate limits must be > 0")
+        self._limiters = LRUCache(_MAX_DOMAINS)
+        self._lock = threading.Lock()
+        # message -> when its reserved turn comes (time.monotonic)
+        self._reserved: "weakref.WeakKeyDictionary[Any, float]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.waited = 0.0  # total seconds sends were paced
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate is not None or bool(self.domain_rates)
+
+    def reserve(self, recipients: Iterable[str]) -> float:
+        """
+        Reserve a send to 'recipients' under every limit that applies.
+
+        :returns: seconds to wait before sending
+        """
+        if not self.enabled:
+            return 0.0
+        wait = 0.0
+        scopes: List[str] = []
+        if self.rate is not None:
+            scopes.append(GLOBAL_SCOPE)
+        for domain in sorted({get_domain(recipient) for recipient in recipients}):
+            if domain in self.domain_rates or DEFAULT_DOMAIN in self.domain_rates:
+                scopes.append(domain)
+        for scope in scopes:
+            wait = max(wait, self._reserve(scope))
+        if wait:
+            with self._lock:
+                self.waited += wait
+        return wait
+
+    def wait(self, recipients: Iterable[str]) -> None:
+        """
+        Block until a send to 'recipients' is allowed.
+        """
+        wait = self.reserve(recipients)
+        if wait:
+            time.sleep(wait)
+
+    def reserve_message(self, message: Any) -> float:
+        """
+        Reserve a send of 'message' once - asking again (i.e., when the send is
+        re-queued) waits out the same reservation until 'release_message'.
+
+        :returns: seconds left to wait before sending
+        """
+        with self._lock:
+            due = self._reserved.get(message)
+        if due is None:
+            due = time.monotonic() + self.reserve(message.recipients())
+            with self._lock:
+                self._reserved[message] = due
+        return max(0.0, due - time.monotonic())
+
+    def release_message(self, message: Any) -> None:
+        """
+        The reserved turn of 'message' was used - a later send reserves a new one.
+        """
+        with self._lock:
+            self._reserved.pop(message, None)
+
+    def _reserve(self, scope: str) -> float:
+        limiter = self._limiters.get(scope)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(scope)
+                if limiter is None:
+                    limiter = self._create(scope)
+                    self._limiters.set(scope, limiter)
+        if isinstance(limiter, SharedWindowLimiter):
+            try:
+                return limiter.reserve()
+            except Exception as e:
+                # cache is down - don't stop sending over it
+                LOGGER.warning(f"Error checking shared email rate limit: {e}")
+                return 0.0
+        return float(limiter.reserve())
+
+    def _create(self, scope: str) -> Any:
+        if scope == GLOBAL_SCOPE:
+            rate = float(self.rate)  # type: ignore[arg-type]
+        elif scope in self.domain_rates:
+            rate = float(self.domain_rates[scope])
+        else:
+            rate = float(self.domain_rates[DEFAULT_DOMAIN])
+        if self.cache is not None:
+            return SharedWindowLimiter(self.cache, scope, rate)
+        return TokenBucket(rate, rate * self.burst)
+
+
+def get_domain(recipient: str) -> str:
+    return recipient.rsplit("@", 1)[-1].strip().strip(">").lower()
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    The process wide RateLimiter, created from the settings.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                alias = getattr(settings, "EMAIL_RATE_LIMIT_CACHE", None)
+                _rate_limiter = RateLimiter(
+                    rate=getattr(settings, "EMAIL_RATE_LIMIT", None),
+                    domain_rates=getattr(settings, "EMAIL_RATE_LIMIT_PER_DOMAIN", {}),
+                    burst=getattr(settings, "EMAIL_RATE_LIMIT_BURST", 1.0),
+                    cache=caches[alias] if alias is not None else None,
+                )
+    return _rate_limiter
+
+
+def reset_rate_limiter() -> None:
+    """
+    Forget the RateLimiter - it's created again from the settings on next use.
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        _rate_limiter = None
@@ -0,0 +1,806 @@
+import atexit
+import bisect
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from html import unescape
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import django
+from django.conf import settings
+from django.template import Context, Engine, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.base import Lexer, Template, TokenType, render_value_in_context
+from django.template.loader import render_to_string
+from django.template.loader_tags import construct_relative_path
+
+from .caches import LRUCache
+from .logging import LOGGER
+
+"""
+# ==================================================================================== #
+# EMAIL RENDERING ==================================================================== #
+# ==================================================================================== #
+"""
+
+#
+# COMPILED TEMPLATE CACHE ================== #
+#
+# Email templates are compiled once per process and kept by path, so rendering a known
+# template skips loader resolution - including '{% extends %}' / '{% include %}', which
+# go through a cached loader wrapping the project's loaders. With DEBUG on, template
+# files are checked for changes (mtime) before each render.
+#
+# Set in settings.py:
+#   - 'EMAIL_COMPILED_TEMPLATE_CACHE_SIZE': max compiled templates kept per process,
+#     0 disables and renders with 'render_to_string' (default: 128)
+#
+# Only the first 'DjangoTemplates' backend in TEMPLATES is used - without one, emails
+# are rendered with 'render_to_string'.
+#
+CACHED_LOADER = "django.template.loaders.cached.Loader"
+
+_compiled_templates = LRUCache(
+    getattr(settings, "EMAIL_COMPILED_TEMPLATE_CACHE_SIZE", 128)
+)
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+# template file -> mtime when it was compiled, checked with DEBUG on
+_mtimes: Dict[str, float] = {}
+
+
+def _build_engine() -> Optional[Engine]:
+    """
+    A copy of the project's Django template engine with its loaders wrapped in the
+    cached loader.
+    """
+    backend = next(
+        (engine for engine in engines.all() if isinstance(engine, DjangoTemplates)),
+        None,
+    )
+    if backend is None:
+        return None
+    engine = backend.engine
+    loaders = engine.loaders
+    already_cached = (
+        len(loaders) == 1
+        and isinstance(loaders[0], (list, tuple))
+        and loaders[0][0] == CACHED_LOADER
+    )
+    return Engine(
+        dirs=engine.dirs,
+        app_dirs=False,  # already in 'loaders'
+        loaders=loaders if already_cached else [(CACHED_LOADER, loaders)],
+        string_if_invalid=engine.string_if_invalid,
+        file_charset=engine.file_charset,
+        libraries=engine.libraries,
+        builtins=[
+            builtin
+            for builtin in engine.builtins
+            if builtin not in Engine.default_builtins
+        ],
+        autoescape=engine.autoescape,
+        debug=engine.debug,
+    )
+
+
+def get_engine() -> Optional[Engine]:
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _build_engine()
+    return _engine
+
+
+def _templates_changed(engine: Engine) -> bool:
+    """
+    Whether any template file compiled so far changed on disk since.
+    """
+    for loader in engine.template_loaders:
+        for template in list(getattr(loader, "get_template_cache", {}).values()):
+            name = getattr(getattr(template, "origin", None), "name", None)
+            if not isinstance(name, str):
+                continue  # a cached miss, or not from a file
+            try:
+                mtime = os.stat(name).st_mtime
+            except OSError:
+                return True
+            if _mtimes.setdefault(name, mtime) != mtime:
+                return True
+    return False
+
+
+def get_compiled_template(path: str, engine: Optional[Engine] = None) -> Template:
+    """
+    The compiled template at 'path' - raises 'TemplateDoesNotExist' like
+    'get_template'.
+    """
+    engine = engine or get_engine()
+    if engine is None:
+        raise RuntimeError("No DjangoTemplates backend configured")
+    if settings.DEBUG and _templates_changed(engine):
+        reset_compiled_templates(engine=False)
+    template: Optional[Template] = _compiled_templates.get(path)
+    if template is None:
+        template = engine.get_template(path)
+        _compiled_templates.set(path, template)
+        if settings.DEBUG:
+            _templates_changed(engine)  # note the mtimes of the new files
+    return template
+
+
+def render_template(path: str, context: Dict[Any, Any]) -> str:
+    """
+    Render the email template at 'path' - from the compiled template cache when
+    enabled, otherwise with 'render_to_string'.
+    """
+    engine = get_engine()
+    if engine is None or not _compiled_templates.max_size:
+        return render_to_string(path, context)
+    template = get_compiled_template(path, engine)
+    return template.render(Context(context, autoescape=engine.autoescape))
+
+
+def reset_compiled_templates(engine: bool = True) -> None:
+    """
+    Drop compiled templates - and the engine unless 'engine' is False, i.e., after
+    TEMPLATES changed.
+    """
+    global _engine
+    _compiled_templates.max_size = getattr(
+        settings, "EMAIL_COMPILED_TEMPLATE_CACHE_SIZE", 128
+    )
+    _compiled_templates.clear()
+    _rendered.clear()  # may be from the old templates
+    _slot_templates.clear()
+    _mtimes.clear()
+    with _engine_lock:
+        if engine:
+            _engine = None
+        elif _engine is not None:
+            for loader in _engine.template_loaders:
+                if hasattr(loader, "reset"):
+                    loader.reset()
+
+
+#
+# RENDERED OUTPUT MEMO ================== #
+#
+# Renders of the same template with the same context (i.e., password reset shells,
+# identical broadcasts) are kept and reused - keyed by template path and a hash of the
+# context as canonical JSON. Contexts that aren't JSON serializable aren't memoized.
+# Templates with time dependent output ('{% now %}') stay as fresh as the timeout.
+#
+# Set in settings.py:
+#   - 'EMAIL_RENDER_MEMO_SIZE': max renders kept per process, 0 disables (default: 0)
+#   - 'EMAIL_RENDER_MEMO_TIMEOUT': seconds a render is reused for (default: 300)
+#
+_rendered = LRUCache(
+    getattr(settings, "EMAIL_RENDER_MEMO_SIZE", 0),
+    getattr(settings, "EMAIL_RENDER_MEMO_TIMEOUT", 300),
+)
+
+
+def get_render_memo_key(path: str, context: Dict[Any, Any]) -> Optional[str]:
+    try:
+        data = json.dumps(context, sort_keys=True, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return None
+    return f"{path}:{hashlib.sha256(data.encode('utf-8')).hexdigest()}"
+
+
+def render_memoized(
+    path: str, context: Dict[Any, Any], render: Callable[[], str]
+) -> str:
+    """
+    The memoized render of 'path' with 'context' - calls 'render' on a miss.
+    """
+    if not _rendered.max_size:
+        return render()
+    key = get_render_memo_key(path, context)
+    if key is None:
+        return render()
+    html: Optional[str] = _rendered.get(key)
+    if html is None:
+        html = render()
+        _rendered.set(key, html)
+    return html
+
+
+def get_render_memo_stats() -> Dict[str, Any]:
+    """
+    Hits, misses and size of the render memo - for tuning 'EMAIL_RENDER_MEMO_*'.
+    """
+    return _rendered.stats()
+
+
+def reset_render_memo() -> None:
+    """
+    Drop memoized renders and their stats, picking up changed settings.
+    """
+    _rendered.max_size = getattr(settings, "EMAIL_RENDER_MEMO_SIZE", 0)
+    _rendered.timeout = getattr(settings, "EMAIL_RENDER_MEMO_TIMEOUT", 300)
+    _rendered.clear()
+    _rendered.hits = _rendered.misses = 0
+
+
+#
+# BROADCAST RENDERING ================== #
+#
+# Mass emails (i.e., 'send_email_bulk') mostly render one layout with a few variables
+# changing per recipient. Those are rendered in two phases - the template is rendered
+# once per batch with placeholder slots for the variables that differ, then each
+# recipient's values are substituted into the slots (escaped like '{{ var }}').
+#
+# Only done when the output is the same as a full render - every variable that differs
+# is only ever output as a plain '{{ var }}' (no filters, '{% if %}', loops, ...), and
+# the templates (with their '{% extends %}' / '{% include %}') only use the tags in
+# '_SLOT_SAFE_TAGS'. Otherwise every recipient's email is rendered in full.
+#
+# Set in settings.py:
+#   - 'EMAIL_BROADCAST_RENDERING': render batches in two phases (default: True)
+#
+_SLOT_SAFE_TAGS = frozenset(
+    [
+        "block",
+        "endblock",
+        "extends",
+        "include",
+        "if",
+        "elif",
+        "else",
+        "endif",
+        "for",
+        "empty",
+        "endfor",
+        "with",
+        "endwith",
+        "now",
+        "load",
+        "comment",
+        "endcomment",
+        "url",
+        "static",
+        "firstof",
+        "verbatim",
+        "endverbatim",
+        "templatetag",
+        "lorem",
+    ]
+)
+# simple JSON values render the same substituted as through '{{ var }}'
+_SLOT_VALUE_TYPES = (str, int, float, bool, type(None))
+_PLAIN_VARIABLE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_slot_templates = LRUCache(128)
+
+
+class _SlotTemplate:
+    """
+    What a template (with its parents and includes) does with its variables - the
+    names output as a plain '{{ var }}' and the text of every other tag using any.
+    """
+
+    def __init__(self, safe: bool, plain: Set[str], other: str) -> None:
+        self.safe = safe
+        self.plain = plain
+        self.other = other
+
+    def slot_safe(self, name: str) -> bool:
+        return (
+            self.safe
+            and name in self.plain
+            and re.search(rf"\b{re.escape(name)}\b", self.other) is None
+        )
+
+    def used(self, name: str) -> bool:
+        return (
+            not self.safe
+            or name in self.plain
+            or re.search(rf"\b{re.escape(name)}\b", self.other) is not None
+        )
+
+
+def _analyze_template(engine: Engine, path: str) -> _SlotTemplate:
+    plain: Set[str] = set()
+    other: List[str] = []
+    pending, seen = [path], set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        for token in Lexer(engine.get_template(name).source).tokenize():
+            if token.token_type == TokenType.VAR:
+                if _PLAIN_VARIABLE.fullmatch(token.contents):
+                    plain.add(token.contents)
+                else:
+                    other.append(token.contents)
+            elif token.token_type == TokenType.BLOCK:
+                bits = token.split_contents()
+                if bits[0] not in _SLOT_SAFE_TAGS:
+                    return _SlotTemplate(False, set(), "")
+                if bits[0] in ("extends", "include"):
+                    if len(bits) < 2 or bits[1][:1] not in ("'", '"'):
+                        return _SlotTemplate(False, set(), "")  # not a constant
+                    # "./base.html" is relative to this template, like Django does
+                    pending.append(construct_relative_path(name, bits[1])[1:-1])
+                other.append(token.contents)
+    return _SlotTemplate(True, plain, "\n".join(other))
+
+
+def _get_slot_template(engine: Engine, path: str) -> _SlotTemplate:
+    slot_template: Optional[_SlotTemplate] = _slot_templates.get(path)
+    if slot_template is None:
+        try:
+            slot_template = _analyze_template(engine, path)
+        except Exception as e:
+            # can't tell what it does with its variables - render each in full
+            LOGGER.warning(f"Error analyzing email template {path}: {e}")
+            slot_template = _SlotTemplate(False, set(), "")
+        _slot_templates.set(path, slot_template)
+    return slot_template
+
+
+def render_template_many(path: str, contexts: Sequence[Dict[Any, Any]]) -> List[str]:
+    """
+    Render the email template at 'path' once per context in 'contexts' - in two
+    phases when possible (see above), otherwise in full for each.
+    """
+    engine = get_engine()
+    if (
+        len(contexts) < 2
+        or engine is None
+        or not _compiled_templates.max_size
+        or not getattr(settings, "EMAIL_BROADCAST_RENDERING", True)
+    ):
+        return [render_template(path, context) for context in contexts]
+
+    template = get_compiled_template(path, engine)
+    slot_template = _get_slot_template(engine, path)
+    first = contexts[0]
+    keys = set().union(*(context.keys() for context in contexts))
+    # variables the template uses that differ between recipients
+    varying = [
+        key
+        for key in keys
+        if slot_template.used(key)
+        and any(
+            key not in context or context[key] != first.get(key) for context in contexts
+        )
+    ]
+    if not all(slot_template.slot_safe(key) for key in varying):
+        return [render_template(path, context) for context in contexts]
+
+    # phase 1 - render once, with a slot for each variable that differs
+    marker = uuid.uuid4().hex
+    slots = {f"\x00{marker}:{index}\x00": key for index, key in enumerate(varying)}
+    shared = {**first, **{key: slot for slot, key in slots.items()}}
+    html = template.render(Context(shared, autoescape=engine.autoescape))
+    if not slots:
+        return [html] * len(contexts)  # identical for everyone
+    parts = re.split(f"({'|'.join(map(re.escape, slots))})", html)
+
+    # phase 2 - fill in each recipient's values
+    value_context = Context(autoescape=engine.autoescape)
+    rendered = []
+    for context in contexts:
+        if not all(
+            key in context and isinstance(context[key], _SLOT_VALUE_TYPES)
+            for key in varying
+        ):
+            rendered.append(render_template(path, context))
+            continue
+        rendered.append(
+            "".join(
+                (
+                    render_value_in_context(context[slots[part]], value_context)
+                    if part in slots
+                    else part
+                )
+                for part in parts
+            )
+        )
+    return rendered
+
+
+#
+# HTML TO TEXT ================== #
+#
+# The plain text alternative of an email, converted from its HTML in one linear pass
+# (not repeated until nothing changes like 'strip_tags'). Unlike 'strip_tags' the
+# content of '<head>', '<style>' and '<script>' is dropped, block elements and '<br>'
+# become line breaks and links keep their URL, i.e.,
+# '<a href="https://example.com">Reset</a>' becomes 'Reset (https://example.com)'.
+#
+_BLOCK_TAGS = frozenset(
+    [
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "div",
+        "dl",
+        "dt",
+        "dd",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "tr",
+        "ul",
+    ]
+)
+_PARAGRAPH_TAGS = frozenset(["p", "h1", "h2", "h3", "h4", "h5", "h6", "table"])
+# markup found in one pass - tags are matched by '_TAG' up to the next '<' (so a
+# failed match can't scan far), tags with a '<' in their attributes and comments are
+# found by searches that remember where they failed, and skipped elements are
+# matched whole, with their content
+_TAG = re.compile(
+    r"<(?P<end>/?)(?P<tag>[a-zA-Z][a-zA-Z0-9]*)"
+    r"(?P<attrs>(?:[^<>\"']|\"[^\"<]*\"|'[^'<]*')*)>"
+    r"|<!(?!--)[^<>]*>"
+)
+_TAG_START = re.compile(r"<(?P<end>/?)(?P<tag>[a-zA-Z][a-zA-Z0-9]*)")
+_SKIP_END = {
+    tag: re.compile(rf"</{tag}\s*>", re.IGNORECASE)
+    for tag in ("head", "style", "script", "noscript", "template")
+}
+# where attributes can end - a '>' outside quotes
+_ATTRS_SPECIAL = re.compile(r"[>\"']")
+_HREF = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+class _TextConverter:
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        # line breaks owed before the next text - block elements don't stack up
+        self._breaks = 0
+        # (href, index of the link's first part) of the open links
+        self._links: List[Tuple[str, int]] = []
+
+    def feed(self, html: str) -> None:
+        position = 0
+        for start, end, tag, closing, attrs in _tokenize(html):
+            if start > position:
+                self.handle_data(html[position:start])
+            position = end
+            if tag is None:
+                continue  # comment, doctype or skipped element
+            if closing:
+                self.handle_endtag(tag)
+            else:
+                self.handle_starttag(tag, attrs)
+        if position < len(html):
+            self.handle_data(html[position:])
+
+    def handle_starttag(self, tag: str, attrs: str) -> None:
+        if tag == "br":
+            self._write("\n")
+        elif tag == "li":
+            self._break(1)
+            self._write("- ")
+        elif tag in _BLOCK_TAGS:
+            self._break(2 if tag in _PARAGRAPH_TAGS else 1)
+        elif tag in ("td", "th") and not self._breaks:
+            self.parts.append(" ")
+        elif tag == "a":
+            href = _HREF.search(attrs)
+            url = unescape(next(filter(None, href.groups()), "")) if href else ""
+            self._links.append((url, len(self.parts)))
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _BLOCK_TAGS:
+            self._break(2 if tag in _PARAGRAPH_TAGS else 1)
+        elif tag == "a" and self._links:
+            href, start = self._links.pop()
+            url = href.removeprefix("mailto:")
+            text = "".join(self.parts[start:]).strip()
+            if url and not url.startswith("#") and url != text:
+                self._write(f" ({url})" if text else url)
+
+    def handle_data(self, data: str) -> None:
+        data = _WHITESPACE.sub(" ", data)
+        if "&" in data:
+            data = unescape(data)
+        if data.strip() or not self._breaks:
+            self._write(data)
+
+    def _break(self, lines: int) -> None:
+        self._breaks = max(self._breaks, lines)
+
+    def _write(self, text: str) -> None:
+        if self._breaks:
+            self.parts.append("\n" * self._breaks)
+            self._breaks = 0
+        self.parts.append(text)
+
+    def text(self) -> str:
+        lines = (line.strip() for line in "".join(self.parts).split("\n"))
+        return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def _tokenize(html: str) -> Iterator[Tuple[int, int, Optional[str], bool, str]]:
+    """
+    The markup in 'html' as (start, end, tag, is an end tag, attributes) - tag is
+    None for comments, declarations and skipped elements. A '<' that isn't closed
+    is text. Malformed HTML (i.e., an unclosed '<script>' or quote) is still
+    converted in linear time, see above.
+    """
+    # searches that found nothing from here on - neither will any later one
+    missing: Dict[str, int] = {}
+    # '>' (or -1) the attributes end at, by the '>' or quote the scan reached
+    attrs_ends: Dict[int, int] = {}
+    specials: Optional[List[int]] = None
+
+    def find(needle: str, start: int) -> int:
+        if start >= missing.get(needle, len(html) + 1):
+            return -1
+        index = html.find(needle, start)
+        if index == -1:
+            missing[needle] = start
+        return index
+
+    def skip_end(tag: str, start: int) -> int:
+        if start >= missing.get(f"</{tag}", len(html) + 1):
+            return -1
+        match = _SKIP_END[tag].search(html, start)
+        if match is None:
+            missing[f"</{tag}"] = start
+            return -1
+        return match.end()
+
+    def attrs_end(start: int) -> int:
+        nonlocal specials
+        if specials is None:
+            specials = [match.start() for match in _ATTRS_SPECIAL.finditer(html)]
+        scanned = []
+        end = -1
+        index = bisect.bisect_left(specials, start)
+        while index < len(specials):
+            special = specials[index]
+            if special in attrs_ends:
+                end = attrs_ends[special]
+                break
+            scanned.append(special)
+            if html[special] == ">":
+                end = special
+                break
+            close = find(html[special], special + 1)  # the closing quote
+            if close == -1:
+                break
+            index = bisect.bisect_right(specials, close)
+        for special in scanned:
+            attrs_ends[special] = end
+        return end
+
+    position = 0
+    while True:
+        start = html.find("<", position)
+        if start == -1:
+            return
+        position = start + 1
+        if html.startswith("<!--", start):
+            close = find("-->", start + 4)
+            if close != -1:
+                position = close + 3
+                yield start, position, None, False, ""
+                continue
+        match = _TAG.match(html, start)
+        if match is not None and match.group("tag") is None:
+            position = match.end()
+            yield start, position, None, False, ""  # declaration
+            continue
+        tag_start = match or _TAG_START.match(html, start)
+        if tag_start is not None:
+            tag = tag_start.group("tag").lower()
+            closing = bool(tag_start.group("end"))
+            if not closing and tag in _SKIP_END:
+                end = skip_end(tag, tag_start.end("tag"))
+                if end != -1:
+                    position = end
+                    yield start, end, None, False, ""
+                    continue
+            if match is not None:
+                position = match.end()
+                yield start, position, tag, closing, match.group("attrs")
+                continue
+            # not matched by '_TAG' - a '<' in the attributes
+            end = attrs_end(tag_start.end())
+            if end != -1:
+                position = end + 1
+                yield start, position, tag, closing, html[tag_start.end() : end]
+        elif html.startswith("<!", start):
+            close = find(">", start + 2)
+            if close != -1:
+                position = close + 1
+                yield start, position, None, False, ""
+
+
+def html_to_text(html: str) -> str:
+    """
+    Plain text version of the email 'html' - see above.
+    """
+    converter = _TextConverter()
+    converter.feed(html)
+    return converter.text()
+
+
+#
+# RENDER POOL ================== #
+#
+# Template rendering is pure Python and holds the GIL, so sender threads don't render
+# in parallel. With 'EMAIL_RENDER_PROCESSES' set, 'send_email_bulk' renders its chunks
+# (HTML and plain text) in worker processes - started once ('spawn'), Django set up
+# once per worker and compiled templates kept warm between chunks - and the rendered
+# chunks stream back, in order, to be created and sent while the next ones render.
+#
+# Set in settings.py:
+#   - 'EMAIL_RENDER_PROCESSES': worker processes, 0 renders in-process (default: 0)
+#   - 'EMAIL_RENDER_WINDOW': max chunks rendering at once (default: 2 per process)
+#
+# Workers load the settings from 'DJANGO_SETTINGS_MODULE' - runtime overrides (i.e.,
+# 'override_settings') don't reach them.
+#
+_render_pool: Optional[ProcessPoolExecutor] = None
+_render_pool_lock = threading.Lock()
+
+
+def _init_render_worker() -> None:
+    django.setup()
+
+
+def render_emails(path: str, contexts: List[Dict[Any, Any]]) -> List[Tuple[str, str]]:
+    """
+    Render the email template at 'path' for each of 'contexts'.
+
+    :returns: (HTML, plain text) for each context
+    """
+    # no database access - only the path is needed
+    from .models.notifications import NotificationEmailTemplate
+
+    html_strings = NotificationEmailTemplate(path=path).html_to_str_many(contexts)
+    # identical emails (i.e., broadcasts) are converted to text once
+    text_contents: Dict[str, str] = {}
+    rendered = []
+    for html_string in html_strings:
+        text_content = text_contents.get(html_string)
+        if text_content is None:
+            text_content = text_contents[html_string] = html_to_text(html_string)
+        rendered.append((html_string, text_content))
+    return rendered
+
+
+def get_render_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    The render worker processes, or None when rendering in-process.
+    """
+    global _render_pool
+    processes = getattr(settings, "EMAIL_RENDER_PROCESSES", 0)
+    if processes < 0:
+        raise ValueError("EMAIL_RENDER_PROCESSES must be >= 0")
+    if not processes:
+        return None
+    with _render_pool_lock:
+        if _render_pool is None:
+            # not 'fork' - the parent has sender threads and database connections
+            _render_pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_render_worker,
+            )
+        return _render_pool
+
+
+def shutdown_render_pool() -> None:
+    global _render_pool
+    with _render_pool_lock:
+        pool, _render_pool = _render_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown_render_pool)
+
+
+def _render_result(
+    path: str, chunk: List[Tuple[Any, Dict[Any, Any]]], future: Optional[Future[Any]]
+) -> List[Tuple[str, str]]:
+    if future is None:  # not submitted, the pool broke
+        return render_emails(path, [context for _, context in chunk])
+    try:
+        return future.result()  # type: ignore[no-any-return]
+    except Exception as e:
+        # i.e., a context that can't be pickled or a worker that died - render here,
+        # template errors are raised as they would be without the pool
+        LOGGER.warning(f"Error rendering emails in a worker: ({type(e)}) {e}")
+        if isinstance(e, BrokenProcessPool):
+            shutdown_render_pool()  # a new one is started on next use
+        return render_emails(path, [context for _, context in chunk])
+
+
+def render_email_chunks(
+    path: str, chunks: Iterable[List[Tuple[Any, Dict[Any, Any]]]]
+) -> Iterator[Tuple[List[Tuple[Any, Dict[Any, Any]]], List[Tuple[str, str]]]]:
+    """
+    Render 'chunks' of (recipients, context) with the template at 'path' - across
+    the render pool if there is one, with up to 'EMAIL_RENDER_WINDOW' chunks in
+    flight. 'chunks' is consumed lazily.
+
+    :returns: iterator of (chunk, rendered (HTML, plain text) per message), in order
+    """
+    pool = get_render_pool()
+    if pool is None:
+        for chunk in chunks:
+            yield chunk, render_emails(path, [context for _, context in chunk])
+        return
+
+    window_size = getattr(
+        settings,
+        "EMAIL_RENDER_WINDOW",
+        2 * getattr(settings, "EMAIL_RENDER_PROCESSES", 0),
+    )
+    if window_size < 1:
+        raise ValueError("EMAIL_RENDER_WINDOW must be >= 1")
+    window: Deque[Tuple[List[Tuple[Any, Dict[Any, Any]]], Optional[Future[Any]]]] = (
+        deque()
+    )
+    try:
+        for chunk in chunks:
+            future: Optional[Future[Any]] = None
+            if pool is not None:
+                contexts = [context for _, context in chunk]
+                try:
+                    future = pool.submit(render_emails, path, contexts)
+                except RuntimeError as e:
+                    # i.e., BrokenProcessPool, a worker died - the rest render here
+                    LOGGER.warning(
+                        f"Error submitting emails to render: ({type(e)}) {e}"
+                    )
+                    shutdown_render_pool()
+                    pool = None
+            window.append((chunk, future))
+            if len(window) >= window_size:
+                done, future = window.popleft()
+                yield done, _render_result(path, done, future)
+        while window:
+            done, future = window.popleft()
+            yield done, _render_result(path, done, future)
+    finally:
+        # i.e., the caller stopped early - don't render chunks nobody will send
+        for _, pending in window:
+            if pending is not None:
+                pending.cancel()
@@ -101,6 +101,7 @@ class NotificationEmailSerializer(BaseSerializer):
             "datetime_created",
             "datetime_sent",
             "sent_successfully",
+            "status",
             "sender",
             "recipients",
             "content",
@@ -109,6 +110,7 @@ class NotificationEmailSerializer(BaseSerializer):
             "id",
             "template_ref",
             "datetime_created",
+            "status",
         )
         extra_kwargs = {
             "template": {"help_text": "ID of the email template to use"},
@@ -121,14 +123,15 @@ class NotificationEmailSerializer(BaseSerializer):
             "sent_successfully": {
                 "help_text": "Whether the email was sent successfully"
             },
+            "status": {"help_text": "Delivery status - pending, sent or failed"},
             "sender": {"help_text": "Email address of the sender"},
             "recipients": {"help_text": "List of recipient emails or user IDs"},
         }
 
     @staticmethod
     def get_content(obj: NotificationEmail) -> str:
-        """Render the email template with context data to generate HTML content."""
-        return str(obj.template.html_to_str(obj.context))
+        """Rendered HTML content - stored/cached at send time, rendered otherwise."""
+        return obj.get_content()
 
 
 #
@@ -0,0 +1,104 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+from .caches import invalidate_template_cache
+from .delivery import (
+    CHANNEL_BASIC,
+    CHANNEL_PUSH,
+    reset_delivery_backends,
+    schedule_delivery,
+)
+from .models.notifications import (
+    NotificationBasic,
+    NotificationEmail,
+    NotificationEmailTemplate,
+    NotificationPush,
+)
+from .models.counters import NotificationUnreadCount
+from .models.recipients import NotificationRecipient
+from .rate_limit import reset_rate_limiter
+from .rendering import (
+    reset_compiled_templates,
+    reset_render_memo,
+    shutdown_render_pool,
+)
+
+"""
+# ==================================================================================== #
+# SIGNALS ============================================================================ #
+# ==================================================================================== #
+"""
+
+
+@receiver(post_delete, sender=NotificationBasic)
+@receiver(post_delete, sender=NotificationEmail)
+@receiver(post_delete, sender=NotificationPush)
+def notification_deleted(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """
+    Remove recipient index rows for deleted notifications.
+    """
+    NotificationRecipient.objects.using(kwargs["using"]).filter(
+        notification_id=instance.pk
+    ).delete()
+
+
+@receiver(post_delete, sender=NotificationBasic)
+def notification_basic_deleted(sender: Any, instance: Any, **kwargs: Any) -> None:
+    """
+    Deleting an unread NotificationBasic lowers its recipients' unread counters.
+    """
+    NotificationUnreadCount.objects.db_manager(kwargs["using"]).adjust_notifications(
+        [instance], -1
+    )
+
+
+@receiver(post_save, sender=NotificationBasic)
+@receiver(post_save, sender=NotificationPush)
+def notification_created(
+    sender: Any, instance: Any, created: bool, **kwargs: Any
+) -> None:
+    """
+    Hand new notifications to their channel's delivery backend - bulk creates
+    are handed over by the managers' 'notifications_created'.
+    """
+    if created:
+        channel = CHANNEL_BASIC if sender is NotificationBasic else CHANNEL_PUSH
+        schedule_delivery(channel, [instance], kwargs["using"])
+
+
+@receiver(setting_changed)
+def delivery_backends_changed(setting: str, **kwargs: Any) -> None:
+    if setting == "NOTIFICATIONS_DELIVERY_BACKENDS":
+        reset_delivery_backends()
+
+
+@receiver(setting_changed)
+def rate_limit_changed(setting: str, **kwargs: Any) -> None:
+    if setting.startswith("EMAIL_RATE_LIMIT"):
+        reset_rate_limiter()
+
+
+@receiver(setting_changed)
+def templates_changed(setting: str, **kwargs: Any) -> None:
+    if setting in ("TEMPLATES", "EMAIL_COMPILED_TEMPLATE_CACHE_SIZE"):
+        reset_compiled_templates()
+    if setting.startswith("EMAIL_RENDER_MEMO"):
+        reset_render_memo()
+    if setting == "EMAIL_RENDER_PROCESSES":
+        shutdown_render_pool()
+
+
+@receiver(post_save, sender=NotificationEmailTemplate)
+@receiver(post_delete, sender=NotificationEmailTemplate)
+def notification_email_template_changed(
+    sender: Any, instance: Any, **kwargs: Any
+) -> None:
+    """
+    Drop cached template lookups - now and once the change is committed.
+    """
+    invalidate_template_cache()
+    transaction.on_commit(invalidate_template_cache)
@@ -0,0 +1,286 @@
+import atexit
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Union
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.core.mail import EmailMessage
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .email_sender import (
+    EmailQueueFullError,
+    EmailSender,
+    send_email_async,
+    send_message,
+)
+from .logging import LOGGER
+from .rate_limit import RateLimitDeferred
+
+"""
+# ==================================================================================== #
+# DELIVERY STATUS ==================================================================== #
+# ==================================================================================== #
+"""
+
+#
+# Async sends report their outcome (status, attempts, last error, sent time) back to
+# the NotificationEmail row. Outcomes are buffered and written with one UPDATE per
+# batch instead of one write per email.
+#
+# Set in settings.py:
+#   - 'EMAIL_STATUS_FLUSH_INTERVAL': max seconds an outcome is buffered (default: 1.0)
+#   - 'EMAIL_STATUS_BATCH_SIZE': flush early once this many are buffered (default: 500)
+#
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_FAILED = "failed"
+STATUS_CHOICES = (
+    (STATUS_PENDING, "Pending"),
+    (STATUS_SENT, "Sent"),
+    (STATUS_FAILED, "Failed"),
+)
+
+# rows per UPDATE ... CASE
+_WRITE_BATCH_SIZE = 500
+
+
+class DeliveryStatus(NamedTuple):
+    notification_email_id: Any
+    status: str
+    attempts: int
+    last_error: str = ""
+    datetime_sent: Optional[datetime] = None
+
+
+def write_delivery_statuses(statuses: Iterable[DeliveryStatus]) -> None:
+    """
+    Write delivery outcomes to their NotificationEmail rows - one UPDATE per batch.
+    'datetime_sent' is only written for outcomes that have one.
+    """
+    from .models.notifications import NotificationEmail
+
+    statuses = list(statuses)
+    for start in range(0, len(statuses), _WRITE_BATCH_SIZE):
+        batch = statuses[start : start + _WRITE_BATCH_SIZE]
+
+        def case(field: str, values: List[Any]) -> Case:
+            return Case(
+                *[
+                    When(pk=status.notification_email_id, then=Value(value))
+                    for status, value in zip(batch, values)
+                    if value is not None
+                ],
+                default=F(field),
+                output_field=NotificationEmail._meta.get_field(field),  # type: ignore[arg-type]
+            )
+
+        NotificationEmail.objects.filter(
+            pk__in=[status.notification_email_id for status in batch]
+        ).update(
+            status=case("status", [status.status for status in batch]),
+            attempts=case("attempts", [status.attempts for status in batch]),
+            last_error=case("last_error", [status.last_error for status in batch]),
+            sent_successfully=case(
+                "sent_successfully",
+                [status.status == STATUS_SENT for status in batch],
+            ),
+            datetime_sent=case(
+                "datetime_sent", [status.datetime_sent for status in batch]
+            ),
+        )
+
+
+#
+# DELIVERY STATUS RECORDER ================== #
+#
+class DeliveryStatusRecorder:
+    """
+    Buffers delivery outcomes from send callbacks and writes them from a single
+    background thread - every 'EMAIL_STATUS_FLUSH_INTERVAL' seconds or as soon as
+    'EMAIL_STATUS_BATCH_SIZE' outcomes are waiting.
+    """
+
+    def __init__(self) -> None:
+        self._pending: List[DeliveryStatus] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # the last write failed - don't flush early, wait for the next interval
+        self._retrying = False
+
+    def record(self, status: DeliveryStatus) -> None:
+        with self._lock:
+            self._pending.append(status)
+            pending = len(self._pending)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="email_status_recorder", daemon=True
+                )
+                self._thread.start()
+        if not self._retrying and pending >= getattr(
+            settings, "EMAIL_STATUS_BATCH_SIZE", 500
+        ):
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Write everything buffered so far - if the write fails the outcomes are put
+        back and written with the next flush.
+
+        :returns: number of outcomes written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            write_delivery_statuses(pending)
+        except Exception as e:
+            LOGGER.error(
+                f"Error recording {len(pending)} email delivery statuses, retrying: "
+                f"{type(e)} - {e}"
+            )
+            with self._lock:
+                self._pending[:0] = pending
+                self._retrying = True
+            return 0
+        self._retrying = False
+        return len(pending)
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(getattr(settings, "EMAIL_STATUS_FLUSH_INTERVAL", 1.0))
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+
+_recorder = DeliveryStatusRecorder()
+atexit.register(_recorder.flush)
+
+
+def get_status_recorder() -> DeliveryStatusRecorder:
+    return _recorder
+
+
+def send_tracked(
+    notification_email_id: Any, func: Callable[..., Any], *args: Any
+) -> Optional[DeliveryStatus]:
+    """
+    Send via 'send_email_async' and record the outcome for 'notification_email_id'.
+
+    Async sends are recorded by the background recorder once they complete.
+    Synchronous sends (i.e., 'EMAIL_SYNC_MODE') are written before returning.
+
+    :returns: the outcome for synchronous sends, None if it's still in flight
+    :raises EmailQueueFullError: if the EmailSender queue is full
+    """
+    attempts = AttemptCounter(func)
+    try:
+        result = send_email_async(attempts, *args)
+    except EmailQueueFullError:
+        raise  # never sent - still pending
+    except Exception as e:
+        status = get_delivery_status(notification_email_id, attempts.attempts, error=e)
+        write_delivery_statuses([status])
+        return status
+
+    if isinstance(result, Future):
+        result.add_done_callback(
+            lambda future: _recorder.record(
+                _delivery_status_from_future(
+                    notification_email_id, attempts.attempts, future
+                )
+            )
+        )
+        return None
+
+    status = get_delivery_status(
+        notification_email_id, attempts.attempts, result=result
+    )
+    write_delivery_statuses([status])
+    return status
+
+
+def send_tracked_message(
+    notification_email_id: Any, message: EmailMessage
+) -> Optional[DeliveryStatus]:
+    """
+    'send_tracked' for a single message - coalesced with other messages sent
+    around the same time when batching is on ('EMAIL_BATCH_SIZE' > 1).
+    """
+    sender = EmailSender()
+    if not sender.batching_enabled:
+        return send_tracked(notification_email_id, send_message, message)
+
+    future = sender.submit_message(message)
+    future.add_done_callback(
+        lambda done: _recorder.record(
+            _delivery_status_from_future(notification_email_id, future.attempts, done)
+        )
+    )
+    return None
+
+
+class AttemptCounter:
+    """
+    Wraps a send function and counts how often it was attempted (i.e., retries).
+    Calls paced by the rate limit aren't attempts - what they resume is counted
+    once it runs.
+    """
+
+    def __init__(self, func: Callable[..., Any]) -> None:
+        self.func = func
+        self.attempts = 0
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._call(self.func, *args, **kwargs)
+
+    def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        try:
+            result = func(*args, **kwargs)
+        except RateLimitDeferred as e:
+            if e.resume is not None:
+                e.resume = partial(self._call, e.resume)
+            raise
+        except Exception:
+            self.attempts += 1
+            raise
+        self.attempts += 1
+        return result
+
+
+def get_delivery_status(
+    notification_email_id: Any,
+    attempts: int,
+    result: Any = None,
+    error: Optional[Union[str, BaseException]] = None,
+) -> DeliveryStatus:
+    """
+    Delivery outcome of a send that returned 'result' or failed with 'error'.
+    """
+    if isinstance(error, BaseException):
+        error = f"{type(error).__name__}: {error}"
+    if error is not None:
+        return DeliveryStatus(notification_email_id, STATUS_FAILED, attempts, error)
+    if not result:
+        return DeliveryStatus(
+            notification_email_id, STATUS_FAILED, attempts, "Email not sent"
+        )
+    return DeliveryStatus(
+        notification_email_id, STATUS_SENT, attempts, "", timezone.now()
+    )
+
+
+def _delivery_status_from_future(
+    notification_email_id: Any, attempts: int, future: "Future[Any]"
+) -> DeliveryStatus:
+    try:
+        result = future.result()
+    except Exception as e:
+        return get_delivery_status(notification_email_id, attempts, error=e)
+    return get_delivery_status(notification_email_id, attempts, result=result)
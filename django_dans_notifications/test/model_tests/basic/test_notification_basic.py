@@ -1,6 +1,7 @@
 from typing import List
 from ..base import BaseModelTestCase
 from ....models.notifications import NotificationBasic
+from ....models.recipients import NotificationRecipient
 
 """
 # ========================================================================= #
@@ -161,6 +162,32 @@ class TestBasicNotification(BaseModelTestCase):
         )
         self.assertFalse(notification.recipients_contains(email1))
 
+    def test_recipients_contains_exact_id_only(self) -> None:
+        recipients: List[str] = ["12", "21"]
+        notification: NotificationBasic = self.model.objects.create(
+            recipients=recipients, sender=self.base_email
+        )
+        self.assertFalse(notification.recipients_contains("1"))
+        self.assertTrue(notification.recipients_contains("12"))
+
+    def test_recipients_contains_exact_email_only(self) -> None:
+        recipients: List[str] = ["danielnazarian+20@outlook.com"]
+        notification: NotificationBasic = self.model.objects.create(
+            recipients=recipients, sender=self.base_email
+        )
+        self.assertFalse(notification.recipients_contains("20@outlook.com"))
+        self.assertTrue(
+            notification.recipients_contains("DanielNazarian+20@outlook.com")
+        )
+
+    def test_recipients_contains_user(self) -> None:
+        notification: NotificationBasic = self.model.objects.create(
+            recipients=[f"{self.base_user.id}2"], sender=self.base_email
+        )
+        self.assertFalse(notification.recipients_contains(self.base_user))
+        notification.recipients = str(self.base_user.id)
+        self.assertTrue(notification.recipients_contains(self.base_user))
+
     #
     # RECIPIENTS CLEANUP
     #
@@ -236,3 +263,51 @@ class TestBasicNotification(BaseModelTestCase):
         self.assertIn(email2, res)
         self.assertIn(email3, res)
         self.assertEqual(len(res.split(",")), 3)
+
+    # =================================================================== #
+    # BULK NOTIFY TESTS ================================================= #
+    # =================================================================== #
+
+    def test_bulk_notify(self) -> None:
+        recipients: List[str] = [f"user{i}@example.com" for i in range(25)]
+        created: int = self.model.objects.bulk_notify(
+            "bulk message", recipients, sender=self.base_email, chunk_size=10
+        )
+        self.assertEqual(created, 25)
+        self.assertEqual(self.model.objects.count(), 25)
+        notification: NotificationBasic = self.model.objects.get(
+            self.model.query_recipients("user7@example.com")
+        )
+        self.assertEqual(notification.message, "bulk message")
+        self.assertEqual(notification.recipients, "user7@example.com")
+        self.assertTrue(notification.sent_successfully)
+        self.assertFalse(notification.read)
+
+    def test_bulk_notify_normalizes_recipients(self) -> None:
+        created: int = self.model.objects.bulk_notify(
+            "bulk message",
+            [" User1@Example.com", "user1@example.com", "", 5],
+            sender=self.base_email,
+        )
+        self.assertEqual(created, 2)
+        # stored as given (first of each), indexed normalized
+        self.assertEqual(
+            sorted(self.model.objects.values_list("recipients", flat=True)),
+            ["5", "User1@Example.com"],
+        )
+        self.assertEqual(
+            sorted(NotificationRecipient.objects.values_list("recipient", flat=True)),
+            ["5", "user1@example.com"],
+        )
+        self.assertTrue(
+            self.model.objects.filter(
+                self.model.query_recipients("USER1@example.com")
+            ).exists()
+        )
+
+    def test_bulk_notify_empty(self) -> None:
+        created: int = self.model.objects.bulk_notify(
+            "bulk message", [], sender=self.base_email
+        )
+        self.assertEqual(created, 0)
+        self.assertEqual(self.model.objects.count(), 0)
@@ -0,0 +1,189 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from ..base import BaseModelTestCase
+from ....notification_manager import NotificationManager
+from ....models.counters import NotificationUnreadCount
+from ....models.notifications import NotificationBasic
+
+"""
+# ========================================================================= #
+# TEST NOTIFICATION UNREAD COUNT ========================================== #
+# ========================================================================= #
+"""
+
+
+class TestNotificationUnreadCount(BaseModelTestCase):
+    other_email = "other@email.com"
+
+    def unread(self, recipient: str) -> int:
+        return NotificationUnreadCount.objects.unread_count([recipient])
+
+    # =================================================================== #
+    # CREATE TESTS ====================================================== #
+    # =================================================================== #
+
+    def test_create(self) -> None:
+        NotificationBasic.objects.create(
+            recipients=f"{self.base_email},{self.other_email}", message="hi"
+        )
+        NotificationBasic.objects.create(recipients=self.base_email, message="hi")
+        NotificationBasic.objects.create(
+            recipients=self.base_email, message="hi", read=True
+        )
+        self.assertEqual(self.unread(self.base_email), 2)
+        self.assertEqual(self.unread(self.other_email), 1)
+
+    def test_bulk_create(self) -> None:
+        NotificationBasic.objects.bulk_create(
+            [
+                NotificationBasic(recipients=self.base_email, message="hi"),
+                NotificationBasic(recipients=self.base_email, message="hi", read=True),
+                NotificationBasic(recipients=self.other_email, message="hi"),
+            ]
+        )
+        self.assertEqual(self.unread(self.base_email), 1)
+        self.assertEqual(self.unread(self.other_email), 1)
+
+    def test_bulk_notify(self) -> None:
+        NotificationBasic.objects.bulk_notify(
+            "hi", [self.base_email, self.other_email], sender="x", chunk_size=1
+        )
+        self.assertEqual(self.unread(self.base_email), 1)
+        self.assertEqual(self.unread(self.other_email), 1)
+
+    # =================================================================== #
+    # UPDATE / DELETE TESTS ============================================= #
+    # =================================================================== #
+
+    def test_save_read_and_unread(self) -> None:
+        notification = NotificationBasic.objects.create(
+            recipients=self.base_email, message="hi"
+        )
+        notification = NotificationBasic.objects.get(pk=notification.pk)
+        notification.read = True
+        notification.save()
+        self.assertEqual(self.unread(self.base_email), 0)
+
+        # saving again without changes doesn't move the counter
+        notification.save()
+        self.assertEqual(self.unread(self.base_email), 0)
+
+        notification.read = False
+        notification.save(update_fields=["read"])
+        self.assertEqual(self.unread(self.base_email), 1)
+
+    def test_save_recipients_changed(self) -> None:
+        notification = NotificationBasic.objects.create(
+            recipients=self.base_email, message="hi"
+        )
+        notification.recipients = self.other_email
+        notification.save()
+        self.assertEqual(self.unread(self.base_email), 0)
+        self.assertEqual(self.unread(self.other_email), 1)
+
+    def test_save_stale_instance(self) -> None:
+        NotificationBasic.objects.create(recipients=self.base_email, message="hi")
+        notification = NotificationBasic.objects.create(
+            recipients=self.base_email, message="hi"
+        )
+        stale = NotificationBasic.objects.get(pk=notification.pk)
+        # marked read elsewhere after 'stale' was loaded
+        NotificationManager().mark_notifications_basic_read(
+            self.base_email, ids=[notification.pk]
+        )
+        self.assertEqual(self.unread(self.base_email), 1)
+        stale.read = True
+        stale.save()
+        self.assertEqual(self.unread(self.base_email), 1)
+
+    def test_unread_count_email_and_id(self) -> None:
+        user_id = "1234"
+        NotificationBasic.objects.create(
+            recipients=f"{self.base_email},{user_id}", message="hi"
+        )
+        NotificationBasic.objects.create(recipients=self.base_email, message="hi")
+        NotificationBasic.objects.create(recipients=user_id, message="hi")
+        NotificationBasic.objects.create(
+            recipients=f"{self.base_email},{user_id}", message="hi", read=True
+        )
+        # the one addressed to both is counted once
+        self.assertEqual(
+            NotificationUnreadCount.objects.unread_count([self.base_email, user_id]), 3
+        )
+        self.assertEqual(self.unread(self.base_email), 2)
+        self.assertEqual(
+            NotificationUnreadCount.objects.unread_count([self.other_email, user_id]),
+            2,
+        )
+
+    def test_shared_counts(self) -> None:
+        user_id = "1234"
+        both = NotificationBasic.objects.create(
+            recipients=f"{self.base_email},{user_id}", message="hi"
+        )
+        NotificationBasic.objects.create(recipients=self.base_email, message="hi")
+
+        def shared(recipient: str) -> int:
+            return int(NotificationUnreadCount.objects.get(recipient=recipient).shared)
+
+        self.assertEqual(shared(self.base_email), 1)
+        self.assertEqual(shared(user_id), 1)
+        NotificationManager().mark_notifications_basic_read(self.base_email)
+        self.assertEqual(shared(self.base_email), 0)
+        self.assertEqual(shared(user_id), 0)
+        both.read = False
+        both.save()
+        self.assertEqual(shared(user_id), 1)
+
+        # drift - reconcile repairs shared counts too
+        NotificationUnreadCount.objects.update(shared=0)
+        call_command("reconcile_unread_counts", stdout=StringIO())
+        self.assertEqual(shared(self.base_email), 1)
+        self.assertEqual(shared(user_id), 1)
+        self.assertEqual(
+            NotificationUnreadCount.objects.unread_count([self.base_email, user_id]), 1
+        )
+
+    def test_delete(self) -> None:
+        unread = NotificationBasic.objects.create(
+            recipients=self.base_email, message="hi"
+        )
+        read = NotificationBasic.objects.create(
+            recipients=self.base_email, message="hi", read=True
+        )
+        read.delete()
+        self.assertEqual(self.unread(self.base_email), 1)
+        NotificationBasic.objects.filter(pk=unread.pk).delete()
+        self.assertEqual(self.unread(self.base_email), 0)
+
+    # =================================================================== #
+    # RECONCILE TESTS =================================================== #
+    # =================================================================== #
+
+    def test_reconcile_unread_counts(self) -> None:
+        NotificationBasic.objects.create(recipients=self.base_email, message="hi")
+        NotificationBasic.objects.create(recipients=self.base_email, message="hi")
+        NotificationBasic.objects.create(recipients=self.other_email, message="hi")
+
+        # drift - raw updates skip the counters
+        NotificationBasic.objects.filter(recipients=self.other_email).update(read=True)
+        NotificationUnreadCount.objects.filter(recipient=self.base_email).delete()
+        NotificationUnreadCount.objects.create(recipient="stale@email.com", unread=4)
+
+        out = StringIO()
+        call_command("reconcile_unread_counts", "--dry-run", stdout=out)
+        self.assertIn("Found 3", out.getvalue())
+        self.assertEqual(self.unread(self.base_email), 0)
+
+        out = StringIO()
+        call_command("reconcile_unread_counts", stdout=out)
+        self.assertIn("Repaired 3", out.getvalue())
+        self.assertEqual(self.unread(self.base_email), 2)
+        self.assertEqual(self.unread(self.other_email), 0)
+        self.assertEqual(self.unread("stale@email.com"), 0)
+
+        out = StringIO()
+        call_command("reconcile_unread_counts", stdout=out)
+        self.assertIn("Repaired 0", out.getvalue())
@@ -1,3 +1,4 @@
+from unittest.mock import patch
 from ..base import BaseModelTestCase
 from ....models.notifications import NotificationEmail, NotificationEmailTemplate
 
@@ -73,3 +74,64 @@ class TestEmailNotification(BaseModelTestCase):
             template=self.email_template, recipients=recipients, sender=self.base_email
         )
         self.assertEqual(notification.recipients, ",".join(recipients))
+
+    # =================================================================== #
+    # CONTENT TESTS ===================================================== #
+    # =================================================================== #
+
+    def test_content_stored(self) -> None:
+        notification = NotificationEmail.objects.send_email(
+            template="django-dans-emails/empty.html", context={"message": "stored"}
+        )
+        self.assertIsNotNone(notification.html_content)
+        with patch.object(NotificationEmailTemplate, "html_to_str") as mock_render:
+            notification = self.model.objects.get(pk=notification.pk)
+            self.assertIn("stored", notification.get_content())
+            self.assertIn("stored", notification.get_text_content())
+            mock_render.assert_not_called()
+
+    def test_content_stored_compressed(self) -> None:
+        with self.settings(EMAIL_CONTENT_COMPRESS=True):
+            notification = NotificationEmail.objects.send_email(
+                template="django-dans-emails/empty.html", context={"message": "zipped"}
+            )
+            notification = self.model.objects.get(pk=notification.pk)
+            self.assertTrue(bytes(notification.html_content).startswith(b"z"))
+            self.assertIn("zipped", notification.get_content())
+
+    def test_content_cache(self) -> None:
+        with self.settings(EMAIL_CONTENT_MODE="cache"):
+            notification = NotificationEmail.objects.send_email(
+                template="django-dans-emails/empty.html", context={"message": "cached"}
+            )
+            self.assertIsNone(notification.html_content)
+            with patch.object(NotificationEmailTemplate, "html_to_str") as mock_render:
+                self.assertIn("cached", notification.get_content())
+                mock_render.assert_not_called()
+
+    def test_content_cache_timeout(self) -> None:
+        with self.settings(EMAIL_CONTENT_MODE="cache"), patch(
+            "django_dans_notifications.models.notifications.get_content_cache"
+        ) as get_cache:
+            NotificationEmail.objects.send_email(
+                template="django-dans-emails/empty.html", context={"message": "cached"}
+            )
+        # cached content expires - it's rendered again if needed
+        self.assertEqual(get_cache().set_many.call_args[1]["timeout"], 60 * 60 * 24)
+
+    def test_content_lazy(self) -> None:
+        with self.settings(EMAIL_CONTENT_MODE="lazy"):
+            notification = NotificationEmail.objects.send_email(
+                template="django-dans-emails/empty.html", context={"message": "lazy"}
+            )
+            self.assertIsNone(notification.html_content)
+            self.assertIn("lazy", notification.get_content())
+            self.assertIn("lazy", notification.get_text_content())
+
+    def test_content_invalid_mode(self) -> None:
+        notification = self.model.objects.create(
+            template=self.email_template, recipients=self.base_email
+        )
+        with self.settings(EMAIL_CONTENT_MODE="INVALID"):
+            with self.assertRaises(ValueError):
+                notification.get_content()
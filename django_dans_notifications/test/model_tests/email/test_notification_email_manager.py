@@ -1,5 +1,6 @@
 from typing import List, Dict, Any
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core import mail
 from django.core.files import File
 from unittest.mock import patch
 from ..base import BaseModelTestCase
@@ -144,6 +145,22 @@ class TestNotificationEmailManager(BaseModelTestCase):
 
             self.assertIsNotNone(notification_email)
 
+    def test_send_email_invalid_message_failed(self) -> None:
+        template: str = "django-dans-emails/default.html"
+        with patch(
+            "django_dans_notifications.models.notifications.EmailMultiAlternatives",
+            side_effect=ValueError("Invalid message"),
+        ):
+            with self.assertLogs(LOGGER, level="ERROR"):
+                notification_email = NotificationEmail.objects.send_email(
+                    template=template, recipients=self.email
+                )
+        self.assertEqual(notification_email.status, "failed")
+        notification_email.refresh_from_db()
+        self.assertEqual(notification_email.status, "failed")
+        self.assertFalse(notification_email.sent_successfully)
+        self.assertIn("ValueError: Invalid message", notification_email.last_error)
+
     def test_send_email_with_subject_and_sender(self) -> None:
         subject: str = "Custom Subject"
         sender: str = "customsender@example.com"
@@ -162,3 +179,73 @@ class TestNotificationEmailManager(BaseModelTestCase):
             )
             # Ensure email is not marked as sent in test mode
             self.assertFalse(notification_email.sent_successfully)
+
+    # =================================================================== #
+    # BULK TESTS ======================================================== #
+    # =================================================================== #
+
+    def test_send_email_bulk_template_doesnt_exist(self) -> None:
+        with self.assertRaises(ValueError):
+            NotificationEmail.objects.send_email_bulk([], template="INVALID")
+
+    def test_send_email_bulk_does_not_send_in_test_mode(self) -> None:
+        template: str = "django-dans-emails/default.html"
+        results = list(
+            NotificationEmail.objects.send_email_bulk(
+                [("one@example.com", None), ("two@example.com", {"a": "b"})],
+                template=template,
+            )
+        )
+        self.assertEqual(len(results), 2)
+        self.assertFalse(any(sent for _, sent in results))
+        self.assertEqual(NotificationEmail.objects.count(), 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_send_email_bulk(self) -> None:
+        template: str = "django-dans-emails/empty.html"
+        messages = (
+            (f"user{i}@example.com", {"message": f"hello {i}"}) for i in range(5)
+        )
+        with self.settings(IN_TEST=False):
+            results = list(
+                NotificationEmail.objects.send_email_bulk(
+                    messages, subject="Digest", template=template, chunk_size=2
+                )
+            )
+
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(sent for _, sent in results))
+        self.assertEqual(len(mail.outbox), 5)
+        # chunks may be sent concurrently - don't rely on outbox order
+        outbox = {tuple(message.to): message for message in mail.outbox}
+        self.assertIn("hello 3", outbox[("user3@example.com",)].alternatives[0][0])  # type: ignore[attr-defined]
+
+        notification_email, _ = results[3]
+        notification_email = NotificationEmail.objects.get(pk=notification_email.pk)
+        self.assertTrue(notification_email.sent_successfully)
+        self.assertIsNotNone(notification_email.datetime_sent)
+        self.assertEqual(notification_email.recipients, "user3@example.com")
+        self.assertEqual(notification_email.subject, "Digest")
+
+    def test_send_email_bulk_reports_failures(self) -> None:
+        template: str = "django-dans-emails/default.html"
+        with self.settings(IN_TEST=False):
+            with patch(
+                "django_dans_notifications.models.notifications.send_messages_batch_errors",
+                return_value=[None, "SMTPRecipientsRefused: rejected"],
+            ):
+                results = list(
+                    NotificationEmail.objects.send_email_bulk(
+                        [("one@example.com", None), ("two@example.com", None)],
+                        template=template,
+                    )
+                )
+        self.assertEqual([sent for _, sent in results], [True, False])
+        failed = NotificationEmail.objects.get(pk=results[1][0].pk)
+        self.assertFalse(failed.sent_successfully)
+        self.assertEqual(failed.status, "failed")
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn("rejected", failed.last_error)
+        self.assertEqual(
+            NotificationEmail.objects.get(pk=results[0][0].pk).status, "sent"
+        )
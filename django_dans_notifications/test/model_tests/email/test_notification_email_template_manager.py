@@ -1,4 +1,6 @@
+from django.core.cache import cache
 from ..base import BaseModelTestCase
+from ....caches import _template_cache, invalidate_template_cache
 from ....models.notifications import NotificationEmailTemplate
 
 """
@@ -22,6 +24,12 @@ class TestNotificationEmailTemplateManager(BaseModelTestCase):
             path="emails/default.html", nickname="email_default"
         )
 
+    def tearDown(self) -> None:
+        # cached templates outlive the test transaction
+        invalidate_template_cache()
+        cache.clear()
+        super(TestNotificationEmailTemplateManager, self).tearDown()
+
     # =================================================================== #
     # BASIC TESTS ======================================================= #
     # =================================================================== #
@@ -85,3 +93,62 @@ class TestNotificationEmailTemplateManager(BaseModelTestCase):
         if email_template is not None:
             self.fail("Email template found")
         self.assertIsNone(email_template)
+
+    # =================================================================== #
+    # CACHE TESTS ======================================================= #
+    # =================================================================== #
+
+    def test_template_cached_no_queries(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            email_template = NotificationEmailTemplate.objects.find_email_template(
+                "default"
+            )
+        with self.assertNumQueries(0):
+            cached_template = NotificationEmailTemplate.objects.find_email_template(
+                "default"
+            )
+        if email_template is None or cached_template is None:
+            self.fail("Email template not found")
+        self.assertEqual(cached_template.pk, email_template.pk)
+        self.assertIsNot(cached_template, email_template)
+
+    def test_template_not_cached_before_commit(self) -> None:
+        NotificationEmailTemplate.objects.find_email_template(
+            "django-dans-emails/default.html"
+        )
+        with self.assertNumQueries(1):
+            NotificationEmailTemplate.objects.find_email_template(
+                "django-dans-emails/default.html"
+            )
+
+    def test_template_cache_invalidated_on_save(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            email_template = NotificationEmailTemplate.objects.find_email_template(
+                "email_default"
+            )
+        if email_template is None:
+            self.fail("Email template not found")
+        email_template.nickname = "renamed"
+        email_template.save()
+        self.assertIsNone(
+            NotificationEmailTemplate.objects.find_email_template("email_default")
+        )
+
+    def test_template_cache_shared(self) -> None:
+        with self.settings(EMAIL_TEMPLATE_CACHE="default"):
+            with self.captureOnCommitCallbacks(execute=True):
+                NotificationEmailTemplate.objects.find_email_template("default")
+            # drop the in-process entries - the shared cache should still hit
+            _template_cache.clear()
+            with self.assertNumQueries(0):
+                email_template = NotificationEmailTemplate.objects.find_email_template(
+                    "default"
+                )
+            self.assertIsNotNone(email_template)
+
+            # invalidation bumps the shared generation
+            invalidate_template_cache()
+            with self.assertNumQueries(1):
+                NotificationEmailTemplate.objects.find_email_template(
+                    "django-dans-emails/default.html"
+                )
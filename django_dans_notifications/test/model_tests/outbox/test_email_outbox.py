@@ -0,0 +1,255 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail import EmailMultiAlternatives
+from django.core.management import call_command
+from django.utils import timezone
+
+from ..base import BaseModelTestCase
+from ....caches import invalidate_template_cache
+from ....email_sender import EmailQueueFullError
+from ....models.notifications import NotificationEmail, NotificationEmailManager
+from ....models.outbox import EmailOutbox, deserialize_message, serialize_message
+
+"""
+# ========================================================================= #
+# TEST EMAIL OUTBOX ======================================================= #
+# ========================================================================= #
+"""
+
+
+class TestEmailOutbox(BaseModelTestCase):
+    template: str = "django-dans-emails/default.html"
+
+    def setUp(self) -> None:
+        super(TestEmailOutbox, self).setUp()
+        # running on_commit callbacks caches templates that are rolled back
+        self.addCleanup(invalidate_template_cache)
+
+    def send_email(self, **kwargs: object) -> NotificationEmail:
+        with self.settings(EMAIL_DELIVERY_MODE="outbox"):
+            return NotificationEmail.objects.send_email(
+                "Subject", template=self.template, recipients=self.base_email, **kwargs  # type: ignore[arg-type]
+            )
+
+    # =================================================================== #
+    # SERIALIZE TESTS =================================================== #
+    # =================================================================== #
+
+    def test_serialize_round_trip(self) -> None:
+        message = EmailMultiAlternatives(
+            subject="Subject",
+            body="text",
+            from_email="from@example.com",
+            to=["to@example.com"],
+            cc=["cc@example.com"],
+            reply_to=["reply@example.com"],
+            headers={"X-Test": "1"},
+        )
+        message.attach_alternative("<p>html</p>", "text/html")
+        message.attach("file.bin", b"\x00\xffdata", "application/octet-stream")
+        message.attach("file.txt", "text data", "text/plain")
+
+        copy = deserialize_message(serialize_message(message))
+        self.assertEqual(copy.subject, "Subject")
+        self.assertEqual(copy.to, ["to@example.com"])
+        self.assertEqual(copy.cc, ["cc@example.com"])
+        self.assertEqual(copy.reply_to, ["reply@example.com"])
+        self.assertEqual(copy.extra_headers, {"X-Test": "1"})
+        self.assertEqual(copy.alternatives, [("<p>html</p>", "text/html")])
+        self.assertEqual(
+            copy.attachments,
+            [
+                ("file.bin", b"\x00\xffdata", "application/octet-stream"),
+                ("file.txt", "text data", "text/plain"),
+            ],
+        )
+
+    # =================================================================== #
+    # QUEUE TESTS ======================================================= #
+    # =================================================================== #
+
+    def test_send_email_queues(self) -> None:
+        notification_email = self.send_email(
+            file_attachment=SimpleUploadedFile("file.txt", b"content")
+        )
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertFalse(notification_email.sent_successfully)
+        self.assertIsNone(notification_email.datetime_sent)
+
+        email = EmailOutbox.objects.get()
+        self.assertEqual(email.notification_email, notification_email)
+        self.assertEqual(email.status, EmailOutbox.STATUS_PENDING)
+        self.assertEqual(email.payload["to"], [self.base_email])
+        self.assertEqual(email.payload["attachments"][0]["filename"], "file.txt")
+
+    def test_send_email_enqueue_error_marks_failed(self) -> None:
+        with patch.object(
+            EmailOutbox.objects, "enqueue", side_effect=ValueError("MIMEBase")
+        ), self.assertLogs("django_dans_notifications", "ERROR"):
+            notification_email = self.send_email()
+        self.assertEqual(notification_email.status, "failed")
+        self.assertIn("MIMEBase", notification_email.last_error)
+        notification_email.refresh_from_db()
+        self.assertEqual(notification_email.status, "failed")
+        self.assertFalse(notification_email.sent_successfully)
+        self.assertIn("MIMEBase", notification_email.last_error)
+        self.assertEqual(EmailOutbox.objects.count(), 0)
+
+    def test_send_email_bulk_queues(self) -> None:
+        with self.settings(EMAIL_DELIVERY_MODE="outbox"):
+            results = list(
+                NotificationEmail.objects.send_email_bulk(
+                    [("one@example.com", None), ("two@example.com", None)],
+                    template=self.template,
+                )
+            )
+        self.assertEqual([sent for _, sent in results], [False, False])
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_send_email_queue_full_spills(self) -> None:
+        sender = Mock(queue_full_policy="outbox")
+        with self.settings(IN_TEST=False), patch(
+            "django_dans_notifications.models.notifications.EmailSender",
+            return_value=sender,
+        ), patch(
+            "django_dans_notifications.models.notifications.send_tracked_message",
+            side_effect=EmailQueueFullError,
+        ):
+            # sent once the (test case) transaction commits
+            with self.captureOnCommitCallbacks(execute=True):
+                notification_email = NotificationEmail.objects.send_email(
+                    "Subject", template=self.template, recipients=self.base_email
+                )
+        email = EmailOutbox.objects.get()
+        self.assertEqual(email.notification_email, notification_email)
+        self.assertEqual(email.status, EmailOutbox.STATUS_PENDING)
+
+    def test_send_email_queue_full_rejects(self) -> None:
+        sender = Mock(queue_full_policy="reject")
+        with self.settings(IN_TEST=False), patch(
+            "django_dans_notifications.models.notifications.EmailSender",
+            return_value=sender,
+        ), patch(
+            "django_dans_notifications.models.notifications.send_tracked_message",
+            side_effect=EmailQueueFullError,
+        ):
+            # outside a transaction - raised to the caller
+            notification_email, message = NotificationEmailManager._prepare_email(
+                "Subject", self.template, None, self.base_email, None, None
+            )
+            assert message is not None
+            with self.assertRaises(EmailQueueFullError):
+                NotificationEmailManager._send_tracked(notification_email, message)
+
+            # sent after the caller's transaction committed - recorded as failed
+            with self.assertLogs(
+                "django_dans_notifications", "ERROR"
+            ), self.captureOnCommitCallbacks(execute=True):
+                notification_email = NotificationEmail.objects.send_email(
+                    "Subject", template=self.template, recipients=self.base_email
+                )
+        self.assertFalse(EmailOutbox.objects.exists())
+        self.assertEqual(notification_email.status, "failed")
+        notification_email.refresh_from_db()
+        self.assertEqual(notification_email.status, "failed")
+        self.assertIn("EmailQueueFullError", notification_email.last_error)
+
+    def test_send_email_waits_for_commit(self) -> None:
+        with self.settings(IN_TEST=False), patch(
+            "django_dans_notifications.models.notifications.send_tracked_message",
+            return_value=None,
+        ) as send:
+            with self.captureOnCommitCallbacks() as callbacks:
+                notification_email = NotificationEmail.objects.send_email(
+                    "Subject", template=self.template, recipients=self.base_email
+                )
+            send.assert_not_called()
+            for callback in callbacks:
+                callback()
+        send.assert_called_once()
+        self.assertEqual(send.call_args[0][0], notification_email.pk)
+
+    def test_send_email_bulk_queue_full_spills(self) -> None:
+        sender = Mock(queue_full_policy="outbox")
+        with self.settings(IN_TEST=False), patch(
+            "django_dans_notifications.models.notifications.EmailSender",
+            return_value=sender,
+        ), patch(
+            "django_dans_notifications.models.notifications.send_email_async",
+            side_effect=EmailQueueFullError,
+        ):
+            results = list(
+                NotificationEmail.objects.send_email_bulk(
+                    [("one@example.com", None), ("two@example.com", None)],
+                    template=self.template,
+                )
+            )
+        self.assertEqual([sent for _, sent in results], [False, False])
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+
+    # =================================================================== #
+    # PROCESS TESTS ===================================================== #
+    # =================================================================== #
+
+    def test_process_batch(self) -> None:
+        notification_email = self.send_email()
+        self.send_email()
+
+        self.assertEqual(EmailOutbox.objects.process_batch(batch_size=1), (1, 0, 0))
+        self.assertEqual(EmailOutbox.objects.process_batch(batch_size=1), (1, 0, 0))
+        self.assertEqual(EmailOutbox.objects.process_batch(batch_size=1), (0, 0, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, [self.base_email])
+
+        notification_email.refresh_from_db()
+        self.assertTrue(notification_email.sent_successfully)
+        self.assertEqual(notification_email.status, "sent")
+        self.assertIsNotNone(notification_email.datetime_sent)
+        email = EmailOutbox.objects.get(notification_email=notification_email)
+        self.assertEqual(email.status, EmailOutbox.STATUS_SENT)
+        self.assertEqual(email.attempts, 1)
+
+    def test_process_batch_retries_then_fails(self) -> None:
+        notification_email = self.send_email()
+        with self.settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60):
+            with patch(
+                "django_dans_notifications.models.outbox.send_messages_batch_errors",
+                side_effect=ConnectionRefusedError("refused"),
+            ):
+                # rescheduled - not failed yet
+                self.assertEqual(EmailOutbox.objects.process_batch(), (0, 1, 0))
+                email = EmailOutbox.objects.get()
+                self.assertEqual(email.status, EmailOutbox.STATUS_PENDING)
+                self.assertEqual(email.attempts, 1)
+                self.assertIn("refused", email.last_error)
+                self.assertGreater(
+                    email.available_at, timezone.now() + timedelta(seconds=50)
+                )
+
+                # not due yet
+                self.assertEqual(EmailOutbox.objects.process_batch(), (0, 0, 0))
+
+                EmailOutbox.objects.update(available_at=timezone.now())
+                self.assertEqual(EmailOutbox.objects.process_batch(), (0, 0, 1))
+                email.refresh_from_db()
+                self.assertEqual(email.status, EmailOutbox.STATUS_FAILED)
+                self.assertEqual(email.attempts, 2)
+
+        notification_email.refresh_from_db()
+        self.assertFalse(notification_email.sent_successfully)
+        self.assertEqual(notification_email.status, "failed")
+        self.assertEqual(notification_email.attempts, 2)
+        self.assertIn("refused", notification_email.last_error)
+
+    def test_process_email_outbox_command(self) -> None:
+        for _ in range(3):
+            self.send_email()
+        out = StringIO()
+        call_command("process_email_outbox", "--once", "--batch-size", "2", stdout=out)
+        self.assertIn("3 sent, 0 retrying, 0 failed", out.getvalue())
+        self.assertEqual(len(mail.outbox), 3)
@@ -44,3 +44,16 @@ class TestPushNotification(BaseModelTestCase):
             recipients=self.base_email, sender=sender, message="Test Message"
         )
         self.assertEqual(notification.sender, sender)
+
+    def test_bulk_notify(self) -> None:
+        recipients = [f"user{i}@example.com" for i in range(5)]
+        created = self.model.objects.bulk_notify(
+            "push message", recipients, sender=self.base_email
+        )
+        self.assertEqual(created, 5)
+        self.assertEqual(
+            self.model.objects.filter(
+                self.model.query_recipients("user3@example.com")
+            ).count(),
+            1,
+        )
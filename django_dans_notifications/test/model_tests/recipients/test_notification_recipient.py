@@ -0,0 +1,179 @@
+from importlib import import_module
+from typing import List
+from unittest.mock import call, patch
+
+from django.db import transaction
+
+from ..base import BaseModelTestCase
+from ....helpers import normalize_recipient, normalize_recipients
+from ....models.notifications import (
+    NotificationBasic,
+    NotificationBasicManager,
+    NotificationPush,
+)
+from ....models.base import NotificationBase
+from ....models.recipients import NotificationRecipient
+
+"""
+# ========================================================================= #
+# TEST NOTIFICATION RECIPIENT ============================================= #
+# ========================================================================= #
+"""
+
+
+class TestNotificationRecipient(BaseModelTestCase):
+    def setUp(self) -> None:
+        super(TestNotificationRecipient, self).setUp()
+
+    def get_recipients(self, notification: NotificationBase) -> List[str]:
+        return sorted(
+            NotificationRecipient.objects.filter(
+                notification_id=notification.pk
+            ).values_list("recipient", flat=True)
+        )
+
+    # =================================================================== #
+    # INDEX TESTS ======================================================= #
+    # =================================================================== #
+
+    def test_index_on_create(self) -> None:
+        notification: NotificationBasic = NotificationBasic.objects.create(
+            recipients=["Test@Email.com", "12"], sender=self.base_email
+        )
+        self.assertEqual(self.get_recipients(notification), ["12", "test@email.com"])
+        self.assertTrue(
+            NotificationRecipient.objects.filter(
+                notification_id=notification.pk, notification_type="notificationbasic"
+            ).exists()
+        )
+
+    def test_index_datetime_created(self) -> None:
+        notification: NotificationBasic = NotificationBasic.objects.create(
+            recipients=self.base_email, sender=self.base_email
+        )
+        NotificationBasic.objects.bulk_notify("Hi", ["a@email.com"], self.base_email)
+        bulk = NotificationBasic.objects.get(recipients="a@email.com")
+        for item in (notification, bulk):
+            row = NotificationRecipient.objects.get(notification_id=item.pk)
+            self.assertEqual(row.datetime_created, item.datetime_created)
+
+    def test_index_empty_recipients(self) -> None:
+        notification: NotificationBasic = NotificationBasic.objects.create(
+            recipients="", sender=self.base_email
+        )
+        self.assertEqual(self.get_recipients(notification), [])
+
+    def test_index_duplicate_recipients(self) -> None:
+        notification: NotificationBasic = NotificationBasic.objects.create(
+            recipients=[self.base_email, self.base_email], sender=self.base_email
+        )
+        self.assertEqual(self.get_recipients(notification), [self.base_email])
+
+    def test_reindex_on_recipients_change(self) -> None:
+        notification: NotificationBasic = NotificationBasic.objects.create(
+            recipients=self.base_email, sender=self.base_email
+        )
+        notification.recipients = "other@email.com"
+        notification.save()  # type: ignore[no-untyped-call]
+        self.assertEqual(self.get_recipients(notification), ["other@email.com"])
+
+    def test_save_transaction_uses_database(self) -> None:
+        notification = NotificationPush(
+            recipients=self.base_email, sender=self.base_email, message="Hi"
+        )
+        with patch(
+            "django_dans_notifications.models.base.transaction.atomic",
+            side_effect=transaction.atomic,
+        ) as atomic:
+            notification.save(using="default")  # type: ignore[no-untyped-call]
+        # the outer transaction - the rest are Django's own (savepoint=False)
+        self.assertEqual(atomic.call_args_list[0], call(using="default"))
+        self.assertEqual(self.get_recipients(notification), [self.base_email])
+
+    def test_save_transaction_uses_router(self) -> None:
+        notification = NotificationPush(
+            recipients=self.base_email, sender=self.base_email, message="Hi"
+        )
+        with patch(
+            "django_dans_notifications.models.base.router.db_for_write",
+            return_value="default",
+        ) as db_for_write, patch(
+            "django_dans_notifications.models.base.transaction.atomic",
+            side_effect=transaction.atomic,
+        ) as atomic:
+            notification.save()  # type: ignore[no-untyped-call]
+        db_for_write.assert_called_with(NotificationPush, instance=notification)
+        self.assertEqual(atomic.call_args_list[0], call(using="default"))
+
+    def test_bulk_notify_passes_database(self) -> None:
+        with patch.object(
+            NotificationBasicManager, "notifications_created"
+        ) as notifications_created:
+            NotificationBasic.objects.db_manager("default").bulk_notify(
+                "Hi", [self.base_email], self.base_email
+            )
+        self.assertEqual(notifications_created.call_args[0][1], "default")
+
+    def test_backfill_migration_normalizes_like_helper(self) -> None:
+        migration = import_module(
+            "django_dans_notifications.migrations.0004_backfill_notificationrecipient"
+        )
+        recipients = [" Test@Email.com", "'12'", "[a@b.com]", "", "test@email.com"]
+        self.assertEqual(
+            migration.normalize_recipients(recipients),
+            normalize_recipients(recipients),
+        )
+
+    def test_sender_key_migration_normalizes_like_helper(self) -> None:
+        migration = import_module(
+            "django_dans_notifications.migrations.0012_notification_sender_key"
+        )
+        for sender in (" Test@Email.com", "'a@b.com'", "[a@b.com]", "\ta@b.com\n"):
+            self.assertEqual(
+                migration.normalize_sender(sender), normalize_recipient(sender)
+            )
+
+    def test_index_removed_on_delete(self) -> None:
+        notification: NotificationBasic = NotificationBasic.objects.create(
+            recipients=self.base_email, sender=self.base_email
+        )
+        pk = notification.pk
+        notification.delete()
+        self.assertFalse(
+            NotificationRecipient.objects.filter(notification_id=pk).exists()
+        )
+
+    def test_index_on_bulk_create(self) -> None:
+        notifications = NotificationPush.objects.bulk_create(
+            [
+                NotificationPush(recipients=str([self.base_email]), message="1"),
+                NotificationPush(recipients="a@email.com,b@email.com", message="2"),
+            ]
+        )
+        self.assertEqual(notifications[0].recipients, self.base_email)
+        self.assertEqual(
+            NotificationRecipient.objects.filter(
+                notification_type="notificationpush"
+            ).count(),
+            3,
+        )
+
+    # =================================================================== #
+    # QUERY TESTS ======================================================= #
+    # =================================================================== #
+
+    def test_query_recipients(self) -> None:
+        notification: NotificationBasic = NotificationBasic.objects.create(
+            recipients=[self.base_email, "5"], sender=self.base_email
+        )
+        NotificationBasic.objects.create(recipients="other@email.com")
+        NotificationPush.objects.create(recipients=self.base_email)
+
+        by_email = NotificationBasic.objects.filter(
+            NotificationBasic.query_recipients(self.base_email.upper())
+        )
+        by_id = NotificationBasic.objects.filter(
+            NotificationBasic.query_recipients("missing@email.com", 5)
+        )
+        self.assertEqual(list(by_email), [notification])
+        self.assertEqual(list(by_id), [notification])
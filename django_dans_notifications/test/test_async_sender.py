@@ -0,0 +1,148 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+from asgiref.sync import async_to_sync
+from django.core import mail
+from django.core.mail import EmailMessage
+
+from .model_tests.base import BaseModelTestCase
+from ..async_sender import AsyncEmailSender, get_async_sender
+from ..models.notifications import NotificationEmail
+from ..status import STATUS_FAILED, STATUS_SENT, DeliveryStatusRecorder
+
+"""
+# ========================================================================= #
+# TEST ASYNC EMAIL SENDER ================================================= #
+# ========================================================================= #
+"""
+
+
+def run(coroutine: Any) -> Any:
+    return asyncio.run(coroutine)
+
+
+class TestAsyncEmailSender(BaseModelTestCase):
+    template: str = "django-dans-emails/default.html"
+
+    def message(self, to: str = "to@example.com") -> EmailMessage:
+        return EmailMessage("Subject", "Body", "from@example.com", [to])
+
+    # =================================================================== #
+    # ASEND EMAIL TESTS ================================================= #
+    # =================================================================== #
+
+    def test_asend_email_test_mode(self) -> None:
+        notification_email = async_to_sync(NotificationEmail.objects.asend_email)(
+            "Subject", template=self.template, recipients=self.base_email
+        )
+        self.assertIsNotNone(notification_email.pk)
+        self.assertIsNotNone(notification_email.datetime_sent)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_asend_email_sends(self) -> None:
+        with self.settings(IN_TEST=False), patch.object(
+            DeliveryStatusRecorder, "record"
+        ) as record:
+            notification_email = async_to_sync(NotificationEmail.objects.asend_email)(
+                "Subject", template=self.template, recipients=self.base_email
+            )
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.base_email])
+        self.assertEqual(notification_email.status, STATUS_SENT)
+        self.assertTrue(notification_email.sent_successfully)
+        status = record.call_args[0][0]
+        self.assertEqual(status.notification_email_id, notification_email.pk)
+        self.assertEqual(status.attempts, 1)
+
+    # =================================================================== #
+    # SENDER TESTS ====================================================== #
+    # =================================================================== #
+
+    def test_send_message_backend_fallback(self) -> None:
+        async def send() -> int:
+            sender = AsyncEmailSender()
+            self.assertIsNone(sender.pool)
+            return await sender.send_message(self.message())
+
+        self.assertEqual(run(send()), 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_send_tracked_retries_then_fails(self) -> None:
+        async def send() -> Any:
+            sender = AsyncEmailSender()
+            with patch.object(
+                sender, "_send", AsyncMock(side_effect=Exception("Rejected"))
+            ):
+                return await sender.send_tracked(1, self.message())
+
+        with self.settings(EMAIL_RETRY_DELAY=0), patch.object(
+            DeliveryStatusRecorder, "record"
+        ) as record:
+            status = run(send())
+        self.assertEqual(status.status, STATUS_FAILED)
+        self.assertEqual(status.attempts, 3)
+        self.assertEqual(status.last_error, "Exception: Rejected")
+        record.assert_called_once_with(status)
+
+    def test_sender_per_event_loop(self) -> None:
+        async def sender() -> AsyncEmailSender:
+            self.assertIs(get_async_sender(), get_async_sender())
+            return get_async_sender()
+
+        self.assertIsNot(run(sender()), run(sender()))
+
+    # =================================================================== #
+    # CONNECTION POOL TESTS ============================================= #
+    # =================================================================== #
+
+    def smtp_client(self) -> Mock:
+        client = Mock(is_connected=True)
+        client.connect = AsyncMock()
+        client.send_message = AsyncMock()
+        client.quit = AsyncMock()
+        return client
+
+    def test_pool_reuses_connection(self) -> None:
+        client = self.smtp_client()
+        aiosmtplib = Mock()
+        aiosmtplib.SMTP.return_value = client
+
+        async def send() -> AsyncEmailSender:
+            sender = AsyncEmailSender()
+            await asyncio.gather(
+                sender.send_message(self.message("one@example.com")),
+                sender.send_message(self.message("two@example.com")),
+            )
+            await sender.send_message(self.message("three@example.com"))
+            return sender
+
+        with self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_ASYNC_POOL_SIZE=1,
+        ), patch("django_dans_notifications.async_sender.aiosmtplib", aiosmtplib):
+            run(send())
+
+        # pool of one - every send waited for and reused the same connection
+        aiosmtplib.SMTP.assert_called_once()
+        client.connect.assert_awaited_once()
+        self.assertEqual(client.send_message.await_count, 3)
+
+    def test_pool_replaces_failed_connection(self) -> None:
+        clients = [self.smtp_client(), self.smtp_client()]
+        clients[0].send_message.side_effect = Exception("Connection lost")
+        aiosmtplib = Mock()
+        aiosmtplib.SMTP.side_effect = clients
+
+        async def send() -> int:
+            return await AsyncEmailSender().send_message(self.message())
+
+        with self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_RETRY_DELAY=0,
+        ), patch("django_dans_notifications.async_sender.aiosmtplib", aiosmtplib):
+            self.assertEqual(run(send()), 1)
+
+        clients[0].quit.assert_awaited_once()
+        clients[1].send_message.assert_awaited_once()
+        self.assertEqual(aiosmtplib.SMTP.call_count, 2)
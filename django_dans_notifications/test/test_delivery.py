@@ -0,0 +1,237 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+from unittest.mock import Mock
+
+from django.core import mail
+from django.core.mail import EmailMessage
+
+from .model_tests.base import BaseModelTestCase
+from ..delivery import (
+    BaseDeliveryBackend,
+    ChannelDispatcher,
+    EmailDeliveryBackend,
+    FileDeliveryBackend,
+    NullDeliveryBackend,
+    Outcome,
+    get_delivery_backend,
+    outbox,
+)
+from ..email_sender import EmailSender, send_message, send_messages_batch
+from ..models.notifications import NotificationBasic, NotificationPush
+
+"""
+# ========================================================================= #
+# TEST DELIVERY BACKENDS ================================================== #
+# ========================================================================= #
+"""
+
+IN_MEMORY = {"BACKEND": "django_dans_notifications.delivery.InMemoryDeliveryBackend"}
+
+
+class RecordingBackend(BaseDeliveryBackend):
+    batches: List[int] = []
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def send_batch(self, items: Sequence[Any]) -> List[Outcome]:
+        cls = RecordingBackend
+        with cls.lock:
+            cls.batches.append(len(items))
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(0.01)
+        with cls.lock:
+            cls.in_flight -= 1
+        return [True] * len(items)
+
+
+class FlakyBackend(BaseDeliveryBackend):
+    """
+    First batch: the second item fails. Second batch: the gateway is down once.
+    """
+
+    delivered: List[int] = []
+    calls: Dict[int, int] = {}
+
+    def send_batch(self, items: Sequence[Any]) -> List[Outcome]:
+        cls = FlakyBackend
+        first = items[0].pk
+        cls.calls[first] = cls.calls.get(first, 0) + 1
+        outcomes: List[Outcome] = []
+        for index, item in enumerate(items):
+            if cls.calls[first] == 1 and len(cls.calls) == 1 and index == 1:
+                outcomes.append(RuntimeError("invalid token"))
+                continue
+            if cls.calls[first] == 1 and len(cls.calls) == 2:
+                raise ConnectionError("gateway down")
+            cls.delivered.append(item.pk)
+            outcomes.append(True)
+        return outcomes
+
+
+class FailingBackend(BaseDeliveryBackend):
+    def send_batch(self, items: Sequence[Any]) -> List[Outcome]:
+        raise ConnectionError("gateway down")
+
+
+class TestDeliveryBackends(BaseModelTestCase):
+    def setUp(self) -> None:
+        super(TestDeliveryBackends, self).setUp()
+        outbox.clear()
+        RecordingBackend.batches = []
+        RecordingBackend.max_in_flight = 0
+        FlakyBackend.delivered = []
+        FlakyBackend.calls = {}
+
+    # =================================================================== #
+    # BACKEND TESTS ===================================================== #
+    # =================================================================== #
+
+    def test_default_backends(self) -> None:
+        self.assertIsInstance(get_delivery_backend("email"), EmailDeliveryBackend)
+        self.assertIsInstance(get_delivery_backend("push"), NullDeliveryBackend)
+        self.assertIsInstance(get_delivery_backend("basic"), NullDeliveryBackend)
+        with self.assertRaises(ValueError):
+            get_delivery_backend("sms")
+
+    def test_deliver_in_batches(self) -> None:
+        backend = RecordingBackend("push", BATCH_SIZE=2)
+        self.assertEqual(backend.deliver([1, 2, 3, 4, 5]), [True] * 5)
+        self.assertEqual(RecordingBackend.batches, [2, 2, 1])
+
+    def test_deliver_max_concurrency(self) -> None:
+        backend = RecordingBackend("push", BATCH_SIZE=1, MAX_CONCURRENCY=2)
+        threads = [
+            threading.Thread(target=backend.deliver, args=([1, 2],)) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(RecordingBackend.batches), 8)
+        self.assertLessEqual(RecordingBackend.max_in_flight, 2)
+
+    def test_file_backend(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "delivered.jsonl")
+            backend = FileDeliveryBackend("email", FILE_PATH=path)
+            message = EmailMessage("Subject", "Body", "from@example.com", ["to@e.com"])
+            self.assertEqual(backend.deliver([message]), [True])
+            with open(path, encoding="utf-8") as file:
+                lines = [json.loads(line) for line in file]
+        self.assertEqual(lines[0]["channel"], "email")
+        self.assertEqual(lines[0]["subject"], "Subject")
+        self.assertEqual(lines[0]["to"], ["to@e.com"])
+
+    # =================================================================== #
+    # CHANNEL TESTS ===================================================== #
+    # =================================================================== #
+
+    def test_email_through_backend(self) -> None:
+        messages = [
+            EmailMessage("Subject", "Body", "from@example.com", [self.base_email])
+            for _ in range(2)
+        ]
+        with self.settings(NOTIFICATIONS_DELIVERY_BACKENDS={"email": IN_MEMORY}):
+            self.assertEqual(send_message(messages[0]), 1)
+            self.assertEqual(send_messages_batch(messages[1:]), [True])
+        self.assertEqual(outbox["email"], messages)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_push_delivered_on_commit(self) -> None:
+        with self.settings(NOTIFICATIONS_DELIVERY_BACKENDS={"push": IN_MEMORY}):
+            with self.captureOnCommitCallbacks(execute=True):
+                notification = NotificationPush.objects.create(
+                    sender=self.base_email, recipients=self.base_email, message="Hi"
+                )
+                # nothing is delivered before the commit
+                self.assertEqual(outbox["push"], [])
+        self.assertEqual(outbox["push"], [notification])
+        notification.refresh_from_db()
+        self.assertTrue(notification.sent_successfully)
+        self.assertIsNotNone(notification.datetime_sent)
+
+    def test_bulk_notify_delivered_in_batches(self) -> None:
+        backends = {
+            "basic": {
+                "BACKEND": "django_dans_notifications.test.test_delivery.RecordingBackend",
+                "OPTIONS": {"BATCH_SIZE": 2},
+            }
+        }
+        with self.settings(NOTIFICATIONS_DELIVERY_BACKENDS=backends):
+            with self.captureOnCommitCallbacks(execute=True):
+                NotificationBasic.objects.bulk_notify(
+                    "Hi", ["a@example.com", "b@example.com", "c@example.com"], "s@e.com"
+                )
+        self.assertEqual(RecordingBackend.batches, [2, 1])
+        self.assertEqual(
+            NotificationBasic.objects.filter(sent_successfully=True).count(), 3
+        )
+
+    def test_null_backend_delivers_nothing(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            NotificationPush.objects.create(
+                sender=self.base_email, recipients=self.base_email, message="Hi"
+            )
+        self.assertEqual(callbacks, [])
+
+    def test_retries_only_undelivered(self) -> None:
+        backends = {
+            "basic": {
+                "BACKEND": "django_dans_notifications.test.test_delivery.FlakyBackend",
+                "OPTIONS": {"BATCH_SIZE": 2, "RETRY_DELAY": 0},
+            }
+        }
+        recipients = [f"user{i}@example.com" for i in range(4)]
+        with self.settings(NOTIFICATIONS_DELIVERY_BACKENDS=backends):
+            with self.assertLogs("django_dans_notifications", level="WARNING"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    NotificationBasic.objects.bulk_notify("Hi", recipients, "s@e.com")
+        pks = list(NotificationBasic.objects.values_list("pk", flat=True))
+        # each delivered once - the failed item and batch retried on their own
+        self.assertEqual(sorted(FlakyBackend.delivered), sorted(pks))
+        self.assertEqual(
+            NotificationBasic.objects.filter(sent_successfully=True).count(), 4
+        )
+
+    def test_undelivered_stays_unsent(self) -> None:
+        backends = {
+            "basic": {
+                "BACKEND": "django_dans_notifications.test.test_delivery.FlakyBackend",
+                "OPTIONS": {"BATCH_SIZE": 2, "MAX_RETRIES": 1},
+            }
+        }
+        recipients = [f"user{i}@example.com" for i in range(4)]
+        with self.settings(NOTIFICATIONS_DELIVERY_BACKENDS=backends):
+            with self.assertLogs("django_dans_notifications", level="WARNING"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    NotificationBasic.objects.bulk_notify("Hi", recipients, "s@e.com")
+        # no retries - only the first item got through
+        self.assertEqual(len(FlakyBackend.delivered), 1)
+        delivered = NotificationBasic.objects.get(sent_successfully=True)
+        self.assertEqual(delivered.pk, FlakyBackend.delivered[0])
+        self.assertIsNotNone(delivered.datetime_sent)
+        undelivered = NotificationBasic.objects.filter(sent_successfully=False)
+        self.assertEqual(undelivered.count(), 3)
+        self.assertFalse(undelivered.filter(datetime_sent__isnull=False).exists())
+
+    def test_channel_circuit_separate_from_email(self) -> None:
+        backends = {
+            "push": {
+                "BACKEND": "django_dans_notifications.test.test_delivery.FailingBackend",
+                "OPTIONS": {"MAX_RETRIES": 1, "CIRCUIT_FAILURE_THRESHOLD": 1},
+            }
+        }
+        with self.settings(NOTIFICATIONS_DELIVERY_BACKENDS=backends):
+            dispatcher = ChannelDispatcher("push", async_enabled=True)
+            with self.assertLogs("django_dans_notifications", level="ERROR"):
+                dispatcher.dispatch([Mock(pk=1)])
+                dispatcher.shutdown()
+        self.assertEqual(dispatcher.get_stats()["circuit"]["state"], "open")
+        # the email circuit isn't touched
+        self.assertEqual(EmailSender()._circuit.state, "closed")
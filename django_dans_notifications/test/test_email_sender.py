@@ -1,5 +1,8 @@
+import smtplib
 import unittest
+from typing import List
 from unittest.mock import Mock, patch
+import threading
 import time
 from concurrent.futures import Future
 import os
@@ -26,6 +29,8 @@ if not settings.configured:
         SECRET_KEY="test-secret-key",
     )
 
+from django.test import override_settings  # noqa: E402
+
 
 class TestEmailSender(unittest.TestCase):
     def setUp(self) -> None:
@@ -37,8 +42,23 @@ class TestEmailSender(unittest.TestCase):
         self.mock_settings.EMAIL_MAX_WORKERS = 3
         self.mock_settings.EMAIL_MAX_RETRIES = 3
         self.mock_settings.EMAIL_RETRY_DELAY = 0.01
+        self.mock_settings.EMAIL_RETRY_MAX_DELAY = 60.0
+        self.mock_settings.EMAIL_RETRY_BUDGET_RATIO = 0.2
+        self.mock_settings.EMAIL_RETRY_BUDGET_BURST = 20
         self.mock_settings.EMAIL_SYNC_MODE = True
         self.mock_settings.IN_TEST = False
+        self.mock_settings.EMAIL_CONNECTION_REUSE = True
+        self.mock_settings.EMAIL_CONNECTION_MAX_MESSAGES = 100
+        self.mock_settings.EMAIL_CONNECTION_IDLE_TIMEOUT = 30.0
+        self.mock_settings.EMAIL_BATCH_SIZE = 1
+        self.mock_settings.EMAIL_BATCH_LINGER = 0.01
+        self.mock_settings.EMAIL_QUEUE_SIZE = 0
+        self.mock_settings.EMAIL_QUEUE_FULL_POLICY = "block"
+        self.mock_settings.EMAIL_QUEUE_TIMEOUT = 10.0
+        self.mock_settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 5
+        self.mock_settings.EMAIL_CIRCUIT_RESET_TIMEOUT = 30.0
+        self.mock_settings.EMAIL_CIRCUIT_HALF_OPEN_MAX = 1
+        self.mock_settings.EMAIL_CIRCUIT_DEFERRED_SIZE = 1000
 
         # Import after patching
         from ..email_sender import EmailSender
@@ -175,6 +195,410 @@ class TestEmailSender(unittest.TestCase):
         sender.shutdown()
         self.assertIsNone(sender._executor)
 
+    def test_shutdown_closes_pooled_connections(self) -> None:
+        """Test that shutdown closes the connections kept by the pool."""
+        from ..email_sender import EmailSender, get_connection_pool, send_message
+
+        connection = Mock()
+        message = Mock()
+        message.send.return_value = 1
+        with patch(
+            "django_dans_notifications.email_sender.get_connection",
+            return_value=connection,
+        ):
+            EmailSender().send_with_retry(send_message, message)
+
+        self.assertEqual(len(get_connection_pool()), 1)
+        connection.close.assert_not_called()
+        EmailSender().shutdown()
+        connection.close.assert_called_once()
+        self.assertEqual(len(get_connection_pool()), 0)
+
+    def test_batching_coalesces_messages(self) -> None:
+        """Test that messages submitted together are sent as one batch."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_BATCH_SIZE = 3
+        self.mock_settings.EMAIL_BATCH_LINGER = 5.0
+
+        messages = [Mock(), Mock(), Mock()]
+        for message in messages:
+            message.send.return_value = 1
+        with patch(
+            "django_dans_notifications.email_sender.get_connection",
+            return_value=Mock(),
+        ) as mock_get_connection:
+            sender = EmailSender()
+            self.assertTrue(sender.batching_enabled)
+            futures = [sender.submit_message(message) for message in messages]
+            # batch is full - sent without waiting for the linger time
+            results = [future.result(timeout=2) for future in futures]
+            sender.shutdown()
+
+        self.assertEqual(results, [1, 1, 1])
+        mock_get_connection.assert_called_once()
+
+    def test_batching_per_message_outcome(self) -> None:
+        """Test that a failing message is retried alone and fails alone."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_BATCH_SIZE = 2
+        self.mock_settings.EMAIL_BATCH_LINGER = 5.0
+
+        sent, rejected = Mock(), Mock()
+        sent.send.return_value = 1
+        rejected.send.side_effect = Exception("Rejected")
+        with patch(
+            "django_dans_notifications.email_sender.get_connection",
+            return_value=Mock(),
+        ):
+            sender = EmailSender()
+            sent_future = sender.submit_message(sent)
+            rejected_future = sender.submit_message(rejected)
+            with self.assertRaises(Exception):
+                rejected_future.result(timeout=2)
+            sender.shutdown()
+
+        self.assertEqual(sent_future.result(), 1)
+        self.assertEqual(sent_future.attempts, 1)
+        self.assertEqual(rejected_future.attempts, 3)
+        sent.send.assert_called_once()
+
+    def test_batching_shutdown_sends_queued(self) -> None:
+        """Test that shutdown doesn't wait out the linger time or drop messages."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_BATCH_SIZE = 10
+        self.mock_settings.EMAIL_BATCH_LINGER = 60.0
+
+        message = Mock()
+        message.send.return_value = 1
+        with patch(
+            "django_dans_notifications.email_sender.get_connection",
+            return_value=Mock(),
+        ):
+            sender = EmailSender()
+            future = sender.submit_message(message)
+            sender.shutdown()
+
+        self.assertEqual(future.result(timeout=0), 1)
+
+    def test_submit_message_sync_mode(self) -> None:
+        """Test that messages are sent right away without batching."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_BATCH_SIZE = 10
+
+        message = Mock()
+        message.send.return_value = 1
+        with patch(
+            "django_dans_notifications.email_sender.get_connection",
+            return_value=Mock(),
+        ):
+            sender = EmailSender()
+            self.assertFalse(sender.batching_enabled)
+            future = sender.submit_message(message)
+
+        self.assertTrue(future.done())
+        self.assertEqual(future.result(), 1)
+        self.assertEqual(future.attempts, 1)
+
+    def test_queue_full_reject(self) -> None:
+        """Test that a full queue rejects new sends with 'reject'."""
+        from ..email_sender import EmailQueueFullError, EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_QUEUE_SIZE = 1
+        self.mock_settings.EMAIL_QUEUE_FULL_POLICY = "reject"
+
+        release = threading.Event()
+        sender = EmailSender()
+        future = sender.send_with_retry(release.wait, 2)
+        self.assertEqual(sender.get_stats()["pending_tasks"], 1)
+        with self.assertRaises(EmailQueueFullError):
+            sender.send_with_retry(lambda: "sent")
+
+        release.set()
+        future.result(timeout=2)
+        # slot is free again
+        self.assertEqual(
+            sender.send_with_retry(lambda: "sent").result(timeout=2), "sent"
+        )
+
+    def test_queue_full_block_times_out(self) -> None:
+        """Test that 'block' waits for a free slot, up to 'EMAIL_QUEUE_TIMEOUT'."""
+        from ..email_sender import EmailQueueFullError, EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_QUEUE_SIZE = 1
+        self.mock_settings.EMAIL_QUEUE_TIMEOUT = 0.05
+
+        release = threading.Event()
+        sender = EmailSender()
+        sender.send_with_retry(release.wait, 2)
+        start = time.time()
+        with self.assertRaises(EmailQueueFullError):
+            sender.send_with_retry(lambda: "sent")
+        self.assertGreaterEqual(time.time() - start, 0.05)
+        release.set()
+
+    def test_queue_full_block_waits(self) -> None:
+        """Test that 'block' sends once a slot frees up."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_QUEUE_SIZE = 1
+        self.mock_settings.EMAIL_QUEUE_TIMEOUT = 2.0
+
+        sender = EmailSender()
+        sender.send_with_retry(time.sleep, 0.05)
+        future = sender.send_with_retry(lambda: "sent")
+        self.assertEqual(future.result(timeout=2), "sent")
+
+    def test_invalid_queue_full_policy(self) -> None:
+        """Test that an unknown 'EMAIL_QUEUE_FULL_POLICY' is rejected."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_QUEUE_FULL_POLICY = "drop"
+        with self.assertRaises(ValueError):
+            EmailSender()
+
+    def test_async_retry_frees_worker(self) -> None:
+        """Test that a backing off send doesn't hold up other sends."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_MAX_WORKERS = 1
+        self.mock_settings.EMAIL_RETRY_DELAY = 0.5
+
+        failing = Mock(side_effect=[Exception("Temporary failure"), "retried"])
+        sender = EmailSender()
+        failing_future = sender.send_with_retry(failing)
+        healthy_future = sender.send_with_retry(lambda: "sent")
+
+        # the only worker is free while the failed send backs off
+        self.assertEqual(healthy_future.result(timeout=0.2), "sent")
+        self.assertFalse(failing_future.done())
+        self.assertEqual(failing_future.result(timeout=2), "retried")
+        self.assertEqual(failing.call_count, 2)
+
+    def test_async_paced_send_frees_worker(self) -> None:
+        """Test that a send waiting for its rate limit turn doesn't hold a worker."""
+        from ..email_sender import EmailSender
+        from ..rate_limit import RateLimitDeferred
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_MAX_WORKERS = 1
+
+        paced = Mock(side_effect=[RateLimitDeferred(0.5), "paced"])
+        sender = EmailSender()
+        paced_future = sender.send_with_retry(paced)
+        healthy_future = sender.send_with_retry(lambda: "sent")
+
+        self.assertEqual(healthy_future.result(timeout=0.2), "sent")
+        self.assertFalse(paced_future.done())
+        self.assertEqual(paced_future.result(timeout=2), "paced")
+        # waiting for its turn isn't a failure
+        self.assertEqual(sender.get_stats()["circuit"]["failures"], 0)
+        self.assertEqual(sender.get_stats()["retry_budget"], 20)
+
+    def test_async_paced_send_resumes_rest(self) -> None:
+        """Test that a partly sent, paced send is resumed with what's left."""
+        from ..email_sender import EmailSender
+        from ..rate_limit import RateLimitDeferred
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+
+        resume = Mock(return_value="rest sent")
+        paced = Mock(side_effect=RateLimitDeferred(0.05, resume=resume))
+        future = EmailSender().send_with_retry(paced)
+        self.assertEqual(future.result(timeout=2), "rest sent")
+        paced.assert_called_once()
+        resume.assert_called_once()
+
+    def test_async_retries_exhausted(self) -> None:
+        """Test that the last error is raised once all attempts failed."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+
+        failing = Mock(side_effect=Exception("Permanent failure"))
+        future = EmailSender().send_with_retry(failing)
+        with self.assertRaisesRegex(Exception, "Permanent failure"):
+            future.result(timeout=2)
+        self.assertEqual(failing.call_count, 3)
+
+    def test_retry_budget_exhausted(self) -> None:
+        """Test that failures aren't retried once the retry budget is spent."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_RETRY_BUDGET_RATIO = 0
+        self.mock_settings.EMAIL_RETRY_BUDGET_BURST = 1
+
+        failing = Mock(side_effect=Exception("Failure"))
+        sender = EmailSender()
+        with self.assertRaises(Exception):
+            sender.send_with_retry(failing).result(timeout=2)
+        # one retry in the budget
+        self.assertEqual(failing.call_count, 2)
+
+        with self.assertRaises(Exception):
+            sender.send_with_retry(failing).result(timeout=2)
+        self.assertEqual(failing.call_count, 3)
+
+    def test_backoff_jitter_and_cap(self) -> None:
+        """Test that the backoff is capped and jittered between half and full."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_RETRY_DELAY = 1.0
+        self.mock_settings.EMAIL_RETRY_MAX_DELAY = 4.0
+
+        sender = EmailSender()
+        self.assertEqual(sender._backoff(1, jitter=False), 2.0)
+        self.assertEqual(sender._backoff(10, jitter=False), 4.0)
+        for _ in range(20):
+            self.assertTrue(2.0 <= sender._backoff(10) <= 4.0)
+
+    def test_shutdown_runs_scheduled_retries(self) -> None:
+        """Test that shutdown retries backed off sends instead of dropping them."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_RETRY_DELAY = 60.0
+
+        failing = Mock(side_effect=[Exception("Temporary failure"), "retried"])
+        sender = EmailSender()
+        future = sender.send_with_retry(failing)
+        for _ in range(100):
+            if sender.get_stats()["scheduled_retries"]:
+                break
+            time.sleep(0.01)
+        self.assertEqual(sender.get_stats()["scheduled_retries"], 1)
+
+        sender.shutdown()
+        self.assertEqual(future.result(timeout=0), "retried")
+
+    def test_circuit_opens_and_defers(self) -> None:
+        """Test that sends are deferred, not attempted, once the circuit opens."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_MAX_RETRIES = 1
+        self.mock_settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 2
+
+        failing = Mock(side_effect=Exception("Connection refused"))
+        sender = EmailSender()
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                sender.send_with_retry(failing).result(timeout=2)
+
+        deferred = sender.send_with_retry(failing)
+        self.assertFalse(deferred.done())
+        self.assertEqual(failing.call_count, 2)
+        self.assertEqual(
+            sender.get_stats()["circuit"],
+            {"state": "open", "failures": 2, "deferred": 1},
+        )
+
+    def test_circuit_half_open_trial_closes(self) -> None:
+        """Test that a successful trial send closes the circuit and sends the rest."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_MAX_RETRIES = 1
+        self.mock_settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 1
+        self.mock_settings.EMAIL_CIRCUIT_RESET_TIMEOUT = 0.1
+
+        sender = EmailSender()
+        with self.assertRaises(Exception):
+            sender.send_with_retry(Mock(side_effect=Exception("Down"))).result(2)
+        futures = [sender.send_with_retry(lambda: "sent") for _ in range(3)]
+        self.assertEqual(sender.get_stats()["circuit"]["deferred"], 3)
+
+        # the first deferred send is the trial - the rest follow once it's through
+        self.assertEqual([future.result(timeout=2) for future in futures], ["sent"] * 3)
+        self.assertEqual(sender.get_stats()["circuit"]["state"], "closed")
+
+    def test_circuit_failed_trial_reopens(self) -> None:
+        """Test that a failed trial send opens the circuit again."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_MAX_RETRIES = 1
+        self.mock_settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 1
+        self.mock_settings.EMAIL_CIRCUIT_RESET_TIMEOUT = 0.1
+
+        failing = Mock(side_effect=Exception("Down"))
+        sender = EmailSender()
+        with self.assertRaises(Exception):
+            sender.send_with_retry(failing).result(timeout=2)
+        trial = sender.send_with_retry(failing)
+        waiting = sender.send_with_retry(failing)
+
+        with self.assertRaises(Exception):
+            trial.result(timeout=2)
+        self.assertEqual(failing.call_count, 2)
+        self.assertFalse(waiting.done())
+        self.assertEqual(sender.get_stats()["circuit"]["state"], "open")
+
+    def test_circuit_refused_trial_settles(self) -> None:
+        """Test that a trial refused by the server doesn't leave it half-open."""
+        from ..email_sender import EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_MAX_RETRIES = 1
+        self.mock_settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 1
+        self.mock_settings.EMAIL_CIRCUIT_RESET_TIMEOUT = 0.1
+
+        refused = smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No")})
+        sender = EmailSender()
+        with self.assertRaises(Exception):
+            sender.send_with_retry(Mock(side_effect=Exception("Down"))).result(2)
+        trial = sender.send_with_retry(Mock(side_effect=refused))
+        waiting = sender.send_with_retry(lambda: "sent")
+
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            trial.result(timeout=2)
+        # the next deferred send takes the trial's place and closes the circuit
+        self.assertEqual(waiting.result(timeout=2), "sent")
+        self.assertEqual(sender.get_stats()["circuit"]["state"], "closed")
+
+    def test_circuit_deferred_full(self) -> None:
+        """Test that sends fail fast once the deferred queue is full."""
+        from ..email_sender import CircuitOpenError, EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_MAX_RETRIES = 1
+        self.mock_settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 1
+        self.mock_settings.EMAIL_CIRCUIT_DEFERRED_SIZE = 1
+
+        sender = EmailSender()
+        with self.assertRaises(Exception):
+            sender.send_with_retry(Mock(side_effect=Exception("Down"))).result(2)
+        sender.send_with_retry(lambda: "sent")
+        with self.assertRaises(CircuitOpenError):
+            sender.send_with_retry(lambda: "sent").result(timeout=0)
+
+    def test_shutdown_fails_deferred_sends(self) -> None:
+        """Test that shutdown doesn't wait on an open circuit."""
+        from ..email_sender import CircuitOpenError, EmailSender
+
+        self.mock_settings.EMAIL_SYNC_MODE = False
+        self.mock_settings.EMAIL_MAX_RETRIES = 1
+        self.mock_settings.EMAIL_CIRCUIT_FAILURE_THRESHOLD = 1
+
+        sender = EmailSender()
+        with self.assertRaises(Exception):
+            sender.send_with_retry(Mock(side_effect=Exception("Down"))).result(2)
+        deferred = sender.send_with_retry(lambda: "sent")
+        sender.shutdown()
+        with self.assertRaises(CircuitOpenError):
+            deferred.result(timeout=0)
+
     def test_get_stats_sync_mode(self) -> None:
         """Test stats in synchronous mode."""
         from ..email_sender import EmailSender
@@ -268,5 +692,219 @@ class TestEmailSender(unittest.TestCase):
         self.assertGreater(delay2, delay1)
 
 
+class TestSendMessagesBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        from ..email_sender import get_connection_pool
+
+        self.pool = get_connection_pool()
+        self.pool.close_all()
+
+    def tearDown(self) -> None:
+        self.pool.close_all()
+
+    def test_send_messages_batch_single_connection(self) -> None:
+        """Test that all messages are sent over one connection, kept open."""
+        from ..email_sender import send_messages_batch
+
+        connection = Mock()
+        messages = [Mock(), Mock(), Mock()]
+        for message in messages:
+            message.send.return_value = 1
+
+        with patch(
+            "django_dans_notifications.email_sender.get_connection",
+            return_value=connection,
+        ) as mock_get_connection:
+            results = send_messages_batch(messages)
+
+        self.assertEqual(results, [True, True, True])
+        mock_get_connection.assert_called_once()
+        connection.open.assert_called_once()
+        # kept open for the next batch
+        connection.close.assert_not_called()
+        for message in messages:
+            self.assertIs(message.connection, connection)
+
+    def test_send_messages_batch_per_message_failure(self) -> None:
+        """Test that one failing message doesn't fail the batch."""
+        from ..email_sender import send_messages_batch
+
+        connection = Mock()
+        messages = [Mock(), Mock(), Mock()]
+        messages[0].send.return_value = 1
+        messages[1].send.side_effect = Exception("Rejected")
+        messages[2].send.return_value = 1
+
+        with patch(
+            "django_dans_notifications.email_sender.get_connection",
+            return_value=connection,
+        ):
+            results = send_messages_batch(messages)
+
+        self.assertEqual(results, [True, False, True])
+        # reconnected after the failure
+        self.assertEqual(connection.open.call_count, 2)
+        connection.close.assert_called_once()
+
+    def test_send_messages_batch_connection_failure_raises(self) -> None:
+        """Test that failing to connect raises so the batch can be retried."""
+        from ..email_sender import send_messages_batch
+
+        connection = Mock()
+        connection.open.side_effect = Exception("Connection refused")
+
+        with patch(
+            "django_dans_notifications.email_sender.get_connection",
+            return_value=connection,
+        ):
+            with self.assertRaises(Exception):
+                send_messages_batch([Mock()])
+
+
+class TestRetryScheduler(unittest.TestCase):
+    def test_runs_in_due_order(self) -> None:
+        """Test that callbacks run after their delay, earliest first."""
+        from ..email_sender import RetryScheduler
+
+        scheduler = RetryScheduler()
+        ran: List[str] = []
+        done = threading.Event()
+
+        def later() -> None:
+            ran.append("later")
+            done.set()
+
+        scheduler.schedule(0.1, later)
+        scheduler.schedule(0.01, lambda: ran.append("sooner"))
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(ran, ["sooner", "later"])
+        self.assertEqual(len(scheduler), 0)
+
+    def test_run_pending(self) -> None:
+        """Test that 'run_pending' runs callbacks without waiting."""
+        from ..email_sender import RetryScheduler
+
+        scheduler = RetryScheduler()
+        ran: List[int] = []
+        scheduler.schedule(60, lambda: ran.append(2))
+        scheduler.schedule(30, lambda: ran.append(1))
+        scheduler.run_pending()
+
+        self.assertEqual(ran, [1, 2])
+        self.assertEqual(len(scheduler), 0)
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        from ..email_sender import ConnectionPool
+
+        self.pool = ConnectionPool()
+        self.connections: List[Mock] = []
+
+        def new_connection() -> Mock:
+            connection = Mock()
+            self.connections.append(connection)
+            return connection
+
+        self.patcher = patch(
+            "django_dans_notifications.email_sender.get_connection",
+            side_effect=new_connection,
+        )
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        self.pool.close_all()
+        self.patcher.stop()
+
+    def test_reuses_connection(self) -> None:
+        """Test that a thread keeps reusing its connection."""
+        first = self.pool.acquire()
+        self.pool.release()
+        second = self.pool.acquire()
+        self.pool.release()
+
+        self.assertIs(first, second)
+        self.assertEqual(len(self.connections), 1)
+        first.open.assert_called_once()
+
+    def test_connection_per_thread(self) -> None:
+        """Test that every thread gets its own connection."""
+        import threading
+
+        acquired: List[object] = []
+
+        def worker() -> None:
+            acquired.append(self.pool.acquire())
+            self.pool.release()
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIsNot(acquired[0], acquired[1])
+        self.assertEqual(len(self.pool), 2)
+
+    def test_max_messages_reconnects(self) -> None:
+        """Test that a connection is closed after 'EMAIL_CONNECTION_MAX_MESSAGES'."""
+        with override_settings(EMAIL_CONNECTION_MAX_MESSAGES=2):
+            first = self.pool.acquire()
+            self.pool.release()
+            self.pool.acquire()
+            self.pool.release()
+            first.close.assert_called_once()
+            second = self.pool.acquire()
+
+        self.assertIsNot(first, second)
+
+    def test_no_reuse(self) -> None:
+        """Test that 'EMAIL_CONNECTION_REUSE = False' closes after every message."""
+        with override_settings(EMAIL_CONNECTION_REUSE=False):
+            first = self.pool.acquire()
+            self.pool.release()
+            first.close.assert_called_once()
+            self.assertIsNot(self.pool.acquire(), first)
+
+    def test_idle_timeout_reconnects(self) -> None:
+        """Test that a connection idle for too long is replaced."""
+        first = self.pool.acquire()
+        self.pool.release()
+        self.pool._local.pooled.last_used -= 60
+
+        second = self.pool.acquire()
+        self.assertIsNot(first, second)
+        first.close.assert_called_once()
+
+    def test_failed_health_check_reconnects(self) -> None:
+        """Test that an idle SMTP connection failing NOOP is replaced."""
+        first = self.pool.acquire()
+        self.pool.release()
+        first.connection.noop.return_value = (421, b"closing")
+        self.pool._local.pooled.last_used -= 5
+
+        second = self.pool.acquire()
+        self.assertIsNot(first, second)
+
+    def test_passed_health_check_reuses(self) -> None:
+        """Test that an idle SMTP connection passing NOOP is reused."""
+        first = self.pool.acquire()
+        self.pool.release()
+        first.connection.noop.return_value = (250, b"OK")
+        self.pool._local.pooled.last_used -= 5
+
+        self.assertIs(self.pool.acquire(), first)
+
+    def test_close_all(self) -> None:
+        """Test that closed connections aren't handed out again."""
+        first = self.pool.acquire()
+        self.pool.release()
+        self.pool.close_all()
+
+        first.close.assert_called_once()
+        self.assertIsNot(self.pool.acquire(), first)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,9 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
 from .model_tests.base import BaseModelTestCase
+from ..models.counters import NotificationUnreadCount
 from ..models.notifications import (
     NotificationEmail,
     NotificationEmailTemplate,
@@ -61,6 +66,29 @@ class TestNotificationManager(BaseModelTestCase):
         self.assertIn(self.notification_basic, notifications["basic"])
         self.assertIn(self.notification_push, notifications["push"])
 
+    def test_get_notifications_exact_match_only(self) -> None:
+        notification = NotificationBasic.objects.create(
+            recipients=f"x{self.base_email}", sender="x", message="Basic Message"
+        )
+        notifications = self.manager.get_notifications_basic(self.base_email)
+        self.assertNotIn(notification, notifications)
+        self.assertIn(self.notification_basic, notifications)
+
+    def test_get_notifications_sender_case_insensitive(self) -> None:
+        sent = NotificationPush.objects.create(
+            recipients="someone@else.com", sender="Sender@Email.com", message="Hi"
+        )
+        bulk = NotificationPush.objects.bulk_notify(
+            "Hi", ["other@else.com"], sender=" SENDER@email.com"
+        )
+        self.assertEqual(bulk, 1)
+        notifications = self.manager.get_notifications_push("sender@EMAIL.com")
+        self.assertIn(sent, notifications)
+        self.assertEqual(notifications.count(), 2)
+        # stored as given
+        sent.refresh_from_db()
+        self.assertEqual(sent.sender, "Sender@Email.com")
+
     # =================================================================== #
     # UPDATE TESTS ====================================================== #
     # =================================================================== #
@@ -72,7 +100,51 @@ class TestNotificationManager(BaseModelTestCase):
 
     def test_mark_notification_basic_unread(self) -> None:
         self.notification_basic.read = True
-        self.notification_basic.save()  # type: ignore[no-untyped-call]
+        self.notification_basic.save()
         self.manager.mark_notification_basic_read(self.notification_basic, read=False)
         self.notification_basic.refresh_from_db()
         self.assertFalse(self.notification_basic.read)
+
+    def test_mark_notifications_basic_read(self) -> None:
+        other = NotificationBasic.objects.create(
+            recipients=self.base_email, sender="x", message="Other"
+        )
+        not_recp = NotificationBasic.objects.create(
+            recipients="someone@else.com", sender="x", message="Not Recp"
+        )
+        updated = self.manager.mark_notifications_basic_read(self.base_email)
+        self.assertEqual(updated, 2)
+        self.assertEqual(
+            NotificationUnreadCount.objects.unread_count([self.base_email]), 0
+        )
+        self.assertEqual(
+            NotificationUnreadCount.objects.unread_count(["someone@else.com"]), 1
+        )
+        self.assertTrue(NotificationBasic.objects.get(pk=other.pk).read)
+        self.assertFalse(NotificationBasic.objects.get(pk=not_recp.pk).read)
+
+        # already read rows aren't touched again
+        self.assertEqual(self.manager.mark_notifications_basic_read(self.base_email), 0)
+
+    def test_mark_notifications_basic_read_ids_and_before(self) -> None:
+        other = NotificationBasic.objects.create(
+            recipients=self.base_email, sender="x", message="Other"
+        )
+        updated = self.manager.mark_notifications_basic_read(
+            self.base_email, ids=[other.pk]
+        )
+        self.assertEqual(updated, 1)
+        self.notification_basic.refresh_from_db()
+        self.assertFalse(self.notification_basic.read)
+
+        updated = self.manager.mark_notifications_basic_read(
+            self.base_email, before=timezone.now() - timedelta(days=1)
+        )
+        self.assertEqual(updated, 0)
+
+        updated = self.manager.mark_notifications_basic_read(
+            self.base_email, before=timezone.now(), read=False
+        )
+        self.assertEqual(updated, 1)
+        other.refresh_from_db()
+        self.assertFalse(other.read)
@@ -0,0 +1,213 @@
+import time
+from functools import partial
+from typing import Any, List
+from unittest.mock import Mock, patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.mail import EmailMessage
+from django.test import TestCase
+
+from ..email_sender import _worker, send_messages_batch_errors, send_messages_pooled
+from ..rate_limit import (
+    RateLimitDeferred,
+    RateLimiter,
+    SharedWindowLimiter,
+    TokenBucket,
+    get_domain,
+    get_rate_limiter,
+)
+
+"""
+# ========================================================================= #
+# TEST RATE LIMITING ====================================================== #
+# ========================================================================= #
+"""
+
+
+class TestRateLimit(TestCase):
+    # =================================================================== #
+    # TOKEN BUCKET TESTS ================================================ #
+    # =================================================================== #
+
+    def test_token_bucket_burst_then_paced(self) -> None:
+        bucket = TokenBucket(rate=10, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        # reservations queue up - each waits one more token
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_get_domain(self) -> None:
+        self.assertEqual(get_domain("Someone <Someone@Example.COM>"), "example.com")
+        self.assertEqual(get_domain("someone@gmail.com"), "gmail.com")
+
+    # =================================================================== #
+    # RATE LIMITER TESTS ================================================ #
+    # =================================================================== #
+
+    def test_disabled_by_default(self) -> None:
+        limiter = get_rate_limiter()
+        self.assertFalse(limiter.enabled)
+        self.assertEqual(limiter.reserve(["a@example.com"] * 100), 0)
+
+    def test_per_domain_limits(self) -> None:
+        limiter = RateLimiter(domain_rates={"gmail.com": 10, "*": 1}, burst=0.1)
+        self.assertEqual(limiter.reserve(["a@gmail.com"]), 0)
+        self.assertEqual(limiter.reserve(["a@example.com"]), 0)
+        self.assertAlmostEqual(limiter.reserve(["b@gmail.com"]), 0.1, places=2)
+        # other domains get their own bucket with the "*" rate
+        self.assertAlmostEqual(limiter.reserve(["b@example.com"]), 1.0, places=2)
+        self.assertEqual(limiter.reserve(["a@other.com"]), 0)
+        self.assertAlmostEqual(limiter.waited, 1.1, places=2)
+
+    def test_reserve_message_once(self) -> None:
+        limiter = RateLimiter(rate=10, burst=0.1)
+        first, second = [
+            EmailMessage("Subject", "Body", "from@example.com", [to])
+            for to in ["a@gmail.com", "b@gmail.com"]
+        ]
+        self.assertEqual(limiter.reserve_message(first), 0)
+        self.assertAlmostEqual(limiter.reserve_message(second), 0.1, places=2)
+        # asking again waits out the same reservation
+        self.assertLessEqual(limiter.reserve_message(second), 0.1)
+        self.assertAlmostEqual(limiter.waited, 0.1, places=2)
+        limiter.release_message(second)
+        self.assertAlmostEqual(limiter.reserve_message(second), 0.2, places=2)
+
+    def test_global_limit_applies_to_every_domain(self) -> None:
+        limiter = RateLimiter(rate=10, burst=0.1)
+        self.assertEqual(limiter.reserve(["a@gmail.com"]), 0)
+        self.assertAlmostEqual(limiter.reserve(["a@example.com"]), 0.1, places=2)
+
+    def test_invalid_rate(self) -> None:
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(domain_rates={"gmail.com": -1})
+
+    def test_settings_change_resets_limiter(self) -> None:
+        with self.settings(EMAIL_RATE_LIMIT=5):
+            self.assertEqual(get_rate_limiter().rate, 5)
+        self.assertIsNone(get_rate_limiter().rate)
+
+    # =================================================================== #
+    # SHARED LIMIT TESTS ================================================ #
+    # =================================================================== #
+
+    def test_shared_limit_between_limiters(self) -> None:
+        cache = LocMemCache("rate-limit-test", {})
+        # two processes sharing one limit of 2 per second
+        first = RateLimiter(rate=2, cache=cache)
+        second = RateLimiter(rate=2, cache=cache)
+        with patch("django_dans_notifications.rate_limit.time.time", return_value=10.5):
+            self.assertEqual(first.reserve(["a@example.com"]), 0)
+            self.assertEqual(second.reserve(["a@example.com"]), 0)
+            # window full - reserved in the next one
+            self.assertAlmostEqual(first.reserve(["a@example.com"]), 0.5)
+
+    def test_shared_limit_backlog_stays_paced(self) -> None:
+        cache = LocMemCache("rate-limit-backlog", {})
+        self.addCleanup(cache.clear)
+        limiter = SharedWindowLimiter(cache, "gmail.com", 5)
+        with patch("django_dans_notifications.rate_limit.time.time", return_value=10):
+            waits = [limiter.reserve() for _ in range(500)]
+            # 5 per window, far past the windows walked per send
+            self.assertEqual(waits, [float(i // 5) for i in range(500)])
+            with patch.object(cache, "incr", wraps=cache.incr) as incr:
+                self.assertEqual(limiter.reserve(), 100)
+            # the frontier saves walking the backlog
+            self.assertEqual(incr.call_count, 1)
+            # without it the send still waits, in the last window walked
+            cache.delete("django_dans_notifications:rate_limit:gmail.com:frontier")
+            self.assertEqual(limiter.reserve(), 59)
+
+    def test_shared_limit_slow_rate(self) -> None:
+        limiter = SharedWindowLimiter(
+            LocMemCache("rate-limit-test", {}), "gmail.com", 0.5
+        )
+        with patch("django_dans_notifications.rate_limit.time.time", return_value=10):
+            self.assertEqual(limiter.reserve(), 0)
+            self.assertEqual(limiter.reserve(), 2)
+
+    def test_shared_limit_cache_down(self) -> None:
+        cache = Mock()
+        cache.add.side_effect = ConnectionError("Cache down")
+        limiter = RateLimiter(rate=1, cache=cache)
+        # not paced rather than not sent
+        self.assertEqual(limiter.reserve(["a@example.com"]), 0)
+        self.assertEqual(limiter.reserve(["a@example.com"]), 0)
+
+    # =================================================================== #
+    # SENDING TESTS ===================================================== #
+    # =================================================================== #
+
+    def test_send_messages_pooled_paced(self) -> None:
+        messages = [
+            EmailMessage("Subject", "Body", "from@example.com", [to])
+            for to in ["a@gmail.com", "b@gmail.com", "a@example.com"]
+        ]
+        sleeps: Any = []
+        with self.settings(
+            EMAIL_RATE_LIMIT_PER_DOMAIN={"gmail.com": 10}, EMAIL_RATE_LIMIT_BURST=0.1
+        ), patch(
+            "django_dans_notifications.rate_limit.time.sleep", side_effect=sleeps.append
+        ):
+            self.assertEqual(send_messages_pooled(messages), [1, 1, 1])
+        # only the second gmail.com message waited
+        self.assertEqual(len(sleeps), 1)
+        self.assertAlmostEqual(sleeps[0], 0.1, places=2)
+
+    def test_send_messages_pooled_deferred_in_worker(self) -> None:
+        first, second, other = [
+            EmailMessage("Subject", "Body", "from@example.com", [to])
+            for to in ["a@gmail.com", "b@gmail.com", "a@example.com"]
+        ]
+        _worker.defer_pacing = True
+        self.addCleanup(setattr, _worker, "defer_pacing", False)
+        with self.settings(
+            EMAIL_RATE_LIMIT_PER_DOMAIN={"gmail.com": 10}, EMAIL_RATE_LIMIT_BURST=0.1
+        ), patch("django_dans_notifications.rate_limit.time.sleep") as sleep:
+            # the ones whose turn has come go out, the other is left for the worker
+            # to re-queue instead of sleeping in it
+            outcomes = send_messages_pooled([first, second, other])
+            self.assertEqual(outcomes[0::2], [1, 1])
+            self.assertIsInstance(outcomes[1], RateLimitDeferred)
+            self.assertAlmostEqual(outcomes[1].delay, 0.1, places=2)  # type: ignore
+            with patch(
+                "django_dans_notifications.rate_limit.time.monotonic",
+                return_value=time.monotonic() + 1,
+            ):
+                self.assertEqual(send_messages_pooled([second]), [1])
+        sleep.assert_not_called()
+
+    def test_paced_batch_spread_out(self) -> None:
+        messages = [
+            EmailMessage("Subject", "Body", "from@example.com", [f"{i}@gmail.com"])
+            for i in range(20)
+        ]
+        sent: List[float] = []
+
+        def record(*args: Any) -> int:
+            sent.append(time.monotonic())
+            return 1
+
+        _worker.defer_pacing = True
+        self.addCleanup(setattr, _worker, "defer_pacing", False)
+        send: Any = partial(send_messages_batch_errors, messages)
+        start = time.monotonic()
+        with self.settings(EMAIL_RATE_LIMIT=20, EMAIL_RATE_LIMIT_BURST=0.1), patch(
+            "django.core.mail.EmailMessage.send",
+            side_effect=record,
+        ):
+            while True:  # like the EmailSender, re-queued until the rest is due
+                try:
+                    errors = send()
+                    break
+                except RateLimitDeferred as e:
+                    time.sleep(e.delay)
+                    send = e.resume
+        self.assertEqual(errors, [None] * 20)
+        # 2 at once (the burst), then one every 1/20s - not all at the end
+        for index, sent_at in enumerate(sent):
+            self.assertGreaterEqual(sent_at - start, (index - 1) / 20 - 0.01)
+        self.assertGreater(sent[-1] - sent[2], 0.7)
@@ -0,0 +1,419 @@
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List
+from unittest.mock import Mock, patch
+
+from django.conf import settings
+from django.template import TemplateSyntaxError
+from django.template.loader import render_to_string
+from django.template.loaders.base import Loader
+from django.test import TestCase
+
+from .model_tests.base import BaseModelTestCase
+from ..caches import LRUCache
+from ..models.notifications import NotificationEmail, NotificationEmailTemplate
+from ..rendering import (
+    get_compiled_template,
+    get_render_memo_stats,
+    get_render_pool,
+    html_to_text,
+    render_email_chunks,
+    render_emails,
+    render_memoized,
+    render_template,
+    render_template_many,
+)
+
+"""
+# ========================================================================= #
+# TEST EMAIL RENDERING ==================================================== #
+# ========================================================================= #
+"""
+
+DEFAULT_TEMPLATE = "django-dans-emails/default.html"
+
+
+class TestCompiledTemplateCache(TestCase):
+    def templates(self, directory: str) -> List[Dict[str, Any]]:
+        return [{**settings.TEMPLATES[0], "DIRS": [directory]}]
+
+    def test_renders_like_render_to_string(self) -> None:
+        context = {"team_name": "Team <Dan>"}
+        self.assertEqual(
+            render_template(DEFAULT_TEMPLATE, context),
+            render_to_string(DEFAULT_TEMPLATE, context),
+        )
+
+    def test_known_template_skips_loaders(self) -> None:
+        render_template(DEFAULT_TEMPLATE, {})
+        with patch.object(
+            Loader, "get_template", autospec=True, side_effect=Loader.get_template
+        ) as get_template:
+            render_template(DEFAULT_TEMPLATE, {"team_name": "Team"})
+            # nor for the '{% extends %}' parent
+            get_template.assert_not_called()
+        self.assertIs(
+            get_compiled_template(DEFAULT_TEMPLATE),
+            get_compiled_template(DEFAULT_TEMPLATE),
+        )
+
+    def test_debug_reloads_changed_template(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "changing.html")
+            with open(path, "w") as file:
+                file.write("before {{ name }}")
+            with self.settings(TEMPLATES=self.templates(directory), DEBUG=True):
+                self.assertEqual(
+                    render_template("changing.html", {"name": "a"}), "before a"
+                )
+                with open(path, "w") as file:
+                    file.write("after {{ name }}")
+                mtime = os.stat(path).st_mtime + 10
+                os.utime(path, (mtime, mtime))
+                self.assertEqual(
+                    render_template("changing.html", {"name": "a"}), "after a"
+                )
+
+    def test_no_reload_without_debug(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "changing.html")
+            with open(path, "w") as file:
+                file.write("before")
+            with self.settings(TEMPLATES=self.templates(directory)):
+                self.assertEqual(render_template("changing.html", {}), "before")
+                with open(path, "w") as file:
+                    file.write("after")
+                self.assertEqual(render_template("changing.html", {}), "before")
+
+    def test_disabled(self) -> None:
+        with self.settings(EMAIL_COMPILED_TEMPLATE_CACHE_SIZE=0), patch(
+            "django_dans_notifications.rendering.render_to_string",
+            return_value="rendered",
+        ) as mock_render:
+            self.assertEqual(render_template(DEFAULT_TEMPLATE, {}), "rendered")
+        mock_render.assert_called_once_with(DEFAULT_TEMPLATE, {})
+
+
+class TestRenderMemo(BaseModelTestCase):
+    def test_memo_disabled_by_default(self) -> None:
+        render = Mock(return_value="html")
+        render_memoized(DEFAULT_TEMPLATE, {}, render)
+        render_memoized(DEFAULT_TEMPLATE, {}, render)
+        self.assertEqual(render.call_count, 2)
+
+    def test_identical_context_reused(self) -> None:
+        render = Mock(return_value="html")
+        with self.settings(EMAIL_RENDER_MEMO_SIZE=10):
+            render_memoized(DEFAULT_TEMPLATE, {"a": 1, "b": [1, 2]}, render)
+            # key order doesn't matter
+            render_memoized(DEFAULT_TEMPLATE, {"b": [1, 2], "a": 1}, render)
+            render_memoized(DEFAULT_TEMPLATE, {"a": 2, "b": [1, 2]}, render)
+            render_memoized("django-dans-emails/empty.html", {"a": 1}, render)
+            stats = get_render_memo_stats()
+        self.assertEqual(render.call_count, 3)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["size"], 3)
+
+    def test_unserializable_context_not_memoized(self) -> None:
+        render = Mock(return_value="html")
+        with self.settings(EMAIL_RENDER_MEMO_SIZE=10):
+            render_memoized(DEFAULT_TEMPLATE, {"user": object()}, render)
+            render_memoized(DEFAULT_TEMPLATE, {"user": object()}, render)
+        self.assertEqual(render.call_count, 2)
+
+    def test_lru_cache_timeout(self) -> None:
+        cache = LRUCache(10, timeout=60)
+        cache.set("key", "value")
+        self.assertEqual(cache.get("key"), "value")
+        with patch(
+            "django_dans_notifications.caches.time.monotonic",
+            return_value=time.monotonic() + 61,
+        ):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_send_email_and_get_content_reuse_render(self) -> None:
+        with self.settings(EMAIL_RENDER_MEMO_SIZE=10, EMAIL_CONTENT_MODE="lazy"):
+            with patch.object(
+                NotificationEmailTemplate,
+                "_render",
+                autospec=True,
+                return_value="<p>Hi</p>",
+            ) as render:
+                for _ in range(3):
+                    notification = NotificationEmail.objects.send_email(
+                        "Subject",
+                        template=DEFAULT_TEMPLATE,
+                        recipients=self.base_email,
+                        context={"name": "Dan"},
+                    )
+                content = notification.get_content()
+        self.assertEqual(content, "<p>Hi</p>")
+        render.assert_called_once()
+
+
+class TestBroadcastRendering(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        override = self.settings(
+            TEMPLATES=[{**settings.TEMPLATES[0], "DIRS": [self.directory.name]}]
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def template(self, source: str) -> str:
+        with open(os.path.join(self.directory.name, "broadcast.html"), "w") as file:
+            file.write(
+                '{% extends "django-dans-emails/base.html" %}'
+                "{% block content %}" + source + "{% endblock %}"
+            )
+        return "broadcast.html"
+
+    def render_many(self, path: str, contexts: List[Dict[str, Any]]) -> Mock:
+        """
+        Render in two phases (if possible) - returns the mock of full renders.
+        """
+        with patch(
+            "django_dans_notifications.rendering.render_template",
+            side_effect=render_template,
+        ) as full_render:
+            rendered = render_template_many(path, contexts)
+        self.assertEqual(rendered, [render_template(path, c) for c in contexts])
+        return full_render
+
+    def test_slots_filled_per_recipient(self) -> None:
+        path = self.template("Hi {{ name }}, you have {{ count }} <b>{{ name }}</b>")
+        contexts: List[Dict[str, Any]] = [
+            {"team_name": "Team", "name": "<Dan & Co>", "count": 1},
+            {"team_name": "Team", "name": "Ann", "count": 2.5},
+            {"team_name": "Team", "name": "Bob", "count": None},
+        ]
+        self.render_many(path, contexts).assert_not_called()
+
+    def test_identical_contexts(self) -> None:
+        path = self.template("Hi {{ name }}")
+        self.render_many(path, [{"name": "Dan"}] * 3).assert_not_called()
+
+    def test_varying_variable_not_plain(self) -> None:
+        # filters, conditions and loops need the full render
+        for source in [
+            "{{ name|upper }}",
+            "{% if name %}{{ name }}{% endif %}",
+            "{% for name in names %}{{ name }}{% endfor %}",
+        ]:
+            path = self.template(source)
+            contexts = [{"name": "Dan", "names": []}, {"name": "", "names": []}]
+            self.assertEqual(self.render_many(path, contexts).call_count, 2)
+
+    def test_unknown_tag(self) -> None:
+        path = self.template("{% autoescape off %}{{ name }}{% endautoescape %}")
+        contexts = [{"name": "<b>Dan</b>"}, {"name": "<i>Ann</i>"}]
+        self.assertEqual(self.render_many(path, contexts).call_count, 2)
+
+    def test_relative_extends(self) -> None:
+        os.makedirs(os.path.join(self.directory.name, "emails"))
+        for name, source in [
+            ("base.html", "<p>{% block content %}{% endblock %}</p>"),
+            (
+                "child.html",
+                '{% extends "./base.html" %}{% block content %}Hi {{ name }}{% endblock %}',
+            ),
+        ]:
+            with open(os.path.join(self.directory.name, "emails", name), "w") as file:
+                file.write(source)
+        contexts = [{"name": "Dan"}, {"name": "Ann"}]
+        self.render_many("emails/child.html", contexts).assert_not_called()
+
+    def test_analysis_error_renders_in_full(self) -> None:
+        path = self.template("Hi {{ name }}")
+        contexts = [{"name": "Dan"}, {"name": "Ann"}]
+        with patch(
+            "django_dans_notifications.rendering._analyze_template",
+            side_effect=TemplateSyntaxError("Bad template"),
+        ), self.assertLogs("django_dans_notifications", level="WARNING"):
+            # the template itself, not the default one
+            self.assertEqual(self.render_many(path, contexts).call_count, 2)
+
+    def test_missing_or_complex_value(self) -> None:
+        path = self.template("Hi {{ name }}")
+        contexts: List[Dict[str, Any]] = [
+            {"name": "Dan"},
+            {},
+            {"name": ["Ann", "Bob"]},
+            {"name": "Bob"},
+        ]
+        # only the odd ones out are rendered in full
+        self.assertEqual(self.render_many(path, contexts).call_count, 2)
+
+    def test_send_email_bulk(self) -> None:
+        path = self.template("Hi {{ name }}")
+        results = list(
+            NotificationEmail.objects.send_email_bulk(
+                [(f"user{i}@example.com", {"name": f"User {i}"}) for i in range(3)],
+                template=path,
+            )
+        )
+        for i, (notification, _) in enumerate(results):
+            self.assertIn(f"Hi User {i}", notification.get_content())
+
+
+class TestHtmlToText(TestCase):
+    def test_drops_head_style_and_script(self) -> None:
+        html = (
+            "<html><head><title>Title</title><style>p { color: red; }</style></head>"
+            "<body><script>alert(1)</script><p>Hello</p></body></html>"
+        )
+        self.assertEqual(html_to_text(html), "Hello")
+
+    def test_line_breaks(self) -> None:
+        html = "<h1>Title</h1><p>One<br>Two<br/>Three</p><ul><li>A</li><li>B</li></ul>"
+        self.assertEqual(html_to_text(html), "Title\n\nOne\nTwo\nThree\n\n- A\n- B")
+
+    def test_whitespace_collapsed(self) -> None:
+        html = "<table>\n\t<tr>\n\t\t<td>  Hello\n   world  </td>\n\t</tr>\n</table>"
+        self.assertEqual(html_to_text(html), "Hello world")
+
+    def test_links(self) -> None:
+        html = (
+            '<a href="https://example.com/reset">Reset</a> '
+            '<a href="mailto:dan@example.com">dan@example.com</a> '
+            '<a href="https://example.com">https://example.com</a> '
+            '<a href="#top">Top</a>'
+        )
+        self.assertEqual(
+            html_to_text(html),
+            "Reset (https://example.com/reset) dan@example.com "
+            "https://example.com Top",
+        )
+
+    def test_entities(self) -> None:
+        self.assertEqual(
+            html_to_text("<p>Tom &amp; Jerry &lt;3 &copy;</p>"), "Tom & Jerry <3 ©"
+        )
+
+    def test_malformed(self) -> None:
+        # a '<' that isn't closed is text, what it would have skipped isn't lost
+        self.assertEqual(html_to_text("<p>a < b</p><script>x"), "a < b\n\nx")
+        self.assertEqual(html_to_text('<p title="x>y">Hi</p><a x="'), 'Hi\n\n<a x="')
+        self.assertEqual(html_to_text("<!-- note <p>Hi</p>"), "Hi")
+
+    def test_malformed_linear_time(self) -> None:
+        # used to backtrack over the rest of the input at every '<'
+        for html in ["<script>x" * 20000, '<a x="' * 20000, "<!--" * 20000]:
+            start = time.monotonic()
+            html_to_text(html)
+            self.assertLess(time.monotonic() - start, 1)
+
+    def test_shipped_template(self) -> None:
+        html = render_template(
+            "django-dans-emails/password_reset_request.html",
+            {"team_name": "Team", "url_password_reset": "https://example.com/r"},
+        )
+        text = html_to_text(html)
+        self.assertNotIn("@media", text)
+        self.assertIn("(https://example.com/r)", text)
+        self.assertIn("Hi there,\n\n", text)
+
+
+class TestRenderPool(TestCase):
+    def setUp(self) -> None:
+        # 'test_email_sender' puts the package on 'sys.path' - spawned workers would
+        # import 'logging.py' in place of the standard library
+        package = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        sys_path = patch.object(sys, "path", [p for p in sys.path if p != package])
+        sys_path.start()
+        self.addCleanup(sys_path.stop)
+        # workers start with the settings module - only shipped templates
+        self.chunks = [
+            [(f"user{i}@example.com", {"team_name": f"Team {i}"}) for i in range(n)]
+            for n in range(1, 5)
+        ]
+
+    def expected(self) -> List[Any]:
+        return [
+            (chunk, render_emails(DEFAULT_TEMPLATE, [c for _, c in chunk]))
+            for chunk in self.chunks
+        ]
+
+    def test_render_emails(self) -> None:
+        context = {"team_name": "Team"}
+        html = render_template(DEFAULT_TEMPLATE, context)
+        self.assertEqual(
+            render_emails(DEFAULT_TEMPLATE, [context, context]),
+            [(html, html_to_text(html))] * 2,
+        )
+
+    def test_in_process_by_default(self) -> None:
+        self.assertIsNone(get_render_pool())
+        rendered = list(render_email_chunks(DEFAULT_TEMPLATE, iter(self.chunks)))
+        self.assertEqual(rendered, self.expected())
+
+    def test_pool_in_order(self) -> None:
+        with self.settings(EMAIL_RENDER_PROCESSES=2, EMAIL_RENDER_WINDOW=2):
+            self.assertIsNotNone(get_render_pool())
+            # rendered by the workers, not the in-process fallback
+            with self.assertNoLogs("django_dans_notifications", "WARNING"):
+                rendered = list(
+                    render_email_chunks(DEFAULT_TEMPLATE, iter(self.chunks))
+                )
+        self.assertEqual(rendered, self.expected())
+
+    def test_window(self) -> None:
+        pool = Mock()
+        with patch(
+            "django_dans_notifications.rendering.get_render_pool", return_value=pool
+        ), self.settings(EMAIL_RENDER_WINDOW=2):
+            chunks = render_email_chunks(DEFAULT_TEMPLATE, iter(self.chunks))
+            next(chunks)
+            self.assertEqual(pool.submit.call_count, 2)
+            chunks.close()  # type: ignore[attr-defined]
+        # stopped early - the rest isn't rendered
+        pool.submit.return_value.cancel.assert_called_once()
+
+    def test_worker_error_renders_in_process(self) -> None:
+        pool = Mock()
+        pool.submit.return_value.result.side_effect = TypeError("can't pickle")
+        with patch(
+            "django_dans_notifications.rendering.get_render_pool", return_value=pool
+        ), self.settings(EMAIL_RENDER_WINDOW=1), self.assertLogs(
+            "django_dans_notifications", "WARNING"
+        ):
+            rendered = list(render_email_chunks(DEFAULT_TEMPLATE, iter(self.chunks)))
+        self.assertEqual(rendered, self.expected())
+
+    def test_broken_pool_renders_in_process(self) -> None:
+        pool = Mock()
+        pool.submit.side_effect = BrokenProcessPool("A worker died")
+        with patch(
+            "django_dans_notifications.rendering.get_render_pool", return_value=pool
+        ), patch(
+            "django_dans_notifications.rendering.shutdown_render_pool"
+        ) as shutdown, self.settings(
+            EMAIL_RENDER_WINDOW=2
+        ), self.assertLogs(
+            "django_dans_notifications", "WARNING"
+        ):
+            rendered = list(render_email_chunks(DEFAULT_TEMPLATE, iter(self.chunks)))
+        self.assertEqual(rendered, self.expected())
+        # not submitted to again once broken
+        pool.submit.assert_called_once()
+        shutdown.assert_called_once()
+
+    def test_send_email_bulk(self) -> None:
+        with self.settings(EMAIL_RENDER_PROCESSES=1):
+            results = list(
+                NotificationEmail.objects.send_email_bulk(
+                    [(f"user{i}@example.com", None) for i in range(3)],
+                    template=DEFAULT_TEMPLATE,
+                    chunk_size=2,
+                )
+            )
+        self.assertEqual(len(results), 3)
+        for notification, _ in results:
+            self.assertIn("<html", notification.get_content())
@@ -0,0 +1,175 @@
+from concurrent.futures import Future
+from typing import Any
+from unittest.mock import Mock, patch
+
+from django.utils import timezone
+
+from .model_tests.base import BaseModelTestCase
+from ..email_sender import MessageFuture
+from ..models.notifications import NotificationEmail
+from ..rate_limit import RateLimitDeferred
+from ..status import (
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_SENT,
+    AttemptCounter,
+    DeliveryStatus,
+    DeliveryStatusRecorder,
+    send_tracked,
+    send_tracked_message,
+    write_delivery_statuses,
+)
+
+"""
+# ========================================================================= #
+# TEST DELIVERY STATUS ==================================================== #
+# ========================================================================= #
+"""
+
+
+def send_now(func: Any, *args: Any) -> Any:
+    return func(*args)
+
+
+class TestDeliveryStatus(BaseModelTestCase):
+    def setUp(self) -> None:
+        super(TestDeliveryStatus, self).setUp()
+        self.email1 = NotificationEmail.objects.create(recipients=self.base_email)
+        self.email2 = NotificationEmail.objects.create(recipients=self.base_email)
+
+    # =================================================================== #
+    # WRITE TESTS ======================================================= #
+    # =================================================================== #
+
+    def test_write_delivery_statuses(self) -> None:
+        datetime_sent = timezone.now()
+        with self.assertNumQueries(1):
+            write_delivery_statuses(
+                [
+                    DeliveryStatus(self.email1.pk, STATUS_SENT, 1, "", datetime_sent),
+                    DeliveryStatus(self.email2.pk, STATUS_FAILED, 3, "Refused"),
+                ]
+            )
+        self.email1.refresh_from_db()
+        self.email2.refresh_from_db()
+        self.assertEqual(self.email1.status, STATUS_SENT)
+        self.assertTrue(self.email1.sent_successfully)
+        self.assertEqual(self.email1.datetime_sent, datetime_sent)
+        self.assertEqual(self.email2.status, STATUS_FAILED)
+        self.assertFalse(self.email2.sent_successfully)
+        self.assertEqual(self.email2.attempts, 3)
+        self.assertEqual(self.email2.last_error, "Refused")
+        self.assertIsNone(self.email2.datetime_sent)
+
+    def test_recorder_coalesces(self) -> None:
+        recorder = DeliveryStatusRecorder()
+        # don't start the background flush thread - flush by hand
+        with patch.object(DeliveryStatusRecorder, "_run"):
+            recorder.record(DeliveryStatus(self.email1.pk, STATUS_SENT, 1))
+            recorder.record(DeliveryStatus(self.email2.pk, STATUS_SENT, 2))
+        self.email1.refresh_from_db()
+        self.assertEqual(self.email1.status, STATUS_PENDING)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(recorder.flush(), 2)
+        self.assertEqual(recorder.flush(), 0)
+        self.email2.refresh_from_db()
+        self.assertEqual(self.email2.status, STATUS_SENT)
+        self.assertEqual(self.email2.attempts, 2)
+
+    def test_recorder_requeues_on_error(self) -> None:
+        recorder = DeliveryStatusRecorder()
+        with patch.object(DeliveryStatusRecorder, "_run"):
+            recorder.record(DeliveryStatus(self.email1.pk, STATUS_SENT, 1))
+        with patch(
+            "django_dans_notifications.status.write_delivery_statuses",
+            side_effect=RuntimeError("database is down"),
+        ), self.assertLogs("django_dans_notifications", "ERROR"):
+            self.assertEqual(recorder.flush(), 0)
+        with patch.object(DeliveryStatusRecorder, "_run"):
+            recorder.record(DeliveryStatus(self.email2.pk, STATUS_FAILED, 3))
+
+        # written with the next flush - oldest first
+        self.assertEqual(recorder.flush(), 2)
+        self.email1.refresh_from_db()
+        self.email2.refresh_from_db()
+        self.assertEqual(self.email1.status, STATUS_SENT)
+        self.assertEqual(self.email2.status, STATUS_FAILED)
+
+    # =================================================================== #
+    # SEND TESTS ======================================================== #
+    # =================================================================== #
+
+    def test_send_tracked_sync(self) -> None:
+        with patch("django_dans_notifications.status.send_email_async", send_now):
+            status = send_tracked(self.email1.pk, lambda: 1)
+        self.assertIsNotNone(status)
+        self.email1.refresh_from_db()
+        self.assertEqual(self.email1.status, STATUS_SENT)
+        self.assertEqual(self.email1.attempts, 1)
+        self.assertIsNotNone(self.email1.datetime_sent)
+
+    def test_send_tracked_sync_failure(self) -> None:
+        def send() -> None:
+            raise ConnectionRefusedError("refused")
+
+        with patch("django_dans_notifications.status.send_email_async", send_now):
+            send_tracked(self.email1.pk, send)
+        self.email1.refresh_from_db()
+        self.assertEqual(self.email1.status, STATUS_FAILED)
+        self.assertEqual(self.email1.last_error, "ConnectionRefusedError: refused")
+
+    def test_send_tracked_async(self) -> None:
+        future: "Future[Any]" = Future()
+        with patch(
+            "django_dans_notifications.status.send_email_async", return_value=future
+        ), patch.object(DeliveryStatusRecorder, "record") as record:
+            self.assertIsNone(send_tracked(self.email1.pk, lambda: 1))
+            # nothing is written until the send completes
+            record.assert_not_called()
+            future.set_result(1)
+        status = record.call_args[0][0]
+        self.assertEqual(status.notification_email_id, self.email1.pk)
+        self.assertEqual(status.status, STATUS_SENT)
+
+    def test_send_tracked_message_batched(self) -> None:
+        future = MessageFuture()
+        sender = Mock(batching_enabled=True)
+        sender.submit_message.return_value = future
+        with patch(
+            "django_dans_notifications.status.EmailSender", return_value=sender
+        ), patch.object(DeliveryStatusRecorder, "record") as record:
+            self.assertIsNone(send_tracked_message(self.email1.pk, Mock()))
+            record.assert_not_called()
+            future.attempts = 2
+            future.set_exception(Exception("Rejected"))
+        status = record.call_args[0][0]
+        self.assertEqual(status.status, STATUS_FAILED)
+        self.assertEqual(status.attempts, 2)
+        self.assertEqual(status.last_error, "Exception: Rejected")
+
+    def test_attempts_skip_pacing(self) -> None:
+        calls = []
+
+        def send() -> int:
+            calls.append(1)
+            if len(calls) == 1:
+                raise RateLimitDeferred(0.1)
+            if len(calls) == 2:
+                raise RateLimitDeferred(0.1, resume=lambda: 1)
+            raise ConnectionError("Refused")
+
+        attempts = AttemptCounter(send)
+        with self.assertRaises(RateLimitDeferred):
+            attempts()
+        self.assertEqual(attempts.attempts, 0)
+        # partly sent - the rest is counted once it's resumed
+        with self.assertRaises(RateLimitDeferred) as deferred:
+            attempts()
+        self.assertEqual(attempts.attempts, 0)
+        assert deferred.exception.resume is not None
+        self.assertEqual(deferred.exception.resume(), 1)
+        self.assertEqual(attempts.attempts, 1)
+        with self.assertRaises(ConnectionError):
+            attempts()
+        self.assertEqual(attempts.attempts, 2)
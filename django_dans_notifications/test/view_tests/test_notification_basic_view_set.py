@@ -19,6 +19,10 @@ class TestNotificationBasicViewSet(BaseAPITestCase):
         self.view_retrieve = NotificationBasicViewSet.as_view({"get": "retrieve"})
         self.view_create = NotificationBasicViewSet.as_view({"post": "create"})
         self.view_update = NotificationBasicViewSet.as_view({"patch": "partial_update"})
+        self.view_mark_read = NotificationBasicViewSet.as_view({"post": "mark_read"})
+        self.view_unread_count = NotificationBasicViewSet.as_view(
+            {"get": "unread_count"}
+        )
 
     @staticmethod
     def get_url() -> str:
@@ -144,6 +148,88 @@ class TestNotificationBasicViewSet(BaseAPITestCase):
         self.assertEqual(json_response["next"], None)
         self.assertEqual(json_response["previous"], None)
 
+    def test_notification_basic_list_second_page(self) -> None:
+        # create notification(s)
+        for i in range(25):
+            NotificationBasic.objects.create(recipients=self.email, message=str(i))
+        NotificationBasic.objects.create()
+
+        # make api request
+        request = self.factory.get(
+            self.get_url(), {"page": 2}, HTTP_AUTHORIZATION=f"Token {self.user_token}"
+        )
+        response = self.view_list(request)
+        response.render()  # type: ignore[attr-defined]
+        json_response = json.loads(response.content)
+
+        # confirm status code and data
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_response["count"], 25)
+        self.assertEqual(json_response["next"], None)
+        self.assertIsNotNone(json_response["previous"])
+        self.assertEqual(
+            [result["message"] for result in json_response["results"]],
+            [str(i) for i in range(20, 25)],
+        )
+
+    def test_notification_basic_list_cursor_pagination(self) -> None:
+        # create notification(s)
+        for i in range(25):
+            NotificationBasic.objects.create(recipients=self.email, message=str(i))
+
+        with self.settings(NOTIFICATIONS_PAGINATION="cursor"):
+            # make api request - first page
+            request = self.factory.get(
+                self.get_url(), HTTP_AUTHORIZATION=f"Token {self.user_token}"
+            )
+            response = self.view_list(request)
+            response.render()  # type: ignore[attr-defined]
+            json_response = json.loads(response.content)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", json_response)
+            self.assertEqual(len(json_response["results"]), 20)
+            self.assertIsNotNone(json_response["next"])
+
+            # make api request - next page
+            request = self.factory.get(
+                json_response["next"], HTTP_AUTHORIZATION=f"Token {self.user_token}"
+            )
+            response = self.view_list(request)
+            response.render()  # type: ignore[attr-defined]
+            json_response = json.loads(response.content)
+
+        # confirm status code and data
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_response["next"], None)
+        self.assertEqual(
+            [result["message"] for result in json_response["results"]],
+            [str(i) for i in range(20, 25)],
+        )
+
+    def test_notification_basic_list_cursor_pagination_own_once(self) -> None:
+        # create notification(s) - to the user's email and id, and someone else
+        NotificationBasic.objects.create(
+            recipients=[self.email, str(self.user.id)], message="both"
+        )
+        NotificationBasic.objects.create(recipients=str(self.user.id), message="id")
+        NotificationBasic.objects.create(recipients="other@test.com", message="other")
+
+        with self.settings(NOTIFICATIONS_PAGINATION="cursor"):
+            request = self.factory.get(
+                self.get_url(), HTTP_AUTHORIZATION=f"Token {self.user_token}"
+            )
+            response = self.view_list(request)
+            response.render()  # type: ignore[attr-defined]
+            json_response = json.loads(response.content)
+
+        # confirm status code and data
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result["message"] for result in json_response["results"]],
+            ["both", "id"],
+        )
+
     # ==================================================================================
     # GET - RETRIEVE ===================================================================
     # ==================================================================================
@@ -403,3 +489,97 @@ class TestNotificationBasicViewSet(BaseAPITestCase):
 
         self.assertEqual(response.status_code, 400)
         self.assertEqual(json_response["message"], "Notification not found.")
+
+    # ==================================================================================
+    # POST - MARK READ =================================================================
+    # ==================================================================================
+
+    def test_notification_basic_mark_read_ids(self) -> None:
+        notification1 = NotificationBasic.objects.create(recipients=self.email)
+        notification2 = NotificationBasic.objects.create(recipients=self.email)
+        not_recp = NotificationBasic.objects.create(recipients="other@test.com")
+        data = {"ids": [str(notification1.pk), str(not_recp.pk)]}
+        request = self.factory.post(
+            "/api/notifications/basic/mark-read/",
+            data,
+            format="json",
+            HTTP_AUTHORIZATION=f"Token {self.user_token}",
+        )
+        response = self.view_mark_read(request)
+        response.render()  # type: ignore[attr-defined]
+        json_response = json.loads(response.content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_response["results"]["updated"], 1)
+        self.assertTrue(NotificationBasic.objects.get(pk=notification1.pk).read)
+        self.assertFalse(NotificationBasic.objects.get(pk=notification2.pk).read)
+        self.assertFalse(NotificationBasic.objects.get(pk=not_recp.pk).read)
+
+    def test_notification_basic_mark_read_before(self) -> None:
+        for _ in range(3):
+            NotificationBasic.objects.create(recipients=self.email)
+        data = {"before": "2999-01-01T00:00:00Z"}
+        request = self.factory.post(
+            "/api/notifications/basic/mark-read/",
+            data,
+            format="json",
+            HTTP_AUTHORIZATION=f"Token {self.user_token}",
+        )
+        response = self.view_mark_read(request)
+        response.render()  # type: ignore[attr-defined]
+        json_response = json.loads(response.content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_response["results"]["updated"], 3)
+        self.assertEqual(NotificationBasic.objects.filter(read=False).count(), 0)
+
+    def test_notification_basic_mark_read_invalid(self) -> None:
+        for data in ({}, {"ids": ["invalid"]}, {"before": "not a date"}):
+            request = self.factory.post(
+                "/api/notifications/basic/mark-read/",
+                data,
+                format="json",
+                HTTP_AUTHORIZATION=f"Token {self.user_token}",
+            )
+            response = self.view_mark_read(request)
+            self.assertEqual(response.status_code, 400)
+
+    # ==================================================================================
+    # GET - UNREAD COUNT ===============================================================
+    # ==================================================================================
+
+    def test_notification_basic_unread_count(self) -> None:
+        NotificationBasic.objects.create(recipients=self.email)
+        NotificationBasic.objects.create(recipients=str(self.user.id))
+        NotificationBasic.objects.create(recipients=self.email, read=True)
+        NotificationBasic.objects.create(recipients="other@test.com")
+
+        request = self.factory.get(
+            "/api/notifications/basic/unread-count/",
+            HTTP_AUTHORIZATION=f"Token {self.user_token}",
+        )
+        # email and id both have unread notifications, but none addressed to
+        # both - counters alone
+        with self.assertNumQueries(2):  # auth token + user, counters
+            response = self.view_unread_count(request)
+        response.render()  # type: ignore[attr-defined]
+        json_response = json.loads(response.content)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_response["results"]["unread"], 2)
+
+        # one addressed to both - counted once, through the recipient index
+        NotificationBasic.objects.create(recipients=[self.email, str(self.user.id)])
+        with self.assertNumQueries(3):  # auth token + user, counters, distinct count
+            response = self.view_unread_count(request)
+        response.render()  # type: ignore[attr-defined]
+        self.assertEqual(json.loads(response.content)["results"]["unread"], 3)
+
+        # only the email has unread notifications - counters alone
+        NotificationBasic.objects.filter(
+            recipients__contains=str(self.user.id)
+        ).delete()
+        with self.assertNumQueries(2):  # auth token + user, counters
+            response = self.view_unread_count(request)
+        response.render()  # type: ignore[attr-defined]
+        self.assertEqual(json.loads(response.content)["results"]["unread"], 1)
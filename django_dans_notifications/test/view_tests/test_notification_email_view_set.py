@@ -1,6 +1,7 @@
 import json
 from typing import Any
 import uuid
+from unittest.mock import patch
 from .base import BaseAPITestCase
 from ...models.notifications import NotificationEmail, NotificationEmailTemplate
 from ...views.email import NotificationEmailViewSet
@@ -195,6 +196,32 @@ class TestNotificationEmailViewSet(BaseAPITestCase):
         self.assertEqual(json_response["next"], None)
         self.assertEqual(json_response["previous"], None)
 
+    def test_notification_email_list_renders_page_only(self) -> None:
+        # create notification(s)
+        for i in range(25):
+            NotificationEmail.objects.create(
+                recipients=self.email,
+                subject=f"Test Subject {i}",
+                template=self.email_template,
+            )
+
+        # make api request
+        request = self.factory.get(
+            self.get_url(), HTTP_AUTHORIZATION=f"Token {self.user_token}"
+        )
+        with patch.object(
+            NotificationEmailTemplate, "html_to_str", return_value="<p>content</p>"
+        ) as mock_html_to_str:
+            response = self.view_list(request)
+            response.render()  # type: ignore[attr-defined]
+        json_response = json.loads(response.content)
+
+        # confirm status code and data
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json_response["count"], 25)
+        self.assertEqual(len(json_response["results"]), 20)
+        self.assertEqual(mock_html_to_str.call_count, 20)
+
     # ==================================================================================
     # GET - RETRIEVE ===================================================================
     # ==================================================================================
@@ -1,18 +1,25 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+import uuid
 from django_dans_api_toolkit.api_response_handler import ApiResponseHandler
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from ..delivery import CHANNEL_BASIC, delivery_enabled
 from ..helpers import str_to_bool
+from ..pagination import NotificationPaginationMixin
+from ..models.counters import NotificationUnreadCount
 from ..models.notifications import NotificationBasic
+from ..notification_manager import NotificationManager
 from ..serializers import NotificationBasicSerializer
-from django.db.models import Q
 
 """
 ============================================================================================ #
@@ -25,7 +32,7 @@ BASIC ==========================================================================
 #
 # NOTIFICATION BASIC VIEW SET
 #
-class NotificationBasicViewSet(viewsets.GenericViewSet):
+class NotificationBasicViewSet(NotificationPaginationMixin, viewsets.GenericViewSet):
     queryset = NotificationBasic.objects.all()
     serializer_class = NotificationBasicSerializer
     permission_classes = (IsAuthenticated,)
@@ -44,6 +51,13 @@ class NotificationBasicViewSet(viewsets.GenericViewSet):
                 default=1,
                 required=False,
             ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Page cursor - only used when NOTIFICATIONS_PAGINATION = 'cursor'",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
         ],
         responses={
             200: openapi.Response(
@@ -53,7 +67,7 @@ class NotificationBasicViewSet(viewsets.GenericViewSet):
                     properties={
                         "count": openapi.Schema(
                             type=openapi.TYPE_INTEGER,
-                            description="Total number of notifications",
+                            description="Total number of notifications (not included in cursor mode)",
                         ),
                         "next": openapi.Schema(
                             type=openapi.TYPE_STRING,
@@ -83,19 +97,26 @@ class NotificationBasicViewSet(viewsets.GenericViewSet):
         Retrieve a paginated list of basic notifications for the authenticated user.
         Only returns notifications where the user is a recipient.
         """
-        serializer_class = self.get_serializer_class()
-        serializer = serializer_class(
-            self.filter_queryset(
-                self.queryset.filter(
-                    Q(recipients__contains=request.user.email)  # type: ignore[union-attr]
-                    | Q(recipients__contains=request.user.id)  # type: ignore[union-attr]
+        queryset = self.filter_queryset(
+            self.queryset.filter(
+                NotificationBasic.query_recipients(
+                    request.user.email, request.user.id  # type: ignore[union-attr]
                 )
-            ),
-            many=True,
-            context={"request": request},
+            ).order_by("datetime_created", "id")
         )
-        page = self.paginate_queryset(serializer.data)
-        return self.get_paginated_response(page)
+
+        # paginate BEFORE serializing so only the requested page is fetched
+        page = self.paginate_recipients(
+            queryset, request.user.email, request.user.id  # type: ignore[union-attr]
+        )
+        serializer_class = self.get_serializer_class()
+        if page is None:
+            serializer = serializer_class(
+                queryset, many=True, context={"request": request}
+            )
+            return self.response_handler.response_success(results=serializer.data)
+        serializer = serializer_class(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(  # type: ignore[misc]
         operation_description="Retrieve a specific basic notification by ID",
@@ -192,8 +213,10 @@ class NotificationBasicViewSet(viewsets.GenericViewSet):
             return self.response_handler.response_error(
                 message="User email required to send notification."
             )
-        request_data_copy["datetime_sent"] = timezone.now()
-        request_data_copy["sent_successfully"] = True
+        if not delivery_enabled(CHANNEL_BASIC):
+            # nothing to deliver - sent once stored
+            request_data_copy["datetime_sent"] = timezone.now()
+            request_data_copy["sent_successfully"] = True
 
         # Check for required fields
         if not request_data_copy.get("recipients"):
@@ -276,3 +299,118 @@ class NotificationBasicViewSet(viewsets.GenericViewSet):
             notification_basic, context={"request": request}
         )
         return self.response_handler.response_success(results=serializer.data)
+
+    @swagger_auto_schema(  # type: ignore[misc]
+        operation_description="Mark many basic notifications as read or unread in one request",
+        operation_summary="Bulk Update Basic Notification Read Status",
+        tags=["Basic Notifications"],
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "ids": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                    ),
+                    description="UUIDs of the notifications to update",
+                ),
+                "before": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    format=openapi.FORMAT_DATETIME,
+                    description="Update notifications created at or before this time (ISO 8601)",
+                ),
+                "read": openapi.Schema(
+                    type=openapi.TYPE_BOOLEAN,
+                    description="Mark notifications as read (true, default) or unread (false)",
+                ),
+            },
+        ),
+        responses={
+            200: openapi.Response(
+                description="Number of notifications updated",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "updated": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    },
+                ),
+            ),
+            400: openapi.Response(description="Invalid input data"),
+            401: openapi.Response(description="Authentication required"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="mark-read")
+    def mark_read(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Mark the authenticated user's basic notifications as read (or unread) in bulk.
+        Filter by 'ids' and/or 'before' - e.g., "mark all read" sends 'before' as now.
+        """
+        ids: Optional[List[uuid.UUID]] = None
+        before = None
+        raw_ids = request.data.get("ids")
+        if raw_ids is not None and hasattr(request.data, "getlist"):
+            # form encoded - 'ids' may be repeated
+            raw_ids = request.data.getlist("ids")
+        raw_before = request.data.get("before")
+        if raw_ids is None and raw_before is None:
+            return self.response_handler.response_error(
+                message="Either 'ids' or 'before' required."
+            )
+
+        if raw_ids is not None:
+            if isinstance(raw_ids, str) or not hasattr(raw_ids, "__iter__"):
+                raw_ids = [raw_ids]
+            try:
+                ids = [uuid.UUID(str(pk)) for pk in raw_ids]
+            except ValueError as e:
+                return self.response_handler.response_error(
+                    message="Invalid notification ids.", error=e
+                )
+        if raw_before is not None:
+            try:
+                before = parse_datetime(str(raw_before))
+            except ValueError:
+                before = None
+            if before is None:
+                return self.response_handler.response_error(
+                    message="Invalid 'before' timestamp."
+                )
+            # match the project's USE_TZ so the comparison is valid
+            if settings.USE_TZ and timezone.is_naive(before):
+                before = timezone.make_aware(before)
+            elif not settings.USE_TZ and timezone.is_aware(before):
+                before = timezone.make_naive(before)
+
+        read = str_to_bool(request.data.get("read", True))
+        updated = NotificationManager().mark_notifications_basic_read(
+            request.user, ids=ids, before=before, read=read
+        )
+        return self.response_handler.response_success(results={"updated": updated})
+
+    @swagger_auto_schema(  # type: ignore[misc]
+        operation_description="Number of unread basic notifications for the authenticated user",
+        operation_summary="Basic Notification Unread Count",
+        tags=["Basic Notifications"],
+        responses={
+            200: openapi.Response(
+                description="Unread notification count",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        "unread": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    },
+                ),
+            ),
+            401: openapi.Response(description="Authentication required"),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="unread-count")
+    def unread_count(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Retrieve the authenticated user's unread basic notification count.
+        Read from maintained per-recipient counters - cheap enough to poll.
+        """
+        unread = NotificationUnreadCount.objects.unread_count(
+            NotificationManager.get_recipient_keys(request.user)
+        )
+        return self.response_handler.response_success(results={"unread": unread})
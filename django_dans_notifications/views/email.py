@@ -8,9 +8,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from ..pagination import NotificationPaginationMixin
 from ..models.notifications import NotificationEmail
 from ..serializers import NotificationEmailSerializer
-from django.db.models import Q
 
 """
 ============================================================================================ #
@@ -23,7 +23,7 @@ EMAIL ==========================================================================
 #
 # NOTIFICATION EMAIL VIEW SET
 #
-class NotificationEmailViewSet(viewsets.GenericViewSet):
+class NotificationEmailViewSet(NotificationPaginationMixin, viewsets.GenericViewSet):
     queryset = NotificationEmail.objects.all()
     serializer_class = NotificationEmailSerializer
     permission_classes = (IsAuthenticated,)
@@ -42,6 +42,13 @@ class NotificationEmailViewSet(viewsets.GenericViewSet):
                 default=1,
                 required=False,
             ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Page cursor - only used when NOTIFICATIONS_PAGINATION = 'cursor'",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
         ],
         responses={
             200: openapi.Response(
@@ -51,7 +58,7 @@ class NotificationEmailViewSet(viewsets.GenericViewSet):
                     properties={
                         "count": openapi.Schema(
                             type=openapi.TYPE_INTEGER,
-                            description="Total number of notifications",
+                            description="Total number of notifications (not included in cursor mode)",
                         ),
                         "next": openapi.Schema(
                             type=openapi.TYPE_STRING,
@@ -81,19 +88,28 @@ class NotificationEmailViewSet(viewsets.GenericViewSet):
         Retrieve a paginated list of email notifications for the authenticated user.
         Only returns notifications where the user is a recipient.
         """
-        serializer_class = self.get_serializer_class()
-        serializer = serializer_class(
-            self.filter_queryset(
-                self.queryset.filter(
-                    Q(recipients__contains=request.user.email)  # type: ignore[union-attr]
-                    | Q(recipients__contains=request.user.id)  # type: ignore[union-attr]
+        queryset = self.filter_queryset(
+            self.queryset.select_related("template")
+            .filter(
+                NotificationEmail.query_recipients(
+                    request.user.email, request.user.id  # type: ignore[union-attr]
                 )
-            ),
-            many=True,
-            context={"request": request},
+            )
+            .order_by("datetime_created", "id")
+        )
+
+        # paginate BEFORE serializing so only the requested page is fetched
+        page = self.paginate_recipients(
+            queryset, request.user.email, request.user.id  # type: ignore[union-attr]
         )
-        page = self.paginate_queryset(serializer.data)
-        return self.get_paginated_response(page)
+        serializer_class = self.get_serializer_class()
+        if page is None:
+            serializer = serializer_class(
+                queryset, many=True, context={"request": request}
+            )
+            return self.response_handler.response_success(results=serializer.data)
+        serializer = serializer_class(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(  # type: ignore[misc]
         operation_description="Retrieve a specific email notification by ID",
@@ -9,9 +9,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from ..delivery import CHANNEL_PUSH, delivery_enabled
+from ..pagination import NotificationPaginationMixin
 from ..models.notifications import NotificationPush
 from ..serializers import NotificationPushSerializer
-from django.db.models import Q
 
 """
 ============================================================================================ #
@@ -24,7 +25,7 @@ PUSH ===========================================================================
 #
 # NOTIFICATION PUSH VIEW SET
 #
-class NotificationPushViewSet(viewsets.GenericViewSet):
+class NotificationPushViewSet(NotificationPaginationMixin, viewsets.GenericViewSet):
     queryset = NotificationPush.objects.all()
     serializer_class = NotificationPushSerializer
     permission_classes = (IsAuthenticated,)
@@ -43,6 +44,13 @@ class NotificationPushViewSet(viewsets.GenericViewSet):
                 default=1,
                 required=False,
             ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Page cursor - only used when NOTIFICATIONS_PAGINATION = 'cursor'",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
         ],
         responses={
             200: openapi.Response(
@@ -52,7 +60,7 @@ class NotificationPushViewSet(viewsets.GenericViewSet):
                     properties={
                         "count": openapi.Schema(
                             type=openapi.TYPE_INTEGER,
-                            description="Total number of notifications",
+                            description="Total number of notifications (not included in cursor mode)",
                         ),
                         "next": openapi.Schema(
                             type=openapi.TYPE_STRING,
@@ -82,19 +90,26 @@ class NotificationPushViewSet(viewsets.GenericViewSet):
         Retrieve a paginated list of push notifications for the authenticated user.
         Only returns notifications where the user is a recipient.
         """
-        serializer_class = self.get_serializer_class()
-        serializer = serializer_class(
-            self.filter_queryset(
-                self.queryset.filter(
-                    Q(recipients__contains=request.user.email)  # type: ignore[union-attr]
-                    | Q(recipients__contains=request.user.id)  # type: ignore[union-attr]
+        queryset = self.filter_queryset(
+            self.queryset.filter(
+                NotificationPush.query_recipients(
+                    request.user.email, request.user.id  # type: ignore[union-attr]
                 )
-            ),
-            many=True,
-            context={"request": request},
+            ).order_by("datetime_created", "id")
+        )
+
+        # paginate BEFORE serializing so only the requested page is fetched
+        page = self.paginate_recipients(
+            queryset, request.user.email, request.user.id  # type: ignore[union-attr]
         )
-        page = self.paginate_queryset(serializer.data)
-        return self.get_paginated_response(page)
+        serializer_class = self.get_serializer_class()
+        if page is None:
+            serializer = serializer_class(
+                queryset, many=True, context={"request": request}
+            )
+            return self.response_handler.response_success(results=serializer.data)
+        serializer = serializer_class(page, many=True, context={"request": request})
+        return self.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(  # type: ignore[misc]
         operation_description="Retrieve a specific push notification by ID",
@@ -190,8 +205,10 @@ class NotificationPushViewSet(viewsets.GenericViewSet):
             return self.response_handler.response_error(
                 message="User email required to send notification."
             )
-        request_data_copy["datetime_sent"] = timezone.now()
-        request_data_copy["sent_successfully"] = True
+        if not delivery_enabled(CHANNEL_PUSH):
+            # nothing to deliver - sent once stored
+            request_data_copy["datetime_sent"] = timezone.now()
+            request_data_copy["sent_successfully"] = True
 
         # Check for required fields
         if not request_data_copy.get("recipients"):